@@ -0,0 +1,70 @@
+"""Shared fixtures and a simple runner for the benchmarks.
+
+The benchmark files are created by ``tests/generate_soundfiles.py``
+in a directory which is kept between runs (``SOUNDFILE_BENCHMARK_DIR``
+or a directory in the system's temporary directory).
+
+"""
+import importlib.util
+import itertools
+import os
+import tempfile
+import time
+
+_generate_soundfiles = None
+
+
+def _generator():
+    global _generate_soundfiles
+    if _generate_soundfiles is None:
+        path = os.path.join(os.path.dirname(__file__), os.pardir, 'tests',
+                            'generate_soundfiles.py')
+        spec = importlib.util.spec_from_file_location('generate_soundfiles',
+                                                      path)
+        _generate_soundfiles = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(_generate_soundfiles)
+    return _generate_soundfiles
+
+
+def fixture_directory():
+    return os.environ.get(
+        'SOUNDFILE_BENCHMARK_DIR',
+        os.path.join(tempfile.gettempdir(), 'soundfile-benchmarks'))
+
+
+def fixtures():
+    """Return a dict mapping 'FORMAT/SUBTYPE' to benchmark file names."""
+    filenames = _generator().generate_benchmark_files(fixture_directory())
+    return {f'{format}/{subtype}': filename
+            for (format, subtype), filename in filenames.items()}
+
+
+def format_params():
+    """Return all 'FORMAT/SUBTYPE' combinations, for use in params."""
+    return [f'{format}/{subtype}'
+            for format, subtype in _generator().benchmark_formats]
+
+
+def run(cls, repeat=3):
+    """Run all benchmarks of an asv-style class and print the timings."""
+    params = getattr(cls, 'params', [])
+    if params and not isinstance(params[0], list):
+        params = [params]
+    methods = sorted(name for name in dir(cls) if name.startswith('time_'))
+    for combination in itertools.product(*params):
+        bench = cls()
+        if hasattr(bench, 'setup'):
+            bench.setup(*combination)
+        try:
+            for name in methods:
+                method = getattr(bench, name)
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    method(*combination)
+                duration = (time.perf_counter() - start) / repeat
+                label = ', '.join(str(p) for p in combination)
+                print(f'{cls.__name__}.{name}({label}): '
+                      f'{duration * 1000:.2f} ms')
+        finally:
+            if hasattr(bench, 'teardown'):
+                bench.teardown(*combination)
@@ -0,0 +1,70 @@
+"""Benchmarks for appending small blocks under different header policies.
+
+A long floating point WAV file is written in small blocks, with the
+header updated only on close (the default), after every write, or every
+few seconds, and with and without a PEAK chunk.
+
+These can be run with asv_ (see ``asv.conf.json``) or directly::
+
+    python -m benchmarks.header
+
+.. _asv: https://asv.readthedocs.io/
+
+"""
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import soundfile as sf
+
+BLOCKSIZE = 256
+BLOCKS = 4000
+
+POLICIES = {
+    'default': {},
+    'no_peak_chunk': {'add_peak_chunk': False},
+    'every_write': {'update_header': True},
+    'every_second': {'update_header': 1.0},
+}
+
+
+def append_blocks(filename, block, **kwargs):
+    with sf.SoundFile(filename, 'w', 48000, block.shape[1], 'FLOAT',
+                      **kwargs) as f:
+        for _ in range(BLOCKS):
+            f.write(block)
+
+
+class TimeAppend:
+
+    params = list(POLICIES)
+    param_names = ['policy']
+
+    def setup(self, policy):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'bench.wav')
+        self.block = np.random.uniform(-0.5, 0.5, (BLOCKSIZE, 2))
+
+    def teardown(self, policy):
+        shutil.rmtree(self.directory)
+
+    def time_append(self, policy):
+        append_blocks(self.filename, self.block, **POLICIES[policy])
+
+
+if __name__ == '__main__':
+    directory = tempfile.mkdtemp()
+    try:
+        filename = os.path.join(directory, 'bench.wav')
+        block = np.random.uniform(-0.5, 0.5, (BLOCKSIZE, 2))
+        for policy, kwargs in POLICIES.items():
+            repeat = 5
+            start = time.perf_counter()
+            for _ in range(repeat):
+                append_blocks(filename, block, **kwargs)
+            duration = (time.perf_counter() - start) / repeat
+            print(f'{policy:14} {BLOCKS / duration:10.0f} blocks/s')
+    finally:
+        shutil.rmtree(directory)
@@ -0,0 +1,152 @@
+"""Benchmarks for reading: read(), read_batch(), blocks() and info().
+
+These can be run with asv_ (see ``asv.conf.json``) or directly::
+
+    python -m benchmarks.read
+
+.. _asv: https://asv.readthedocs.io/
+
+"""
+import numpy as np
+import soundfile as sf
+
+from .common import fixtures, format_params, run
+
+
+class TimeRead:
+    """Read a whole file with SoundFile.read() in blocks of blocksize."""
+
+    params = [format_params(), ['float64', 'float32', 'int32', 'int16'],
+              [256, 4096, 65536]]
+    param_names = ['format', 'dtype', 'blocksize']
+
+    def setup(self, format, dtype, blocksize):
+        self.filename = fixtures()[format]
+
+    def time_read(self, format, dtype, blocksize):
+        with sf.SoundFile(self.filename) as f:
+            while len(f.read(blocksize, dtype)):
+                pass
+
+    def time_read_into_out(self, format, dtype, blocksize):
+        with sf.SoundFile(self.filename) as f:
+            out = f._create_empty_array(blocksize, True, dtype)
+            while len(f.read(out=out)):
+                pass
+
+
+class TimeReadFunction:
+    """Read a whole file with the read() function."""
+
+    params = [format_params(), ['float64', 'int16']]
+    param_names = ['format', 'dtype']
+
+    def setup(self, format, dtype):
+        self.filename = fixtures()[format]
+
+    def time_read(self, format, dtype):
+        sf.read(self.filename, dtype=dtype)
+
+    def peakmem_read(self, format, dtype):
+        sf.read(self.filename, dtype=dtype)
+
+
+class TimeReadBatch:
+    """Read a batch of files into one array, compared to stacking."""
+
+    params = [['WAV/PCM_16', 'FLAC/PCM_16'], [8, 32]]
+    param_names = ['format', 'files']
+
+    def setup(self, format, files):
+        self.filenames = [fixtures()[format]] * files
+
+    def time_read_batch(self, format, files):
+        sf.read_batch(self.filenames, dtype='float32')
+
+    def time_read_and_stack(self, format, files):
+        np.stack([sf.read(filename, dtype='float32', always_2d=True)[0]
+                  for filename in self.filenames])
+
+    def peakmem_read_batch(self, format, files):
+        sf.read_batch(self.filenames, dtype='float32')
+
+    def peakmem_read_and_stack(self, format, files):
+        np.stack([sf.read(filename, dtype='float32', always_2d=True)[0]
+                  for filename in self.filenames])
+
+
+class TimeBufferPool:
+    """Many small reads, with and without a BufferPool."""
+
+    params = [['WAV/PCM_16'], [64, 1024, 65536], [False, True]]
+    param_names = ['format', 'blocksize', 'pool']
+
+    def setup(self, format, blocksize, pool):
+        self.filename = fixtures()[format]
+        self.pool = sf.BufferPool() if pool else None
+
+    def time_read(self, format, blocksize, pool):
+        with sf.SoundFile(self.filename) as f:
+            f.buffer_pool = self.pool
+            while True:
+                block = f.read(blocksize, 'float32')
+                if not len(block):
+                    break
+                if self.pool is not None:
+                    self.pool.release(block)
+
+    def time_buffer_read(self, format, blocksize, pool):
+        with sf.SoundFile(self.filename) as f:
+            while len(f.buffer_read(min(blocksize, f.frames - f.tell()),
+                                    'float32')):
+                pass
+
+    def track_allocations(self, format, blocksize, pool):
+        """Number of arrays allocated for reading the whole file."""
+        with sf.SoundFile(self.filename) as f:
+            if self.pool is None:
+                return -(-f.frames // blocksize) + 1
+            self.pool.allocations = 0
+            self.time_read(format, blocksize, pool)
+            return self.pool.allocations
+
+
+class TimeBlocks:
+    """Iterate over a whole file with blocks()."""
+
+    params = [format_params(), [256, 4096], [0, 128]]
+    param_names = ['format', 'blocksize', 'overlap']
+
+    def setup(self, format, blocksize, overlap):
+        self.filename = fixtures()[format]
+
+    def time_blocks(self, format, blocksize, overlap):
+        for _ in sf.blocks(self.filename, blocksize, overlap):
+            pass
+
+    def time_blocks_with_fill_value(self, format, blocksize, overlap):
+        for _ in sf.blocks(self.filename, blocksize, overlap, fill_value=0):
+            pass
+
+
+class TimeInfo:
+    """Open a file and parse its header."""
+
+    params = [format_params()]
+    param_names = ['format']
+
+    def setup(self, format):
+        self.filename = fixtures()[format]
+
+    def time_info(self, format):
+        sf.info(self.filename)
+
+    def time_open(self, format):
+        with sf.SoundFile(self.filename):
+            pass
+
+
+if __name__ == '__main__':
+    for cls in (TimeRead, TimeReadFunction, TimeReadBatch, TimeBufferPool,
+                TimeBlocks, TimeInfo):
+        run(cls)
@@ -0,0 +1,82 @@
+"""Benchmarks for resampling while reading.
+
+Streaming resampling (``samplerate_out=...``) is compared to reading the
+whole file and resampling it afterwards.
+
+These can be run with asv_ (see ``asv.conf.json``) or directly::
+
+    python -m benchmarks.resample
+
+.. _asv: https://asv.readthedocs.io/
+
+"""
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import soundfile as sf
+
+
+def _create_file(directory, seconds=30, samplerate=48000, channels=2):
+    filename = os.path.join(directory, 'bench.wav')
+    data = np.random.uniform(-0.5, 0.5, (seconds * samplerate, channels))
+    sf.write(filename, data, samplerate, subtype='PCM_16')
+    return filename
+
+
+def read_streaming(filename, samplerate_out):
+    return sf.read(filename, samplerate_out=samplerate_out)[0]
+
+
+def read_full_then_resample(filename, samplerate_out):
+    data, samplerate = sf.read(filename, always_2d=True)
+    resampler = sf._Resampler(samplerate, samplerate_out, data.shape[1])
+    resampler.push(data)
+    resampler.finish()
+    out = np.empty((resampler.frames_out(len(data)), data.shape[1]))
+    resampler.pull(out)
+    return out
+
+
+class TimeResample:
+
+    params = [[8000, 16000, 44100], ['streaming', 'full']]
+    param_names = ['samplerate_out', 'method']
+
+    def setup(self, samplerate_out, method):
+        self.directory = tempfile.mkdtemp()
+        self.filename = _create_file(self.directory)
+        self.func = {'streaming': read_streaming,
+                     'full': read_full_then_resample}[method]
+
+    def teardown(self, samplerate_out, method):
+        shutil.rmtree(self.directory)
+
+    def time_read(self, samplerate_out, method):
+        self.func(self.filename, samplerate_out)
+
+    def peakmem_read(self, samplerate_out, method):
+        self.func(self.filename, samplerate_out)
+
+
+if __name__ == '__main__':
+    import tracemalloc
+    directory = tempfile.mkdtemp()
+    try:
+        filename = _create_file(directory)
+        seconds = sf.info(filename).duration
+        for samplerate_out in TimeResample.params[0]:
+            for func in read_streaming, read_full_then_resample:
+                tracemalloc.start()
+                start = time.perf_counter()
+                func(filename, samplerate_out)
+                duration = time.perf_counter() - start
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                print(f'{samplerate_out:5} Hz {func.__name__:24} '
+                      f'{seconds / duration:7.1f}x realtime, '
+                      f'peak {peak / 2**20:6.1f} MiB')
+    finally:
+        shutil.rmtree(directory)
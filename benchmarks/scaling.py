@@ -0,0 +1,81 @@
+"""Benchmarks for sample scaling inside libsndfile vs. in NumPy.
+
+These can be run with asv_ (see ``asv.conf.json``) or directly::
+
+    python -m benchmarks.scaling
+
+.. _asv: https://asv.readthedocs.io/
+
+"""
+import io
+import time
+
+import numpy as np
+import soundfile as sf
+
+FRAMES = 10 * 48000
+
+
+def _pcm_file():
+    f = io.BytesIO()
+    data = np.random.uniform(-0.5, 0.5, (FRAMES, 2))
+    sf.write(f, data, 48000, format='WAV', subtype='PCM_16')
+    return f
+
+
+def read_unnormalized_fused(f):
+    f.seek(0)
+    return sf.read(f, dtype='float32', normalize=False)[0]
+
+
+def read_unnormalized_posthoc(f):
+    f.seek(0)
+    return sf.read(f, dtype='float32')[0] * 32768
+
+
+def write_int_to_float_fused(data):
+    sf.write(io.BytesIO(), data, 48000, format='WAV', subtype='FLOAT',
+             scale_int_float_write=True)
+
+
+def write_int_to_float_posthoc(data):
+    sf.write(io.BytesIO(), data.astype('float32') / 32768, 48000,
+             format='WAV', subtype='FLOAT')
+
+
+class TimeScaling:
+
+    params = ['fused', 'posthoc']
+    param_names = ['method']
+
+    def setup(self, method):
+        self.file = _pcm_file()
+        self.int_data = np.random.randint(-2**15, 2**15, (FRAMES, 2),
+                                          dtype='int16')
+
+    def time_read_unnormalized(self, method):
+        if method == 'fused':
+            read_unnormalized_fused(self.file)
+        else:
+            read_unnormalized_posthoc(self.file)
+
+    def time_write_int_to_float(self, method):
+        if method == 'fused':
+            write_int_to_float_fused(self.int_data)
+        else:
+            write_int_to_float_posthoc(self.int_data)
+
+
+if __name__ == '__main__':
+    f = _pcm_file()
+    int_data = np.random.randint(-2**15, 2**15, (FRAMES, 2), dtype='int16')
+    for func, arg in [(read_unnormalized_fused, f),
+                      (read_unnormalized_posthoc, f),
+                      (write_int_to_float_fused, int_data),
+                      (write_int_to_float_posthoc, int_data)]:
+        repeat = 20
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func(arg)
+        duration = (time.perf_counter() - start) / repeat
+        print(f'{func.__name__:28} {duration * 1000:7.2f} ms')
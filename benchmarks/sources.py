@@ -0,0 +1,98 @@
+"""Benchmarks for the different kinds of files that can be opened.
+
+A file name, a file descriptor, a Python file object and an in-memory
+``io.BytesIO`` object are compared, the latter two use libsndfile's
+virtual I/O (i.e. calls from C back into Python).
+
+These can be run with asv_ (see ``asv.conf.json``) or directly::
+
+    python -m benchmarks.sources
+
+.. _asv: https://asv.readthedocs.io/
+
+"""
+import io
+import os
+from contextlib import contextmanager
+
+import soundfile as sf
+
+from .common import fixtures, run
+
+
+class TimeSources:
+
+    params = [['path', 'fd', 'fileobj', 'bytesio'],
+              ['WAV/PCM_16', 'FLAC/PCM_16'], [1024, 65536]]
+    param_names = ['source', 'format', 'blocksize']
+
+    def setup(self, source, format, blocksize):
+        self.filename = fixtures()[format]
+        with open(self.filename, 'rb') as f:
+            self.content = f.read()
+
+    @contextmanager
+    def _open(self, source):
+        if source == 'path':
+            file = self.filename
+        elif source == 'fd':
+            file = os.open(self.filename, os.O_RDONLY)
+        elif source == 'fileobj':
+            file = open(self.filename, 'rb')
+        else:
+            file = io.BytesIO(self.content)
+        try:
+            with sf.SoundFile(file) as f:
+                yield f
+        finally:
+            if source in ('fileobj', 'bytesio'):
+                file.close()
+
+    def time_read(self, source, format, blocksize):
+        with self._open(source) as f:
+            while len(f.read(blocksize, 'float32')):
+                pass
+
+
+class TimeOpenSources(TimeSources):
+
+    params = [['path', 'fd', 'fileobj', 'bytesio'],
+              ['WAV/PCM_16', 'FLAC/PCM_16', 'OGG/VORBIS']]
+    param_names = ['source', 'format']
+
+    def setup(self, source, format):
+        super().setup(source, format, None)
+
+    def time_open(self, source, format):
+        with self._open(source):
+            pass
+
+    def time_read(self, source, format):
+        with self._open(source) as f:
+            f.read(dtype='float32')
+
+
+class TimeIOStats(TimeSources):
+    """Overhead of counting I/O operations, see `soundfile.io_stats()`."""
+
+    params = [['path', 'bytesio'], [False, True]]
+    param_names = ['source', 'io_stats']
+
+    def setup(self, source, io_stats):
+        super().setup(source, 'WAV/PCM_16', None)
+        sf.enable_io_stats(io_stats)
+
+    def teardown(self, source, io_stats):
+        sf.enable_io_stats(False)
+        sf.reset_io_stats()
+
+    def time_read(self, source, io_stats):
+        with self._open(source) as f:
+            while len(f.read(1024, 'float32')):
+                pass
+
+
+if __name__ == '__main__':
+    run(TimeSources)
+    run(TimeOpenSources)
+    run(TimeIOStats)
@@ -0,0 +1,91 @@
+"""Benchmarks for level statistics while reading.
+
+Statistics accumulated block by block while decoding (``stats=...``)
+are compared to computing them on the whole array after reading, and
+to the PEAK chunk and libsndfile's own peak scan.
+
+These can be run with asv_ (see ``asv.conf.json``) or directly::
+
+    python -m benchmarks.stats
+
+.. _asv: https://asv.readthedocs.io/
+
+"""
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import soundfile as sf
+
+
+def _create_file(directory, subtype, seconds=60, samplerate=48000,
+                 channels=2):
+    filename = os.path.join(directory, f'bench_{subtype}.wav')
+    data = np.random.uniform(-0.5, 0.5, (seconds * samplerate, channels))
+    sf.write(filename, data, samplerate, subtype=subtype)
+    return filename
+
+
+def read_with_stats(filename):
+    stats = sf.SignalStats()
+    sf.read(filename, stats=stats)
+    return stats.peak, stats.rms
+
+
+def read_then_stats(filename):
+    data, _ = sf.read(filename, always_2d=True)
+    return np.abs(data).max(axis=0), np.sqrt(np.mean(data**2, axis=0))
+
+
+def peak_chunk(filename):
+    with sf.SoundFile(filename) as f:
+        return f.signal_max(per_channel=True)
+
+
+def calc_signal_max(filename):
+    with sf.SoundFile(filename) as f:
+        return f.calc_signal_max(per_channel=True)
+
+
+class TimeStats:
+
+    def setup(self):
+        self.directory = tempfile.mkdtemp()
+        self.pcm = _create_file(self.directory, 'PCM_16')
+        self.float = _create_file(self.directory, 'FLOAT')
+
+    def teardown(self):
+        shutil.rmtree(self.directory)
+
+    def time_read_with_stats(self):
+        read_with_stats(self.pcm)
+
+    def time_read_then_stats(self):
+        read_then_stats(self.pcm)
+
+    def time_calc_signal_max(self):
+        calc_signal_max(self.pcm)
+
+    def time_peak_chunk(self):
+        peak_chunk(self.float)
+
+
+if __name__ == '__main__':
+    directory = tempfile.mkdtemp()
+    try:
+        pcm = _create_file(directory, 'PCM_16')
+        float_file = _create_file(directory, 'FLOAT')
+        for func, filename in [(read_with_stats, pcm),
+                               (read_then_stats, pcm),
+                               (calc_signal_max, pcm),
+                               (peak_chunk, float_file)]:
+            repeat = 5
+            start = time.perf_counter()
+            for _ in range(repeat):
+                func(filename)
+            duration = (time.perf_counter() - start) / repeat
+            print(f'{func.__name__:16} {duration * 1000:8.2f} ms')
+    finally:
+        shutil.rmtree(directory)
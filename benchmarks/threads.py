@@ -0,0 +1,100 @@
+"""Benchmarks for concurrent use of soundfile from multiple threads.
+
+These can be run with asv_ (see ``asv.conf.json``) or directly::
+
+    python -m benchmarks.threads
+
+.. _asv: https://asv.readthedocs.io/
+
+"""
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import soundfile as sf
+
+from .common import fixtures, run
+
+OPENS_PER_THREAD = 200
+
+
+def _create_file(directory, format='FLAC', frames=44100, channels=2):
+    filename = os.path.join(directory, 'bench.' + format.lower())
+    data = np.random.uniform(-0.5, 0.5, (frames, channels))
+    sf.write(filename, data, 44100, format=format)
+    return filename
+
+
+def _open_many(filename, n):
+    for _ in range(n):
+        with sf.SoundFile(filename):
+            pass
+
+
+def _open_threaded(filename, threads, opens_per_thread=OPENS_PER_THREAD):
+    with ThreadPoolExecutor(threads) as executor:
+        futures = [executor.submit(_open_many, filename, opens_per_thread)
+                   for _ in range(threads)]
+        for future in futures:
+            future.result()
+
+
+class TimeOpenThreads:
+    """Open (and parse the header of) the same file from many threads."""
+
+    params = [['WAV', 'FLAC', 'OGG'], [1, 2, 4, 8]]
+    param_names = ['format', 'threads']
+
+    def setup(self, format, threads):
+        self.directory = tempfile.mkdtemp()
+        self.filename = _create_file(self.directory, format)
+
+    def teardown(self, format, threads):
+        shutil.rmtree(self.directory)
+
+    def time_open(self, format, threads):
+        _open_threaded(self.filename, threads)
+
+
+def _read_threaded(filename, threads, reads_per_thread=4):
+    def read_many():
+        for _ in range(reads_per_thread):
+            sf.read(filename, dtype='float32')
+
+    with ThreadPoolExecutor(threads) as executor:
+        futures = [executor.submit(read_many) for _ in range(threads)]
+        for future in futures:
+            future.result()
+
+
+class TimeReadThreads:
+    """Decode whole files from many threads (libsndfile releases the GIL)."""
+
+    params = [['WAV/PCM_16', 'FLAC/PCM_16', 'OGG/VORBIS'], [1, 2, 4, 8]]
+    param_names = ['format', 'threads']
+
+    def setup(self, format, threads):
+        self.filename = fixtures()[format]
+
+    def time_read(self, format, threads):
+        _read_threaded(self.filename, threads)
+
+
+if __name__ == '__main__':
+    directory = tempfile.mkdtemp()
+    try:
+        for format in TimeOpenThreads.params[0]:
+            filename = _create_file(directory, format)
+            for threads in TimeOpenThreads.params[1]:
+                start = time.perf_counter()
+                _open_threaded(filename, threads)
+                duration = time.perf_counter() - start
+                opens = threads * OPENS_PER_THREAD
+                print(f'{format:5} {threads} threads: '
+                      f'{opens / duration:10.0f} opens/s')
+    finally:
+        shutil.rmtree(directory)
+    run(TimeReadThreads, repeat=1)
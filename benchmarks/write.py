@@ -0,0 +1,164 @@
+"""Benchmarks for writing and appending.
+
+These can be run with asv_ (see ``asv.conf.json``) or directly::
+
+    python -m benchmarks.write
+
+.. _asv: https://asv.readthedocs.io/
+
+"""
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import soundfile as sf
+
+from .common import format_params, run
+
+SECONDS = 10
+
+
+class TimeWrite:
+    """Write 10 seconds of stereo data in blocks of blocksize."""
+
+    params = [format_params(), ['float64', 'float32', 'int16'],
+              [256, 4096, 65536]]
+    param_names = ['format', 'dtype', 'blocksize']
+
+    def setup(self, format, dtype, blocksize):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'bench')
+        self.format, self.subtype = format.split('/')
+        data = np.random.default_rng(0).uniform(-0.5, 0.5,
+                                                (SECONDS * 44100, 2))
+        if dtype == 'int16':
+            data *= 2**15
+        self.data = data.astype(dtype)
+
+    def teardown(self, format, dtype, blocksize):
+        shutil.rmtree(self.directory)
+
+    def time_write(self, format, dtype, blocksize):
+        with sf.SoundFile(self.filename, 'w', 44100, 2, self.subtype,
+                          format=self.format) as f:
+            for start in range(0, len(self.data), blocksize):
+                f.write(self.data[start:start + blocksize])
+
+
+class TimeWriteFunction(TimeWrite):
+    """Write 10 seconds of stereo data with the write() function."""
+
+    params = [format_params(), ['float64', 'int16']]
+    param_names = ['format', 'dtype']
+
+    def setup(self, format, dtype):
+        super().setup(format, dtype, None)
+
+    def teardown(self, format, dtype):
+        super().teardown(format, dtype, None)
+
+    def time_write(self, format, dtype):
+        sf.write(self.filename, self.data, 44100, self.subtype,
+                 format=self.format)
+
+
+class TimeWriteLayout(TimeWriteFunction):
+    """Write 10 seconds of stereo data in different memory layouts."""
+
+    params = [['WAV/PCM_16', 'FLAC/PCM_16'],
+              ['contiguous', 'fortran', 'channel_slice', 'channel_list']]
+    param_names = ['format', 'layout']
+
+    def setup(self, format, layout):
+        super().setup(format, 'float64')
+        if layout == 'fortran':
+            self.data = np.asfortranarray(self.data)
+        elif layout == 'channel_slice':
+            self.data = np.repeat(self.data, 2, axis=1)[:, ::2]
+        elif layout == 'channel_list':
+            self.data = [self.data[:, 0].copy(), self.data[:, 1].copy()]
+
+    def teardown(self, format, layout):
+        super().teardown(format, 'float64')
+
+    def time_write(self, format, layout):
+        sf.write(self.filename, self.data, 44100, self.subtype,
+                 format=self.format,
+                 channels_first=layout == 'channel_list')
+
+    def peakmem_write(self, format, layout):
+        self.time_write(format, layout)
+
+
+class TimeWriteStream:
+    """Write 10 seconds of data from a generator of small blocks."""
+
+    params = [['WAV/PCM_16', 'FLAC/PCM_16'], [64, 1024], [1, 4096]]
+    param_names = ['format', 'blocksize', 'min_blocksize']
+
+    def setup(self, format, blocksize, min_blocksize):
+        TimeWrite.setup(self, format, 'float32', blocksize)
+
+    def teardown(self, format, blocksize, min_blocksize):
+        TimeWrite.teardown(self, format, 'float32', blocksize)
+
+    def time_write_stream(self, format, blocksize, min_blocksize):
+        blocks = (self.data[start:start + blocksize]
+                  for start in range(0, len(self.data), blocksize))
+        sf.write_stream(self.filename, blocks, 44100, self.subtype,
+                        format=self.format, min_blocksize=min_blocksize)
+
+
+class TimeAppend:
+    """Append 10 seconds of data in blocks to an existing file."""
+
+    params = [['WAV/PCM_16', 'WAV/FLOAT'], [256, 4096]]
+    param_names = ['format', 'blocksize']
+
+    def setup(self, format, blocksize):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'bench.wav')
+        self.format, self.subtype = format.split('/')
+        self.data = np.random.default_rng(0).uniform(-0.5, 0.5,
+                                                     (SECONDS * 44100, 2))
+        sf.write(self.filename, self.data, 44100, self.subtype)
+
+    def teardown(self, format, blocksize):
+        shutil.rmtree(self.directory)
+
+    def time_append(self, format, blocksize):
+        with sf.SoundFile(self.filename, 'r+') as f:
+            f.seek(0, sf.SEEK_END)
+            for start in range(0, len(self.data), blocksize):
+                f.write(self.data[start:start + blocksize])
+
+
+class TimeWriteMany:
+    """Write 200 small FLAC files, serially and with write_many()."""
+
+    params = [[0, 1, 2, 4], [False, True]]
+    param_names = ['workers', 'atomic']
+
+    def setup(self, workers, atomic):
+        self.directory = tempfile.mkdtemp()
+        rng = np.random.default_rng(0)
+        self.items = [(os.path.join(self.directory, f'{i}.flac'),
+                       rng.uniform(-0.5, 0.5, 16000), 16000)
+                      for i in range(200)]
+
+    def teardown(self, workers, atomic):
+        shutil.rmtree(self.directory)
+
+    def time_write_many(self, workers, atomic):
+        if workers == 0:
+            for file, data, samplerate in self.items:
+                sf.write(file, data, samplerate)
+        else:
+            sf.write_many(self.items, workers=workers, atomic=atomic)
+
+
+if __name__ == '__main__':
+    for cls in (TimeWrite, TimeWriteFunction, TimeWriteLayout,
+                TimeWriteStream, TimeAppend, TimeWriteMany):
+        run(cls, repeat=1)
@@ -10,10 +10,15 @@ For further information, see https://python-soundfile.readthedocs.io/.
 """
 __version__ = "0.13.1"
 
+import itertools as _itertools
+import logging as _logging
 import os as _os
 import sys as _sys
 import threading as _threading
-from collections.abc import Generator
+import time as _time
+import weakref as _weakref
+from collections.abc import Callable, Generator, Iterable
+from contextlib import contextmanager as _contextmanager
 from ctypes.util import find_library as _find_library
 from os import SEEK_CUR, SEEK_END, SEEK_SET
 from typing import Any, BinaryIO, Final, Literal, TypeAlias
@@ -27,6 +32,7 @@ FileDescriptorOrPath: TypeAlias = str | int | BinaryIO | _os.PathLike[Any]
 AudioData: TypeAlias = numpy.ndarray[tuple[int, ...], numpy.dtype[numpy.float32 | numpy.float64 | numpy.int32 | numpy.int16]]
 AudioData_2d: TypeAlias = numpy.ndarray[tuple[int, int], numpy.dtype[numpy.float32 | numpy.float64 | numpy.int32 | numpy.int16]]
 dtype_str: TypeAlias = Literal['float64', 'float32', 'int32', 'int16']
+MixMatrix: TypeAlias = Literal['mono'] | numpy.ndarray | list[list[float]]
 _snd: Any
 _ffi: Any
 
@@ -159,6 +165,88 @@ _bitrate_modes: Final[dict[str, int]] = {
     'VARIABLE': 2,
 }
 
+_loop_modes: Final[dict[str, int]] = {
+    'NONE': 800,
+    'FORWARD': 801,
+    'BACKWARD': 802,
+    'ALTERNATING': 803,
+}
+
+# Fields of the BEXT chunk, see SoundFile.get_broadcast_info():
+_broadcast_str_fields = ('description', 'originator', 'originator_reference',
+                         'origination_date', 'origination_time')
+_broadcast_loudness_fields = ('loudness_value', 'loudness_range',
+                              'max_true_peak_level', 'max_momentary_loudness',
+                              'max_shortterm_loudness')
+_max_coding_history = 16 * 1024  # the maximum size used by libsndfile
+
+_cue_point_fields = ('index', 'position', 'fcc_chunk', 'chunk_start',
+                     'block_start', 'sample_offset', 'name')
+
+_instrument_fields = ('gain', 'basenote', 'detune', 'velocity_lo',
+                      'velocity_hi', 'key_lo', 'key_hi')
+
+# Narrowest dtype that holds the decoded samples of a subtype without loss
+# (unknown subtypes use 'float64'):
+_lossless_dtypes: Final[dict[str, str]] = {
+    'PCM_S8':       'int16',
+    'PCM_U8':       'int16',
+    'PCM_16':       'int16',
+    'ULAW':         'int16',
+    'ALAW':         'int16',
+    'IMA_ADPCM':    'int16',
+    'MS_ADPCM':     'int16',
+    'GSM610':       'int16',
+    'VOX_ADPCM':    'int16',
+    'NMS_ADPCM_16': 'int16',
+    'NMS_ADPCM_24': 'int16',
+    'NMS_ADPCM_32': 'int16',
+    'G721_32':      'int16',
+    'G723_24':      'int16',
+    'G723_40':      'int16',
+    'DWVW_12':      'int16',
+    'DWVW_16':      'int16',
+    'DPCM_8':       'int16',
+    'DPCM_16':      'int16',
+    'ALAC_16':      'int16',
+    'PCM_24':       'int32',
+    'DWVW_24':      'int32',
+    'ALAC_20':      'int32',
+    'ALAC_24':      'int32',
+    'PCM_32':       'int32',
+    'ALAC_32':      'int32',
+    'FLOAT':        'float32',
+    'VORBIS':       'float32',
+    'OPUS':         'float32',
+    'MPEG_LAYER_I':   'float32',
+    'MPEG_LAYER_II':  'float32',
+    'MPEG_LAYER_III': 'float32',
+    'DOUBLE':       'float64',
+}
+
+# Subtypes with more than 24 significant bits, which don't fit into float32:
+_wide_int_subtypes: Final[frozenset[str]] = frozenset(
+    ['PCM_32', 'ALAC_32', 'DWVW_N'])
+
+# Sample size in bytes of subtypes that can be copied with sf_read_raw()
+# and sf_write_raw() ...
+_raw_sample_sizes: Final[dict[str, int]] = {
+    'PCM_S8': 1,
+    'PCM_U8': 1,
+    'PCM_16': 2,
+    'PCM_24': 3,
+    'PCM_32': 4,
+    'FLOAT':  4,
+    'DOUBLE': 8,
+    'ULAW':   1,
+    'ALAW':   1,
+}
+
+# ... in these major formats:
+_raw_formats: Final[frozenset[str]] = frozenset(
+    ['WAV', 'WAVEX', 'W64', 'RF64', 'AIFF', 'AU', 'CAF', 'RAW', 'IRCAM',
+     'NIST'])
+
 try:  # packaged lib (in _soundfile_data which should be on python path)
     if _sys.platform == 'darwin':
         from platform import machine as _machine
@@ -223,10 +311,138 @@ if __libsndfile_version__.startswith('libsndfile-'):
     __libsndfile_version__ = __libsndfile_version__[len('libsndfile-'):]
 
 
+class SignalStats:
+    """Per-channel level statistics, accumulated block by block.
+
+    An instance can be passed as *stats* to `read()` and `blocks()`
+    (or `SoundFile.read()` and `SoundFile.blocks()`), which update it
+    with each block of audio data right after it was decoded, while
+    the block is still in the CPU cache.  This way, no second pass
+    over a large array is needed.
+
+    All values are relative to full scale: integer data is divided by
+    ``2**15`` (``'int16'``) or ``2**31`` (``'int32'``), floating point
+    data is used as is.  Samples at or beyond full scale (i.e. with an
+    absolute value of ``1.0`` or more, or the largest and smallest
+    integer values) are counted as clipped.
+
+    Examples
+    --------
+    >>> import soundfile as sf
+    >>> stats = sf.SignalStats()
+    >>> data, samplerate = sf.read('stereo_file.wav', stats=stats)
+    >>> stats.peak, stats.rms
+    (array([0.98, 0.95]), array([0.21, 0.19]))
+
+    """
+
+    def __init__(self) -> None:
+        self.frames = 0
+        """The number of frames seen so far."""
+        self._max = None
+        self._min = None
+        self._sum = None
+        self._sum_squares = None
+        self._clipped = None
+
+    def __repr__(self) -> str:
+        return f"SignalStats(frames={self.frames}, channels={self.channels})"
+
+    @property
+    def channels(self) -> int:
+        """The number of channels (``0`` before any data was seen)."""
+        return 0 if self._sum is None else len(self._sum)
+
+    @property
+    def max(self) -> numpy.ndarray:
+        """The largest sample value of each channel."""
+        return self._get(self._max)
+
+    @property
+    def min(self) -> numpy.ndarray:
+        """The smallest sample value of each channel."""
+        return self._get(self._min)
+
+    @property
+    def peak(self) -> numpy.ndarray:
+        """The largest absolute sample value of each channel."""
+        return numpy.maximum(self.max, -self.min)
+
+    @property
+    def rms(self) -> numpy.ndarray:
+        """The root mean square of each channel."""
+        return numpy.sqrt(self._get(self._sum_squares) / max(self.frames, 1))
+
+    @property
+    def dc_offset(self) -> numpy.ndarray:
+        """The mean value of each channel."""
+        return self._get(self._sum) / max(self.frames, 1)
+
+    @property
+    def clipped(self) -> numpy.ndarray:
+        """The number of clipped samples of each channel."""
+        return self._get(self._clipped)
+
+    def update(self, data: AudioData | AudioData_2d) -> None:
+        """Add a block of audio data (frames x channels).
+
+        One-dimensional *data* is treated as a single channel.
+
+        """
+        data = numpy.asarray(data)
+        if data.ndim == 1:
+            data = data[:, numpy.newaxis]
+        if self._sum is None:
+            channels = data.shape[1]
+            self._max = numpy.full(channels, -numpy.inf)
+            self._min = numpy.full(channels, numpy.inf)
+            self._sum = numpy.zeros(channels)
+            self._sum_squares = numpy.zeros(channels)
+            self._clipped = numpy.zeros(channels, dtype='int64')
+        elif data.shape[1] != len(self._sum):
+            raise ValueError(f"Invalid shape: {data.shape!r} (Expected "
+                             f"{len(self._sum)} channels)")
+        if not len(data):
+            return
+        if data.dtype.kind == 'f':
+            full_scale = 1.0
+            clip_max, clip_min = 1.0, -1.0
+        else:
+            full_scale = float(2 ** (8 * data.dtype.itemsize - 1))
+            info = numpy.iinfo(data.dtype)
+            clip_max, clip_min = info.max, info.min
+        # Reducing each column separately is much faster than reducing
+        # along axis 0 of the interleaved (frames x channels) array:
+        for channel, column in enumerate(data.T):
+            self._max[channel] = max(self._max[channel],
+                                     column.max() / full_scale)
+            self._min[channel] = min(self._min[channel],
+                                     column.min() / full_scale)
+            self._clipped[channel] += (
+                numpy.count_nonzero(column >= clip_max) +
+                numpy.count_nonzero(column <= clip_min))
+            column = column.astype('float64')
+            self._sum[channel] += column.sum() / full_scale
+            self._sum_squares[channel] += column.dot(column) / full_scale**2
+        self.frames += len(data)
+
+    def _get(self, value):
+        if value is None:
+            return numpy.zeros(0)
+        if not self.frames:
+            return numpy.zeros_like(value)
+        return value.copy()
+
+
 def read(file: FileDescriptorOrPath, frames: int = -1, start: int = 0, stop: int | None = None, dtype: dtype_str = 'float64',
         always_2d: bool = False, fill_value: float | None = None, out: AudioData | AudioData_2d | None = None,
         samplerate: int | None = None, channels: int | None = None, format: str | None = None, subtype: str | None = None,
-        endian: str | None = None, closefd: bool = True) -> tuple[AudioData | AudioData_2d, int]:
+        endian: str | None = None, closefd: bool = True,
+        normalize: bool = True, clipping: bool = True,
+        scale_float_int_read: bool = False,
+        samplerate_out: int | None = None,
+        mix: MixMatrix | None = None,
+        stats: SignalStats | None = None) -> tuple[AudioData | AudioData_2d, int]:
 
     """Provide audio data from a sound file as NumPy array.
 
@@ -262,6 +478,7 @@ def read(file: FileDescriptorOrPath, frames: int = -1, start: int = 0, stop: int
             scale the data to [-1.0, 1.0). If the file contains
             ``np.array([42.6], dtype='float32')``, you will read
             ``np.array([43], dtype='int32')`` for ``dtype='int32'``.
+            See *scale_float_int_read* for scaling by libsndfile.
 
     Returns
     -------
@@ -277,7 +494,8 @@ def read(file: FileDescriptorOrPath, frames: int = -1, start: int = 0, stop: int
         only a part of *out* is overwritten and a view containing all
         valid frames is returned.
     samplerate : int
-        The sample rate of the audio file.
+        The sample rate of the audio file (or *samplerate_out*, if
+        given).
 
     Other Parameters
     ----------------
@@ -297,6 +515,19 @@ def read(file: FileDescriptorOrPath, frames: int = -1, start: int = 0, stop: int
         not given, it is obtained from the length of *out*.
     samplerate, channels, format, subtype, endian, closefd
         See `SoundFile`.
+    normalize, clipping, scale_float_int_read
+        See `SoundFile`.
+    samplerate_out : int, optional
+        Resample to this sample rate while reading, block by block,
+        see `SoundFile.read()`.  *frames*, *start* and *stop* are
+        given in frames at this sample rate.
+    mix : {'mono'} or array_like, optional
+        Mix the channels while reading, block by block, either to
+        ``'mono'`` or with a gain matrix of shape (output channels x
+        file channels), see `SoundFile.read()`.
+    stats : SignalStats, optional
+        Accumulate peak, RMS, DC offset and clip counts while reading,
+        see `SignalStats`.
 
     Examples
     --------
@@ -312,18 +543,176 @@ def read(file: FileDescriptorOrPath, frames: int = -1, start: int = 0, stop: int
 
     """
     with SoundFile(file, 'r', samplerate, channels,
-                   subtype, endian, format, closefd) as f:
-        frames = f._prepare_read(start, stop, frames)
-        data = f.read(frames, dtype, always_2d, fill_value, out)
-    return data, f.samplerate
+                   subtype, endian, format, closefd,
+                   normalize=normalize, clipping=clipping,
+                   scale_float_int_read=scale_float_int_read) as f:
+        frames = f._prepare_read(start, stop, frames, samplerate_out)
+        data = f.read(frames, dtype, always_2d, fill_value, out,
+                      samplerate_out, mix, stats)
+    return data, samplerate_out or f.samplerate
+
+
+def read_batch(files: Iterable[FileDescriptorOrPath], frames: int | None = None,
+               dtype: dtype_str = 'float64', pad_value: float = 0,
+               planar: bool = False, offsets: Iterable[int] | None = None,
+               random_crop: bool = False, rng: Any = None,
+               workers: int | None = None,
+               **kwargs: Any) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """Read many sound files into one padded batch array.
+
+    A single array is allocated for the whole batch and each file is
+    decoded directly into its part of it, without temporary arrays
+    per file.  Shorter files are padded with *pad_value*, longer files
+    are cut to *frames*.  All files must have the same number of
+    channels and the same sample rate.
+
+    Parameters
+    ----------
+    files : iterable of str or int or file-like object
+        The files to read from.  See `SoundFile` for details.
+    frames : int, optional
+        The number of frames per item, by default the number of frames
+        of the longest file.
+    dtype : {'float64', 'float32', 'int32', 'int16'}, optional
+        Data type of the returned array, see `read()`.
+    pad_value : float, optional
+        The value of the frames after the end of shorter files.
+    planar : bool, optional
+        Return an array of shape (files x channels x frames) instead of
+        (files x frames x channels).
+    offsets : iterable of int, optional
+        The frame to start reading at, for each file.
+    random_crop : bool, optional
+        Start reading each file at a random frame, such that *frames*
+        frames are left in the file (or at the beginning, if the file
+        is shorter).  Not allowed if *offsets* is given.
+    rng : numpy.random.Generator or int, optional
+        The random number generator (or its seed) for *random_crop*.
+    workers : int, optional
+        Decode the files on this many threads.  By default, they are
+        decoded one after the other.  Files given by name are opened
+        once to get their length and again when they are decoded, so
+        at most one of them (or one per worker) is open at a time.
+    **kwargs
+        Further arguments for `SoundFile`, e.g. *samplerate*,
+        *channels* and *subtype* for RAW files.
+
+    Returns
+    -------
+    data : numpy.ndarray
+        The three-dimensional batch array.
+    lengths : numpy.ndarray
+        The number of frames read from each file, the rest of each item
+        is padding.
+
+    Examples
+    --------
+    >>> import soundfile as sf
+    >>> data, lengths = sf.read_batch(['a.wav', 'b.wav'], dtype='float32')
+    >>> mask = np.arange(data.shape[1]) < lengths[:, None]
+
+    """
+    if offsets is not None and random_crop:
+        raise ValueError("Only one of {offsets, random_crop} may be used")
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be at least 1")
+    opened = []
+    try:
+        for file in files:
+            f = SoundFile(file, 'r', **kwargs)
+            opened.append(f)
+            if isinstance(f.name, (str, bytes)):
+                # reopened when it is read, to keep one descriptor open
+                f.close()
+        if not opened:
+            raise ValueError("No files given")
+        channels, samplerate = opened[0].channels, opened[0].samplerate
+        for f in opened:
+            if f.channels != channels:
+                raise ValueError(f"All files must have {channels} channels, "
+                                 f"{f.name!r} has {f.channels}")
+            if f.samplerate != samplerate:
+                raise ValueError(f"All files must have a sample rate of "
+                                 f"{samplerate}, {f.name!r} has "
+                                 f"{f.samplerate}")
+        if frames is None:
+            frames = max(f.frames for f in opened)
+        if frames < 0:
+            raise ValueError("frames must not be negative")
+        if random_crop:
+            rng = numpy.random.default_rng(rng)
+            offsets = [rng.integers(max(f.frames - frames, 0), endpoint=True)
+                       for f in opened]
+        elif offsets is None:
+            offsets = [0] * len(opened)
+        else:
+            offsets = list(offsets)
+            if len(offsets) != len(opened):
+                raise ValueError(f"Expected {len(opened)} offsets, "
+                                 f"got {len(offsets)}")
 
+        if planar:
+            out = numpy.empty((len(opened), channels, frames), dtype)
+        else:
+            out = numpy.empty((len(opened), frames, channels), dtype)
+        def read_item(item):
+            f, item_out, offset = item
+            if not f.closed:
+                return _read_batch_item(f, item_out, offset, planar,
+                                        pad_value)
+            with SoundFile(f.name, 'r', **kwargs) as f:
+                return _read_batch_item(f, item_out, offset, planar,
+                                        pad_value)
+
+        items = zip(opened, out, offsets)
+        if workers is None:
+            lengths = [read_item(item) for item in items]
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(workers) as pool:
+                lengths = list(pool.map(read_item, items))
+    finally:
+        for f in opened:
+            f.close()
+    return out, numpy.array(lengths, dtype=numpy.int64)
+
+
+def _read_batch_item(f, out, offset, planar, pad_value):
+    """Read one file of read_batch() into its item and return the length."""
+    if offset:
+        f.seek(offset)
+    if not planar:
+        length = len(f.read(out=out))
+        out[length:] = pad_value
+        return length
+    # the transposed item is not C-contiguous, read through a small buffer
+    buffer = f._create_empty_array(min(out.shape[1], 65536), True,
+                                   out.dtype)
+    length = 0
+    try:
+        while length < out.shape[1]:
+            block = f.read(min(len(buffer), out.shape[1] - length),
+                           out=buffer)
+            if not len(block):
+                break
+            out[:, length:length + len(block)] = block.T
+            length += len(block)
+    finally:
+        f._release_array(buffer)
+    out[:, length:] = pad_value
+    return length
 
 
 def write(file: FileDescriptorOrPath, data: AudioData, samplerate: int,
           subtype: str | None = None, endian: str | None = None,
           format: str | None = None, closefd: bool = True,
           compression_level: float | None = None,
-          bitrate_mode: str | None = None) -> None:
+          bitrate_mode: str | None = None, normalize: bool = True,
+          clipping: bool = True,
+          scale_int_float_write: bool = False,
+          add_peak_chunk: bool = True, vbr_quality: float | None = None,
+          ogg_page_latency: float | None = None,
+          channels_first: bool = False) -> None:
     """Write data to a sound file.
 
     .. note:: If *file* exists, it will be truncated and overwritten!
@@ -345,7 +734,8 @@ def write(file: FileDescriptorOrPath, data: AudioData, samplerate: int,
                   [-1.0, 1.0). If you write the value ``np.array([42],
                   dtype='int32')``, to a ``subtype='FLOAT'`` file, the
                   file will then contain ``np.array([42.],
-                  dtype='float32')``.
+                  dtype='float32')``.  See *scale_int_float_write* for
+                  scaling by libsndfile.
 
     samplerate : int
         The sample rate of the audio data.
@@ -357,6 +747,12 @@ def write(file: FileDescriptorOrPath, data: AudioData, samplerate: int,
     ----------------
     format, endian, closefd, compression_level, bitrate_mode
         See `SoundFile`.
+    normalize, clipping, scale_int_float_write, add_peak_chunk
+        See `SoundFile`.
+    vbr_quality, ogg_page_latency
+        See `SoundFile`.
+    channels_first : bool, optional
+        *data* is given as (channels x frames), see `SoundFile.write()`.
 
     Examples
     --------
@@ -367,16 +763,267 @@ def write(file: FileDescriptorOrPath, data: AudioData, samplerate: int,
     >>> sf.write('stereo_file.wav', np.random.randn(10, 2), 44100, 'PCM_24')
 
     """
-    import numpy as np
-    data = np.asarray(data)
-    if data.ndim == 1:
-        channels = 1
-    else:
-        channels = data.shape[1]
+    data, channels = _data_channels(data, channels_first)
+    with SoundFile(file, 'w', samplerate, channels,
+                   subtype, endian, format, closefd,
+                   compression_level, bitrate_mode, normalize, clipping,
+                   scale_int_float_write=scale_int_float_write,
+                   add_peak_chunk=add_peak_chunk, vbr_quality=vbr_quality,
+                   ogg_page_latency=ogg_page_latency) as f:
+        f.write(data, channels_first)
+
+
+def write_stream(file: FileDescriptorOrPath, blocks: Iterable[AudioData],
+                 samplerate: int, subtype: str | None = None,
+                 endian: str | None = None, format: str | None = None,
+                 closefd: bool = True,
+                 compression_level: float | None = None,
+                 bitrate_mode: str | None = None, normalize: bool = True,
+                 clipping: bool = True,
+                 scale_int_float_write: bool = False,
+                 add_peak_chunk: bool = True,
+                 vbr_quality: float | None = None,
+                 ogg_page_latency: float | None = None,
+                 channels_first: bool = False,
+                 min_blocksize: int = 4096) -> int:
+    """Write blocks of audio data from an iterable to a sound file.
+
+    The blocks are taken from *blocks* one at a time, so the whole
+    signal never has to be in memory.  The number of channels is taken
+    from the first block.  Blocks shorter than *min_blocksize* are
+    collected in a buffer and written together, to avoid many small
+    calls to libsndfile.
+
+    .. note:: If *file* exists, it will be truncated and overwritten!
+
+    Parameters
+    ----------
+    file : str or int or file-like object
+        The file to write to.  See `SoundFile` for details.
+    blocks : iterable of array_like
+        The blocks of audio data, see `write()`.  All blocks must have
+        the same number of channels.  The blocks are copied or written
+        before the next one is taken, so a generator may reuse its
+        arrays (e.g. `blocks()` with *out*).
+    samplerate : int
+        The sample rate of the audio data.
+    subtype, endian, format, closefd
+        See `SoundFile`.
+
+    Returns
+    -------
+    int
+        The number of frames written.
+
+    Other Parameters
+    ----------------
+    compression_level, bitrate_mode, normalize, clipping, \
+scale_int_float_write, add_peak_chunk, vbr_quality, ogg_page_latency
+        See `SoundFile`.
+    channels_first : bool, optional
+        The blocks are given as (channels x frames), see
+        `SoundFile.write()`.
+    min_blocksize : int, optional
+        Blocks with fewer frames are combined until at least this many
+        frames can be written at once.
+
+    Examples
+    --------
+    Convert a file block by block:
+
+    >>> import soundfile as sf
+    >>> sf.write_stream('new_file.flac', sf.blocks('stereo_file.wav',
+    ...                                            blocksize=65536),
+    ...                 44100)
+
+    """
+    blocks = iter(blocks)
+    try:
+        first = next(blocks)
+    except StopIteration:
+        raise ValueError("blocks must contain at least one block") from None
+    first, channels = _data_channels(first, channels_first)
     with SoundFile(file, 'w', samplerate, channels,
                    subtype, endian, format, closefd,
-                   compression_level, bitrate_mode) as f:
-        f.write(data)
+                   compression_level, bitrate_mode, normalize, clipping,
+                   scale_int_float_write=scale_int_float_write,
+                   add_peak_chunk=add_peak_chunk, vbr_quality=vbr_quality,
+                   ogg_page_latency=ogg_page_latency) as f:
+        return f._write_coalesced(_itertools.chain([first], blocks),
+                                  min_blocksize, channels_first)
+
+
+class WriteResult:
+    """The outcome of writing one file with `write_many()`.
+
+    Attributes
+    ----------
+    file : str or int or file-like object
+        The *file* of the item.
+    duration : float
+        The time in seconds it took to write the file (or to fail).
+    error : Exception or None
+        The exception which was raised while writing, if any.
+
+    """
+
+    def __init__(self, file, duration, error=None):
+        self.file = file
+        self.duration: float = duration
+        self.error: BaseException | None = error
+
+    def __repr__(self) -> str:
+        return (f"WriteResult({self.file!r}, duration={self.duration:.6f}, "
+                f"error={self.error!r})")
+
+
+def write_many(items: Iterable[tuple], workers: int | None = None,
+               atomic: bool = False,
+               executor: Literal['thread', 'process'] = 'thread',
+               max_pending: int | None = None,
+               **kwargs: Any) -> list[WriteResult]:
+    """Write many sound files in parallel.
+
+    Each item is written with `write()` on a pool of *workers*.  Items
+    are taken from *items* only when there is room for them, so a
+    generator can produce the data on the fly with bounded memory.
+    Errors don't stop the other items, they are returned instead.
+
+    Parameters
+    ----------
+    items : iterable of tuples
+        ``(file, data, samplerate)`` or ``(file, data, samplerate,
+        options)`` tuples, where *options* is a dictionary of keyword
+        arguments for `write()`.
+    workers : int, optional
+        The number of threads or processes, by default the number of
+        CPUs.
+    atomic : bool, optional
+        Write each file to a temporary file in the same directory,
+        which replaces *file* only when it was written completely.
+        This requires *file* to be a path.
+    executor : {'thread', 'process'}, optional
+        Whether to use a thread pool (libsndfile doesn't hold the GIL
+        while encoding) or a process pool (items must be picklable).
+    max_pending : int, optional
+        The maximum number of items submitted to the pool at a time, by
+        default twice the number of *workers*.
+    **kwargs
+        Keyword arguments for `write()` which are used for all items,
+        *options* of an item take precedence.
+
+    Returns
+    -------
+    list of WriteResult
+        The duration and error of each item, in the order of *items*.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> import soundfile as sf
+    >>> items = ((f'noise{i}.flac', np.random.randn(8000) * 0.1, 8000)
+    ...          for i in range(1000))
+    >>> results = sf.write_many(items, workers=8, atomic=True)
+    >>> [r.file for r in results if r.error is not None]
+    []
+
+    """
+    from concurrent.futures import (FIRST_COMPLETED, ProcessPoolExecutor,
+                                    ThreadPoolExecutor, wait)
+    if executor == 'thread':
+        pool_class = ThreadPoolExecutor
+    elif executor == 'process':
+        pool_class = ProcessPoolExecutor
+    else:
+        raise ValueError(f"Invalid executor: {executor!r}")
+    if workers is None:
+        workers = _os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    if max_pending is None:
+        max_pending = 2 * workers
+    if max_pending < 1:
+        raise ValueError("max_pending must be at least 1")
+
+    results = []
+    pending = {}
+
+    def collect(futures):
+        for future in futures:
+            index = pending.pop(future)
+            try:
+                results[index] = future.result()
+            except BaseException as e:
+                # e.g. if the process pool can't transfer the result
+                results[index] = WriteResult(results[index], 0.0, e)
+
+    with pool_class(workers) as pool:
+        for item in items:
+            if not 3 <= len(item) <= 4:
+                raise TypeError(f"Items must be (file, data, samplerate"
+                                f"[, options]) tuples, not {item!r}")
+            file, data, samplerate, *options = item
+            options = {**kwargs, **(options[0] if options else {})}
+            future = pool.submit(_write_item, file, data, samplerate,
+                                 atomic, options)
+            pending[future] = len(results)
+            results.append(file)
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        collect(list(pending))
+    return results
+
+
+def _write_item(file, data, samplerate, atomic, options):
+    """Write one item of write_many() and return a WriteResult."""
+    start = _time.perf_counter()
+    try:
+        if atomic:
+            _write_atomic(file, data, samplerate, options)
+        else:
+            write(file, data, samplerate, **options)
+    except Exception as e:
+        return WriteResult(file, _time.perf_counter() - start, e)
+    return WriteResult(file, _time.perf_counter() - start)
+
+
+def _write_atomic(file, data, samplerate, options):
+    """Write to a temporary file and rename it to *file*.
+
+    The new file gets the permissions of an existing *file*, otherwise
+    the ones of a file created by `write()` (i.e. depending on the
+    umask).
+
+    """
+    import uuid
+    if isinstance(file, _os.PathLike):
+        file = _os.fspath(file)
+    if not isinstance(file, (str, bytes)):
+        raise TypeError(f"atomic=True requires a file name, not {file!r}")
+    if isinstance(file, bytes):
+        file = _os.fsdecode(file)
+    directory, basename = _os.path.split(file)
+    if 'format' not in options:
+        # keep the extension, it determines the format
+        options = dict(options, format=_get_format_from_filename(file, 'w'))
+    # not tempfile.mkstemp(), which ignores the umask and uses 0o600:
+    tmpname = _os.path.join(directory, f'.{basename}.{uuid.uuid4().hex}.tmp')
+    _os.close(_os.open(tmpname, _os.O_WRONLY | _os.O_CREAT | _os.O_EXCL,
+                       0o666))
+    try:
+        try:
+            mode = _os.stat(file).st_mode & 0o7777
+        except OSError:
+            pass
+        else:
+            _os.chmod(tmpname, mode)
+        write(tmpname, data, samplerate, **options)
+        _os.replace(tmpname, file)
+    except BaseException:
+        _os.remove(tmpname)
+        raise
+
 
 def blocks(file: FileDescriptorOrPath, blocksize: int | None = None,
            overlap: int = 0, frames: int = -1, start: int = 0,
@@ -385,7 +1032,13 @@ def blocks(file: FileDescriptorOrPath, blocksize: int | None = None,
            out: AudioData | AudioData_2d | None = None, samplerate: int | None = None,
            channels: int | None = None, format: str | None = None,
            subtype: str | None = None, endian: str | None = None,
-           closefd: bool = True) -> Generator[AudioData, None, None] | Generator[AudioData_2d, None, None]:
+           closefd: bool = True, normalize: bool = True,
+           clipping: bool = True, scale_float_int_read: bool = False,
+           samplerate_out: int | None = None,
+           mix: MixMatrix | None = None,
+           stats: SignalStats | None = None, follow: bool = False,
+           poll_interval: float = 0.1,
+           idle_timeout: float | None = None) -> Generator[AudioData, None, None] | Generator[AudioData_2d, None, None]:
     """Return a generator for block-wise reading.
 
     By default, iteration starts at the beginning and stops at the end
@@ -425,6 +1078,17 @@ def blocks(file: FileDescriptorOrPath, blocksize: int | None = None,
         See `read()`.
     samplerate, channels, format, subtype, endian, closefd
         See `SoundFile`.
+    normalize, clipping, scale_float_int_read
+        See `SoundFile`.
+    samplerate_out : int, optional
+        Resample while reading, see `SoundFile.blocks()`.
+    mix : {'mono'} or array_like, optional
+        Mix the channels while reading, see `SoundFile.read()`.
+    stats : SignalStats, optional
+        Accumulate level statistics while reading, see `SignalStats`.
+    follow, poll_interval, idle_timeout
+        Keep reading from a file which is still being written, see
+        `SoundFile.blocks()`.
 
     Examples
     --------
@@ -434,9 +1098,149 @@ def blocks(file: FileDescriptorOrPath, blocksize: int | None = None,
 
     """
     with SoundFile(file, 'r', samplerate, channels,
-                   subtype, endian, format, closefd) as f:
-        frames = f._prepare_read(start, stop, frames)
-        yield from f.blocks(blocksize, overlap, frames, dtype, always_2d, fill_value, out)
+                   subtype, endian, format, closefd,
+                   normalize=normalize, clipping=clipping,
+                   scale_float_int_read=scale_float_int_read) as f:
+        if follow and frames < 0 and stop is None:
+            # read until the end, wherever it is
+            f._prepare_read(start, stop, frames, samplerate_out)
+        else:
+            frames = f._prepare_read(start, stop, frames, samplerate_out)
+        yield from f.blocks(blocksize, overlap, frames, dtype, always_2d,
+                            fill_value, out, samplerate_out, mix, stats,
+                            follow, poll_interval, idle_timeout)
+
+
+def convert(src: FileDescriptorOrPath, dst: FileDescriptorOrPath,
+            format: str | None = None, subtype: str | None = None,
+            endian: str | None = None, blocksize: int = 65536,
+            compression_level: float | None = None,
+            bitrate_mode: str | None = None) -> int:
+    """Convert a sound file to another format with constant memory.
+
+    The audio data is streamed block-wise from *src* to *dst* through a
+    single reusable buffer, so the whole file never has to fit into
+    memory.  Metadata strings (see `SoundFile.copy_metadata()`) are
+    copied if the destination format supports them.
+
+    Samples are passed through the narrowest data type that represents
+    the source subtype without loss (e.g. ``'int16'`` for ``'PCM_16'``).
+    If source and destination have the same major format, subtype and
+    endian-ness, the encoded data is copied unchanged without decoding
+    it (for uncompressed formats).
+
+    .. note:: If *dst* exists, it will be truncated and overwritten!
+
+    Parameters
+    ----------
+    src : str or int or file-like object
+        The file to read from.  See `SoundFile` for details.
+    dst : str or int or file-like object
+        The file to write to.  See `SoundFile` for details.
+    format : str, optional
+        The major format of *dst*.  By default, it is determined from
+        the file extension of *dst*, if *dst* has no file extension,
+        the format of *src* is used.
+    subtype : str, optional
+        The subtype of *dst*.  By default, the subtype of *src* is kept
+        if *format* supports it, otherwise `default_subtype()` is used.
+    blocksize : int, optional
+        The number of frames to convert at once.
+
+    Returns
+    -------
+    int
+        The number of frames that were written.
+
+    Other Parameters
+    ----------------
+    endian, compression_level, bitrate_mode
+        See `SoundFile`.
+
+    Examples
+    --------
+    >>> import soundfile as sf
+    >>> sf.convert('long_file.wav', 'long_file.flac')
+    158760000
+
+    """
+    if blocksize < 1:
+        raise ValueError("blocksize must be at least 1")
+    with SoundFile(src) as infile:
+        if format is None:
+            format = _get_format_from_filename(dst, 'r') or infile.format
+        if subtype is None:
+            if check_format(format, infile.subtype, endian):
+                subtype = infile.subtype
+            else:
+                subtype = default_subtype(format)
+        with SoundFile(dst, 'w', infile.samplerate, infile.channels,
+                       subtype, endian, format,
+                       compression_level=compression_level,
+                       bitrate_mode=bitrate_mode) as outfile:
+            for name, value in infile.copy_metadata().items():
+                try:
+                    setattr(outfile, name, value)
+                except LibsndfileError:
+                    pass  # not supported by this format
+            if _is_raw_copy_possible(infile, outfile):
+                return _raw_copy(infile, outfile, blocksize)
+            dtype = _convert_dtype(infile.subtype, outfile.subtype)
+            out = infile._create_empty_array(blocksize, True, dtype)
+            frames = 0
+            try:
+                while True:
+                    block = infile.read(out=out)
+                    if not len(block):
+                        break
+                    outfile.write(block)
+                    frames += len(block)
+            finally:
+                infile._release_array(out)
+            return frames
+
+
+def _convert_dtype(src_subtype, dst_subtype):
+    """Return the narrowest dtype for lossless conversion in convert()."""
+    src_dtype = _lossless_dtypes.get(src_subtype, 'float64')
+    dst_dtype = _lossless_dtypes.get(dst_subtype, 'float64')
+    if src_dtype.startswith('int') and not dst_dtype.startswith('int'):
+        # int data is not scaled when written to float files,
+        # therefore it has to be read as (normalised) float data:
+        if src_subtype in _wide_int_subtypes:
+            return 'float64'
+        return 'float32'
+    return src_dtype
+
+
+def _is_raw_copy_possible(infile, outfile):
+    """Check if convert() can copy the encoded data unchanged."""
+    return (infile.format == outfile.format and
+            infile.format in _raw_formats and
+            infile.subtype == outfile.subtype and
+            infile.subtype in _raw_sample_sizes and
+            infile.endian == outfile.endian and
+            infile.channels == outfile.channels)
+
+
+def _raw_copy(infile, outfile, blocksize):
+    """Copy encoded audio data with sf_read_raw() and sf_write_raw()."""
+    infile._check_if_closed()
+    outfile._check_if_closed()
+    framesize = _raw_sample_sizes[infile.subtype] * infile.channels
+    buffer = _ffi_new_uninitialized('char[]', blocksize * framesize)
+    frames = 0
+    while True:
+        read = _snd.sf_read_raw(infile._file, buffer, len(buffer))
+        _error_check(infile._errorcode)
+        if read <= 0:
+            break
+        written = _snd.sf_write_raw(outfile._file, buffer, read)
+        _error_check(outfile._errorcode)
+        assert written == read
+        frames += read // framesize
+    outfile._update_frames(frames)
+    return frames
 
 
 class _SoundFileInfo:
@@ -457,6 +1261,10 @@ class _SoundFileInfo:
             self.subtype_info: str = f.subtype_info
             self.sections: int = f.sections
             self.extra_info: str = f.extra_info
+            self.metadata: dict[str, str] = f.copy_metadata()
+            self.broadcast_info: dict[str, Any] | None = f.get_broadcast_info()
+            self.cue_points: list[dict[str, Any]] = f.get_cue_points()
+            self.instrument: dict[str, Any] | None = f.get_instrument()
 
     @property
     def _duration_str(self):
@@ -488,12 +1296,22 @@ class _SoundFileInfo:
                  f"frames: {self.frames}",
                  'extra_info: """',
                  f'    {indented_extra_info}"""'])
+            for name in 'metadata', 'broadcast_info', 'cue_points', 'instrument':
+                if getattr(self, name):
+                    info += f"\n{name}: {getattr(self, name)!r}"
         return info
 
 
 def info(file: FileDescriptorOrPath, verbose: bool = False) -> _SoundFileInfo:
     """Returns an object with information about a `SoundFile`.
 
+    Besides the format information, this contains the string
+    ``metadata`` (see `SoundFile.copy_metadata()`), the
+    ``broadcast_info``, ``cue_points`` and ``instrument`` metadata
+    (see `SoundFile.get_broadcast_info()`, `SoundFile.get_cue_points()`
+    and `SoundFile.get_instrument()`).  All of them are obtained from
+    the file header, no audio data is read.
+
     Parameters
     ----------
     verbose : bool
@@ -581,104 +1399,742 @@ def default_subtype(format: str) -> str | None:
     return _default_subtypes.get(format.upper())
 
 
-class SoundFile:
-    """A sound file.
+class IOStats:
+    """I/O counters of a `SoundFile` or of all files.
 
-    For more documentation see the __init__() docstring (which is also
-    used for the online documentation (https://python-soundfile.readthedocs.io/).
+    Counting is disabled by default, see `enable_io_stats()`.
+    Snapshots are returned by `SoundFile.io_stats` and `io_stats()`.
+
+    Attributes
+    ----------
+    read_calls, write_calls : int
+        Number of calls to libsndfile's ``sf_readf_*()`` and
+        ``sf_writef_*()`` functions.
+    frames_read, frames_written : int
+        Number of frames read and written by these calls.
+    bytes_read, bytes_written : int
+        Size of the sample data read and written by these calls
+        (in the requested data type, not in the file format).
+    read_time, write_time : float
+        Time in seconds spent inside these calls.
+    seeks : int
+        Number of calls to ``sf_seek()``, including the ones used by
+        `SoundFile.tell()` and to update the position after I/O.
+    vio_read_calls, vio_write_calls, vio_seek_calls, vio_tell_calls, \
+vio_get_filelen_calls : int
+        Number of calls to the virtual I/O callbacks, which are used
+        for file-like objects.
+    vio_read_bytes, vio_write_bytes : int
+        Number of bytes read from and written to file-like objects.
+    vio_read_time, vio_write_time, vio_seek_time, vio_tell_time, \
+vio_get_filelen_time : float
+        Time in seconds spent inside the virtual I/O callbacks.
 
     """
 
-    def __init__(self, file: FileDescriptorOrPath, mode: str | None = 'r',
-                 samplerate: int | None = None, channels: int | None = None,
-                 subtype: str | None = None, endian: str | None = None,
-                 format: str | None = None, closefd: bool = True,
-                 compression_level: float | None = None,
-                 bitrate_mode: str | None = None) -> None:
-        """Open a sound file.
+    _fields = ('read_calls', 'frames_read', 'bytes_read', 'read_time',
+               'write_calls', 'frames_written', 'bytes_written', 'write_time',
+               'seeks',
+               'vio_read_calls', 'vio_read_bytes', 'vio_read_time',
+               'vio_write_calls', 'vio_write_bytes', 'vio_write_time',
+               'vio_seek_calls', 'vio_seek_time',
+               'vio_tell_calls', 'vio_tell_time',
+               'vio_get_filelen_calls', 'vio_get_filelen_time')
 
-        If a file is opened with `mode` ``'r'`` (the default) or
-        ``'r+'``, no sample rate, channels or file format need to be
-        given because the information is obtained from the file. An
-        exception is the ``'RAW'`` data format, which always requires
-        these data points.
+    def __init__(self):
+        for name in self._fields:
+            setattr(self, name, 0.0 if name.endswith('_time') else 0)
 
-        File formats consist of three case-insensitive strings:
+    def __repr__(self) -> str:
+        counts = ', '.join(f'{name}={getattr(self, name)!r}'
+                           for name in self._fields)
+        return f'IOStats({counts})'
 
-        * a *major format* which is by default obtained from the
-          extension of the file name (if known) and which can be
-          forced with the format argument (e.g. ``format='WAVEX'``).
-        * a *subtype*, e.g. ``'PCM_24'``. Most major formats have a
-          default subtype which is used if no subtype is specified.
-        * an *endian-ness*, which doesn't have to be specified at all in
-          most cases.
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, IOStats):
+            return NotImplemented
+        return self.as_dict() == other.as_dict()
 
-        A `SoundFile` object is a *context manager*, which means
-        if used in a "with" statement, `close()` is automatically
-        called when reaching the end of the code block inside the "with"
-        statement.
+    def as_dict(self) -> dict[str, int | float]:
+        """Return all counters as a dictionary."""
+        return {name: getattr(self, name) for name in self._fields}
 
-        Parameters
-        ----------
-        file : str or int or file-like object
-            The file to open.  This can be a file name, a file
-            descriptor or a Python file object (or a similar object with
-            the methods ``read()``/``readinto()``, ``write()``,
-            ``seek()`` and ``tell()``).
-        mode : {'r', 'r+', 'w', 'w+', 'x', 'x+'}, optional
-            Open mode.  Has to begin with one of these three characters:
-            ``'r'`` for reading, ``'w'`` for writing (truncates *file*)
-            or ``'x'`` for writing (raises an error if *file* already
-            exists).  Additionally, it may contain ``'+'`` to open
-            *file* for both reading and writing.
-            The character ``'b'`` for *binary mode* is implied because
-            all sound files have to be opened in this mode.
-            If *file* is a file descriptor or a file-like object,
-            ``'w'`` doesn't truncate and ``'x'`` doesn't raise an error.
-        samplerate : int
-            The sample rate of the file.  If `mode` contains ``'r'``,
-            this is obtained from the file (except for ``'RAW'`` files).
-        channels : int
-            The number of channels of the file.
-            If `mode` contains ``'r'``, this is obtained from the file
-            (except for ``'RAW'`` files).
-        subtype : str, sometimes optional
-            The subtype of the sound file.  If `mode` contains ``'r'``,
-            this is obtained from the file (except for ``'RAW'``
-            files), if not, the default value depends on the selected
-            `format` (see `default_subtype()`).
-            See `available_subtypes()` for all possible subtypes for
-            a given `format`.
-        endian : {'FILE', 'LITTLE', 'BIG', 'CPU'}, sometimes optional
-            The endian-ness of the sound file.  If `mode` contains
-            ``'r'``, this is obtained from the file (except for
-            ``'RAW'`` files), if not, the default value is ``'FILE'``,
-            which is correct in most cases.
-        format : str, sometimes optional
-            The major format of the sound file.  If `mode` contains
-            ``'r'``, this is obtained from the file (except for
-            ``'RAW'`` files), if not, the default value is determined
-            from the file extension.  See `available_formats()` for
-            all possible values.
-        closefd : bool, optional
-            Whether to close the file descriptor on `close()`. Only
-            applicable if the *file* argument is a file descriptor.
-        compression_level : float, optional
-            The compression level on 'write()'. The compression level
-            should be between 0.0 (minimum compression level) and 1.0
-            (highest compression level).
-            See `libsndfile document <https://github.com/libsndfile/libsndfile/blob/c81375f070f3c6764969a738eacded64f53a076e/docs/command.md>`__.
-        bitrate_mode : {'CONSTANT', 'AVERAGE', 'VARIABLE'}, optional
-            The bitrate mode on 'write()'.
-            See `libsndfile document <https://github.com/libsndfile/libsndfile/blob/c81375f070f3c6764969a738eacded64f53a076e/docs/command.md>`__.
+    def _copy(self):
+        stats = IOStats()
+        for name in self._fields:
+            setattr(stats, name, getattr(self, name))
+        return stats
 
-        Examples
-        --------
-        >>> from soundfile import SoundFile
 
-        Open an existing file for reading:
+_io_stats_enabled = False
+_io_stats_total = IOStats()
+_io_stats_lock = _threading.Lock()
 
-        >>> myfile = SoundFile('existing_file.wav')
+
+def enable_io_stats(enabled: bool = True) -> None:
+    """Enable or disable counting of I/O operations.
+
+    This only affects files which are opened afterwards.
+    When it is disabled (the default), no counting takes place and
+    `SoundFile.io_stats` is ``None``.
+
+    See Also
+    --------
+    io_stats, reset_io_stats, IOStats
+
+    """
+    global _io_stats_enabled
+    _io_stats_enabled = bool(enabled)
+
+
+def io_stats() -> IOStats:
+    """Return a snapshot of the I/O counters of all files.
+
+    Only files opened while counting was enabled with
+    `enable_io_stats()` contribute to the result.
+
+    Examples
+    --------
+    >>> import soundfile as sf
+    >>> sf.enable_io_stats()
+    >>> data, samplerate = sf.read('stereo_file.wav')
+    >>> sf.io_stats().frames_read
+    100
+
+    """
+    with _io_stats_lock:
+        return _io_stats_total._copy()
+
+
+def reset_io_stats() -> None:
+    """Set all counters of `io_stats()` to zero.
+
+    The counters of open `SoundFile` objects are not affected.
+
+    """
+    global _io_stats_total
+    with _io_stats_lock:
+        _io_stats_total = IOStats()
+
+
+def _record_io(stats, **counts):
+    """Add counts to the stats of a file and to the total."""
+    with _io_stats_lock:
+        for target in stats, _io_stats_total:
+            for name, value in counts.items():
+                setattr(target, name, getattr(target, name) + value)
+
+
+_trace_hooks = ()
+
+
+def add_trace_hook(hook: Callable[[str, dict[str, Any]], None]) -> None:
+    """Register a function which is called after file operations.
+
+    The hook is called as ``hook(event, info)`` after each successful
+    operation, where *event* is one of ``'open'``, ``'read'``,
+    ``'write'``, ``'seek'``, ``'truncate'``, ``'flush'`` and
+    ``'close'``.  *info* is a dictionary with the keys ``'name'``,
+    ``'mode'``, ``'format'``, ``'subtype'``, ``'frames'`` (the length
+    of the file), ``'start'`` and ``'end'`` (timestamps as returned by
+    `time.time()`).  Read and write events additionally have
+    ``'count'`` (the number of frames transferred), seek events have
+    ``'position'`` (the new read/write position).
+
+    Hooks are called in the order in which they were added, exceptions
+    raised by a hook are propagated to the caller.  As long as no hook
+    is registered, no events are created.
+
+    See Also
+    --------
+    remove_trace_hook, slow_operation_logger
+
+    """
+    global _trace_hooks
+    if not callable(hook):
+        raise TypeError(f"hook must be callable, not {hook!r}")
+    _trace_hooks += (hook,)
+
+
+def remove_trace_hook(hook: Callable[[str, dict[str, Any]], None]) -> None:
+    """Unregister a function registered with `add_trace_hook()`."""
+    global _trace_hooks
+    hooks = list(_trace_hooks)
+    try:
+        hooks.remove(hook)
+    except ValueError:
+        raise ValueError(f"hook is not registered: {hook!r}") from None
+    _trace_hooks = tuple(hooks)
+
+
+def slow_operation_logger(
+        threshold: float = 0.1,
+        logger: _logging.Logger | None = None,
+) -> Callable[[str, dict[str, Any]], None]:
+    """Return a trace hook which logs slow file operations.
+
+    Parameters
+    ----------
+    threshold : float, optional
+        Operations which take at least this many seconds are logged.
+    logger : logging.Logger, optional
+        Where the warnings are logged, by default the ``'soundfile'``
+        logger is used.
+
+    Examples
+    --------
+    >>> import soundfile as sf
+    >>> sf.add_trace_hook(sf.slow_operation_logger(0.5))
+
+    """
+    if logger is None:
+        logger = _logging.getLogger(__name__)
+
+    def log_slow_operation(event, info):
+        duration = info['end'] - info['start']
+        if duration >= threshold:
+            logger.warning('%s of %r (%s, %s) took %.3f s', event,
+                           info['name'], info['format'], info['subtype'],
+                           duration)
+    return log_slow_operation
+
+
+class BufferPool:
+    """A pool of reusable, aligned arrays for `SoundFile.read()`.
+
+    Reading many small blocks allocates a new array for each call.
+    With a pool, arrays are taken from size-classed free lists instead
+    (sizes are rounded up to the next power of two) and can be given
+    back with `release()` when they are no longer used.  Arrays which
+    are never released are freed as usual, the pool doesn't keep them
+    alive.  Temporary arrays used internally (e.g. for channel mixing)
+    are given back automatically.
+
+    A pool is used for a file if it is assigned to
+    `SoundFile.buffer_pool`, or for all files with `set_buffer_pool()`.
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+        The maximum number of bytes kept in the free lists.  Arrays
+        which are released while the pool is full are left to the
+        garbage collector.
+    alignment : int, optional
+        The alignment of the data of each array in bytes, 64 by default
+        (the size of a cache line, suitable for SIMD instructions).
+
+    Attributes
+    ----------
+    allocations : int
+        The number of arrays which had to be allocated.
+    reuses : int
+        The number of arrays which were taken from the free lists.
+
+    Examples
+    --------
+    >>> import soundfile as sf
+    >>> pool = sf.BufferPool()
+    >>> with sf.SoundFile('stereo_file.wav') as f:
+    ...     f.buffer_pool = pool
+    ...     while True:
+    ...         block = f.read(1024, dtype='float32')
+    ...         if not len(block):
+    ...             break
+    ...         process(block)
+    ...         pool.release(block)
+
+    """
+
+    _min_size = 256
+
+    def __init__(self, max_bytes: int = 64 * 2**20,
+                 alignment: int = 64) -> None:
+        if alignment < 1 or alignment & (alignment - 1):
+            raise ValueError("alignment must be a power of two")
+        self._max_bytes = max_bytes
+        self._alignment = alignment
+        self._free = {}  # size class -> list of (raw array, offset)
+        self._free_bytes = 0
+        # id -> raw array, not keeping arrays alive which are never released:
+        self._in_use = _weakref.WeakValueDictionary()
+        self._lock = _threading.Lock()
+        self.allocations: int = 0
+        self.reuses: int = 0
+
+    max_bytes = property(lambda self: self._max_bytes)
+    """The maximum number of bytes kept in the free lists."""
+    alignment = property(lambda self: self._alignment)
+    """The alignment of the arrays in bytes."""
+
+    def __repr__(self) -> str:
+        return (f"BufferPool(max_bytes={self._max_bytes}, "
+                f"alignment={self._alignment})")
+
+    def empty(self, shape: int | tuple[int, ...],
+              dtype: Any = 'float64') -> numpy.ndarray:
+        """Return an uninitialized C-contiguous array from the pool."""
+        dtype = numpy.dtype(dtype)
+        if isinstance(shape, int):
+            shape = shape,
+        nbytes = dtype.itemsize
+        for length in shape:
+            nbytes *= length
+        size = max(self._min_size, 1 << (nbytes - 1).bit_length())
+        with self._lock:
+            free = self._free.get(size)
+            if free:
+                raw, offset = free.pop()
+                self._free_bytes -= size
+                self._in_use[id(raw)] = raw
+                self.reuses += 1
+            else:
+                raw = None
+                self.allocations += 1
+        if raw is None:
+            raw = numpy.empty(size + self._alignment, numpy.uint8)
+            offset = -raw.__array_interface__['data'][0] % self._alignment
+            with self._lock:
+                self._in_use[id(raw)] = raw
+        return numpy.ndarray(shape, dtype, raw, offset)
+
+    def release(self, array: numpy.ndarray) -> None:
+        """Give an array from `empty()` (or a view of it) back to the pool.
+
+        Neither the array nor any other view of it must be used
+        afterwards.
+
+        """
+        raw = array
+        while isinstance(raw.base, numpy.ndarray):
+            raw = raw.base
+        with self._lock:
+            if self._in_use.get(id(raw)) is not raw:
+                raise ValueError("The array is not in use from this pool")
+            del self._in_use[id(raw)]
+            size = raw.nbytes - self._alignment
+            offset = -raw.__array_interface__['data'][0] % self._alignment
+            if self._free_bytes + size <= self._max_bytes:
+                self._free.setdefault(size, []).append((raw, offset))
+                self._free_bytes += size
+
+    def clear(self) -> None:
+        """Drop all arrays from the free lists."""
+        with self._lock:
+            self._free.clear()
+            self._free_bytes = 0
+
+
+_buffer_pool = None
+
+
+def set_buffer_pool(pool: BufferPool | None) -> None:
+    """Use a `BufferPool` for all files, or stop using it with ``None``.
+
+    A pool assigned to `SoundFile.buffer_pool` takes precedence.
+
+    """
+    global _buffer_pool
+    if pool is not None and not isinstance(pool, BufferPool):
+        raise TypeError(f"Expected a BufferPool, not {pool!r}")
+    _buffer_pool = pool
+
+
+# cdata buffers which are overwritten by libsndfile don't need zeroing:
+_ffi_new_uninitialized = _ffi.new_allocator(should_clear_after_alloc=False)
+
+
+class _SharedLock:
+    """A lock which can be held by many shared or one exclusive owner.
+
+    Shared owners additionally get a token that can be used to find out
+    whether any other owner overlapped with them (see `was_alone()`).
+
+    """
+
+    def __init__(self):
+        self._condition = _threading.Condition(_threading.Lock())
+        self._active = 0
+        self._started = 0
+        self._exclusive = False
+
+    def acquire_shared(self):
+        """Acquire the lock in shared mode and return a token."""
+        with self._condition:
+            while self._exclusive:
+                self._condition.wait()
+            token = self._active, self._started
+            self._active += 1
+            self._started += 1
+        return token
+
+    def release_shared(self):
+        """Release a lock acquired with `acquire_shared()`."""
+        with self._condition:
+            self._active -= 1
+            if not self._active:
+                self._condition.notify_all()
+
+    def was_alone(self, token):
+        """Check if no other shared owner overlapped with *token*.
+
+        This must be called before `release_shared()`.
+
+        """
+        active, started = token
+        with self._condition:
+            return active == 0 and self._started == started + 1
+
+    def acquire_exclusive(self):
+        """Wait until all shared owners are gone and lock them out."""
+        with self._condition:
+            while self._exclusive:
+                self._condition.wait()
+            self._exclusive = True
+            while self._active:
+                self._condition.wait()
+
+    def release_exclusive(self):
+        """Release a lock acquired with `acquire_exclusive()`."""
+        with self._condition:
+            self._exclusive = False
+            self._condition.notify_all()
+
+
+class _Resampler:
+    """Streaming polyphase resampler using a Kaiser-windowed sinc filter.
+
+    Output frame ``n`` corresponds to the input time ``n * down / up``
+    (in input frames), i.e. input and output start at the same time.
+    Input data is given with `push()`, resampled data is taken out with
+    `pull()`.  The resampler keeps as much input history as the filter
+    needs, so the output is the same no matter how the data is split
+    into blocks.
+
+    """
+
+    zero_crossings = 16
+    rolloff = 0.945
+    beta = 8.6
+    chunksize = 1024
+
+    def __init__(self, samplerate_in, samplerate_out, channels):
+        import math
+        import numpy as np
+        if samplerate_out <= 0:
+            raise ValueError("samplerate_out must be positive")
+        gcd = math.gcd(samplerate_in, samplerate_out)
+        self.up = samplerate_out // gcd
+        self.down = samplerate_in // gcd
+        self.samplerate_out = samplerate_out
+        self.channels = channels
+        # Widen the filter when downsampling, to keep the transition band
+        # proportional to the output samplerate:
+        ratio = min(1.0, self.up / self.down)
+        self.half = math.ceil(self.zero_crossings / ratio)
+        cutoff = self.rolloff * ratio
+        # The filter for output phase p and input offset k is evaluated
+        # at t = p / up - k, with k = -half+1 ... half:
+        t = (np.arange(self.up)[:, np.newaxis] / self.up -
+             np.arange(-self.half + 1, self.half + 1))
+        window = np.i0(self.beta * np.sqrt(
+            np.clip(1 - (t / self.half)**2, 0, None))) / np.i0(self.beta)
+        taps = cutoff * np.sinc(cutoff * t) * window
+        taps /= taps.sum(axis=1, keepdims=True)
+        self._taps = taps
+        self.reset(0)
+
+    def frames_out(self, frames_in):
+        """Return the number of output frames for *frames_in*."""
+        return -(-frames_in * self.up // self.down)
+
+    def reset(self, n):
+        """Start over with output frame *n*.
+
+        Returns the index of the first input frame that has to be
+        pushed next.  Input before the first frame is zero-padded.
+
+        """
+        import numpy as np
+        self.n = n
+        self.offset = (n * self.down) // self.up - self.half + 1
+        self.end = None
+        self.position = None
+        self._buffer = np.zeros((max(0, -self.offset), self.channels))
+        return max(0, self.offset)
+
+    def needed(self, frames):
+        """Return the number of input frames needed for *frames*."""
+        if self.end is not None or frames <= 0:
+            return 0
+        last = ((self.n + frames - 1) * self.down) // self.up + self.half
+        return max(0, last + 1 - self.offset - len(self._buffer))
+
+    def push(self, data):
+        """Append two-dimensional input data."""
+        import numpy as np
+        self._buffer = np.concatenate([self._buffer, data])
+
+    def finish(self):
+        """Mark the end of the input data."""
+        import numpy as np
+        self.end = self.offset + len(self._buffer)
+        self.push(np.zeros((self.half, self.channels)))
+
+    def pull(self, out):
+        """Resample as much as possible into the 2D array *out*.
+
+        Returns the number of frames that were written to *out*.
+
+        """
+        import numpy as np
+        from numpy.lib.stride_tricks import sliding_window_view
+        available = self.offset + len(self._buffer) - self.half
+        frames = min(len(out), self.frames_out(available) - self.n)
+        if self.end is not None:
+            frames = min(frames, self.frames_out(self.end) - self.n)
+        frames = max(frames, 0)
+        for start in range(0, frames, self.chunksize):
+            stop = min(start + self.chunksize, frames)
+            position = np.arange(self.n + start, self.n + stop) * self.down
+            index = position // self.up - self.half + 1 - self.offset
+            phase = position % self.up
+            # frames x channels x taps:
+            windows = sliding_window_view(
+                self._buffer, self._taps.shape[1], axis=0)[index]
+            block = np.matmul(windows, self._taps[phase, :, np.newaxis])
+            block = block[..., 0]
+            if out.dtype.kind == 'i':
+                info = np.iinfo(out.dtype)
+                block = np.rint(block).clip(info.min, info.max)
+            out[start:stop] = block
+        self.n += frames
+        first = (self.n * self.down) // self.up - self.half + 1
+        if first > self.offset:
+            self._buffer = self._buffer[first - self.offset:]
+            self.offset = first
+        return frames
+
+
+class _HandlePool:
+    """Pool of handles used by `SoundFile.read_at()`.
+
+    If *shared* is true, the pool initially contains ``None``, which
+    stands for the handle of the `SoundFile` itself.  Otherwise, it
+    starts empty.  Additional handles are opened on demand, up to
+    `max_count`.
+
+    """
+
+    def __init__(self, shared=True):
+        self._condition = _threading.Condition(_threading.Lock())
+        self._idle = [None] if shared else []
+        self._count = len(self._idle)
+        self._closed = False
+        self.shared = shared
+        self.max_count = 1
+
+    def acquire(self, opener):
+        """Return an idle handle, waiting for one if necessary.
+
+        If there is no idle handle but `max_count` is not reached yet,
+        a new handle is created by calling *opener*.
+
+        """
+        with self._condition:
+            while not self._idle:
+                if self._count < self.max_count:
+                    self._count += 1
+                    break
+                self._condition.wait()
+            else:
+                return self._idle.pop()
+        try:
+            return opener()
+        except BaseException:
+            with self._condition:
+                self._count -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, handle):
+        """Return a handle obtained with `acquire()` to the pool."""
+        with self._condition:
+            if not self._closed:
+                self._idle.append(handle)
+                self._condition.notify()
+                return
+            self._count -= 1
+        if handle is not None:
+            handle.close()
+
+    def close(self):
+        """Close all additional handles (now or when they are released)."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._count -= len(idle)
+        for handle in idle:
+            if handle is not None:
+                handle.close()
+
+
+class SoundFile:
+    """A sound file.
+
+    For more documentation see the __init__() docstring (which is also
+    used for the online documentation (https://python-soundfile.readthedocs.io/).
+
+    """
+
+    def __init__(self, file: FileDescriptorOrPath, mode: str | None = 'r',
+                 samplerate: int | None = None, channels: int | None = None,
+                 subtype: str | None = None, endian: str | None = None,
+                 format: str | None = None, closefd: bool = True,
+                 compression_level: float | None = None,
+                 bitrate_mode: str | None = None, normalize: bool = True,
+                 clipping: bool = True, scale_float_int_read: bool = False,
+                 scale_int_float_write: bool = False,
+                 update_header: bool | float = False,
+                 add_peak_chunk: bool = True,
+                 vbr_quality: float | None = None,
+                 ogg_page_latency: float | None = None) -> None:
+        """Open a sound file.
+
+        If a file is opened with `mode` ``'r'`` (the default) or
+        ``'r+'``, no sample rate, channels or file format need to be
+        given because the information is obtained from the file. An
+        exception is the ``'RAW'`` data format, which always requires
+        these data points.
+
+        File formats consist of three case-insensitive strings:
+
+        * a *major format* which is by default obtained from the
+          extension of the file name (if known) and which can be
+          forced with the format argument (e.g. ``format='WAVEX'``).
+        * a *subtype*, e.g. ``'PCM_24'``. Most major formats have a
+          default subtype which is used if no subtype is specified.
+        * an *endian-ness*, which doesn't have to be specified at all in
+          most cases.
+
+        A `SoundFile` object is a *context manager*, which means
+        if used in a "with" statement, `close()` is automatically
+        called when reaching the end of the code block inside the "with"
+        statement.
+
+        Parameters
+        ----------
+        file : str or int or file-like object
+            The file to open.  This can be a file name, a file
+            descriptor or a Python file object (or a similar object with
+            the methods ``read()``/``readinto()``, ``write()``,
+            ``seek()`` and ``tell()``).
+        mode : {'r', 'r+', 'w', 'w+', 'x', 'x+'}, optional
+            Open mode.  Has to begin with one of these three characters:
+            ``'r'`` for reading, ``'w'`` for writing (truncates *file*)
+            or ``'x'`` for writing (raises an error if *file* already
+            exists).  Additionally, it may contain ``'+'`` to open
+            *file* for both reading and writing.
+            The character ``'b'`` for *binary mode* is implied because
+            all sound files have to be opened in this mode.
+            If *file* is a file descriptor or a file-like object,
+            ``'w'`` doesn't truncate and ``'x'`` doesn't raise an error.
+        samplerate : int
+            The sample rate of the file.  If `mode` contains ``'r'``,
+            this is obtained from the file (except for ``'RAW'`` files).
+        channels : int
+            The number of channels of the file.
+            If `mode` contains ``'r'``, this is obtained from the file
+            (except for ``'RAW'`` files).
+        subtype : str, sometimes optional
+            The subtype of the sound file.  If `mode` contains ``'r'``,
+            this is obtained from the file (except for ``'RAW'``
+            files), if not, the default value depends on the selected
+            `format` (see `default_subtype()`).
+            See `available_subtypes()` for all possible subtypes for
+            a given `format`.
+        endian : {'FILE', 'LITTLE', 'BIG', 'CPU'}, sometimes optional
+            The endian-ness of the sound file.  If `mode` contains
+            ``'r'``, this is obtained from the file (except for
+            ``'RAW'`` files), if not, the default value is ``'FILE'``,
+            which is correct in most cases.
+        format : str, sometimes optional
+            The major format of the sound file.  If `mode` contains
+            ``'r'``, this is obtained from the file (except for
+            ``'RAW'`` files), if not, the default value is determined
+            from the file extension.  See `available_formats()` for
+            all possible values.
+        closefd : bool, optional
+            Whether to close the file descriptor on `close()`. Only
+            applicable if the *file* argument is a file descriptor.
+        compression_level : float, optional
+            The compression level on 'write()'. The compression level
+            should be between 0.0 (minimum compression level) and 1.0
+            (highest compression level).
+            See `libsndfile document <https://github.com/libsndfile/libsndfile/blob/c81375f070f3c6764969a738eacded64f53a076e/docs/command.md>`__.
+        bitrate_mode : {'CONSTANT', 'AVERAGE', 'VARIABLE'}, optional
+            The bitrate mode on 'write()'.
+            See `libsndfile document <https://github.com/libsndfile/libsndfile/blob/c81375f070f3c6764969a738eacded64f53a076e/docs/command.md>`__.
+        vbr_quality : float, optional
+            The variable bitrate encoding quality on 'write()', between
+            0.0 (lowest quality) and 1.0 (highest quality).  This is an
+            alternative to *compression_level* for lossy formats like
+            ``'VORBIS'`` and ``'OPUS'``, only one of them can be given.
+        ogg_page_latency : float, optional
+            The maximum duration of audio in milliseconds that is
+            buffered before an Ogg page is written.  Small values
+            make the encoder emit data more often, which is useful
+            when streaming, at the cost of some overhead.  libsndfile
+            limits this to a supported range and currently only
+            applies it to ``'OPUS'`` files.
+        normalize : bool, optional
+            Whether integer data is normalised to the range [-1.0, 1.0)
+            when it is read as ``'float32'``/``'float64'`` or written
+            from floating point data (which is the default).  With
+            ``normalize=False``, floating point data holds the integer
+            values, e.g. ``32767.0`` for the largest ``'PCM_16'`` value.
+        clipping : bool, optional
+            Whether floating point data is clipped when it is converted
+            to integers, e.g. when writing ``1.1`` to a ``'PCM_16'``
+            file (which is the default).  Without clipping, values
+            outside of the integer range wrap around.
+        scale_float_int_read : bool, optional
+            Scale floating point files when reading them as
+            ``'int16'``/``'int32'`` so that the peak of the file is
+            mapped to the largest integer value.  This requires a pass
+            over the whole file when the file is opened.
+            By default, the values are not scaled (see `read()`).
+        scale_int_float_write : bool, optional
+            Scale ``'int16'``/``'int32'`` data to the range [-1.0, 1.0)
+            when writing it to a floating point file.
+            By default, the values are not scaled (see `write()`).
+
+            These conversions happen inside libsndfile's sample
+            conversion, i.e. they don't need an additional pass over
+            the data.
+        update_header : bool or float, optional
+            When the file header (which contains e.g. the number of
+            frames) is updated while writing.  By default, it is only
+            written when the file is closed, which is the fastest
+            option, but the header of a file that is never closed
+            (e.g. after a crash) is not valid.  With ``True``, the
+            header is updated after every write, which costs additional
+            seeks and writes for each block.  If a number is given, the
+            header is updated after a write if at least this many
+            seconds have passed since the last update.
+        add_peak_chunk : bool, optional
+            Whether libsndfile maintains a PEAK chunk (which stores the
+            peak value of each channel) in floating point WAV and AIFF
+            files (which is the default).  With
+            ``add_peak_chunk=False``, the peak values are not tracked
+            on each write.  See also `signal_max()`.
+
+        Examples
+        --------
+        >>> from soundfile import SoundFile
+
+        Open an existing file for reading:
+
+        >>> myfile = SoundFile('existing_file.wav')
         >>> # do something with myfile
         >>> myfile.close()
 
@@ -704,21 +2160,53 @@ class SoundFile:
         self._mode = mode
         self._compression_level = compression_level
         self._bitrate_mode = bitrate_mode
+        self._vbr_quality = vbr_quality
+        self._ogg_page_latency = ogg_page_latency
+        self._normalize = normalize
+        self._clipping = clipping
+        self._scale_float_int_read = scale_float_int_read
+        self._scale_int_float_write = scale_int_float_write
+        self._update_header = _check_update_header(update_header)
+        self._add_peak_chunk = add_peak_chunk
+        self._read_handles = _HandlePool(
+            shared=not isinstance(file, (str, bytes))
+            or mode.replace('b', '') != 'r')
+        self._io_stats = IOStats() if _io_stats_enabled else None
         self._info = _create_info_struct(file, mode, samplerate, channels,
                                          format, subtype, endian)
+        if compression_level is not None and vbr_quality is not None:
+            raise ValueError(
+                "Only one of compression_level and vbr_quality can be given")
+        if vbr_quality is not None:
+            _check_vbr_quality(vbr_quality)
+        if ogg_page_latency is not None:
+            _check_ogg_page_latency(ogg_page_latency, mode, self._info)
         self._file = self._open(file, mode_int, closefd)
         if set(mode).issuperset('r+') and self.seekable():
             # Move write position to 0 (like in Python file objects)
             self.seek(0)
-        _snd.sf_command(self._file, _snd.SFC_SET_CLIPPING, _ffi.NULL,
-                        _snd.SF_TRUE)
+        self._set_conversion_options()
+        if mode_int != _snd.SFM_READ:
+            if not add_peak_chunk:
+                _snd.sf_command(self._file, _snd.SFC_SET_ADD_PEAK_CHUNK,
+                                _ffi.NULL, _snd.SF_FALSE)
+            if update_header is True:
+                _snd.sf_command(self._file, _snd.SFC_SET_UPDATE_HEADER_AUTO,
+                                _ffi.NULL, _snd.SF_TRUE)
+            self._header_updated = _time.monotonic()
 
         # set compression setting
         if self._compression_level is not None:
             # needs to be called before set_bitrate_mode
             self._set_compression_level(self._compression_level)
+        if self._vbr_quality is not None:
+            self._set_vbr_quality(self._vbr_quality)
+        if (self._compression_level is not None or
+                self._vbr_quality is not None):
             if self._bitrate_mode is not None:
                 self._set_bitrate_mode(self._bitrate_mode)
+        if self._ogg_page_latency is not None:
+            self._set_ogg_page_latency(self._ogg_page_latency)
 
     name = property(lambda self: self._name)
     """The file name of the sound file."""
@@ -757,6 +2245,22 @@ class SoundFile:
     """The compression level on 'write()'"""
     bitrate_mode = property(lambda self: self._bitrate_mode)
     """The bitrate mode on 'write()'"""
+    vbr_quality = property(lambda self: self._vbr_quality)
+    """The variable bitrate encoding quality on 'write()'"""
+    ogg_page_latency = property(lambda self: self._ogg_page_latency)
+    """The requested maximum Ogg page latency in milliseconds."""
+    normalize = property(lambda self: self._normalize)
+    """Whether integer data is normalised to [-1.0, 1.0) as float."""
+    clipping = property(lambda self: self._clipping)
+    """Whether float data is clipped when converted to integers."""
+    scale_float_int_read = property(lambda self: self._scale_float_int_read)
+    """Whether float files are scaled when read as integers."""
+    scale_int_float_write = property(lambda self: self._scale_int_float_write)
+    """Whether integer data is scaled when written to float files."""
+    update_header = property(lambda self: self._update_header)
+    """When the header is updated while writing."""
+    add_peak_chunk = property(lambda self: self._add_peak_chunk)
+    """Whether a PEAK chunk is maintained in float files."""
 
     @property
     def extra_info(self):
@@ -766,14 +2270,75 @@ class SoundFile:
                         info, _ffi.sizeof(info))
         return _ffi.string(info).decode('utf-8', 'replace')
 
+    @property
+    def embed_info(self) -> tuple[int, int]:
+        """Byte offset and length of the sound file in its container.
+
+        This is non-zero for files opened from a file descriptor which
+        was not at the beginning of the file and for `EmbeddedSource`
+        objects.
+
+        """
+        self._check_if_closed()
+        info = _ffi.new("SF_EMBED_FILE_INFO*")
+        _snd.sf_command(self._file, _snd.SFC_GET_EMBED_FILE_INFO,
+                        info, _ffi.sizeof(info[0]))
+        if isinstance(self.name, EmbeddedSource):
+            return self.name.offset + info.offset, self.name.length
+        return info.offset, info.length
+
+    @property
+    def io_stats(self) -> IOStats | None:
+        """A snapshot of the I/O counters of this file.
+
+        This is ``None`` unless the file was opened after calling
+        `enable_io_stats()`.
+
+        """
+        if self._io_stats is None:
+            return None
+        with _io_stats_lock:
+            return self._io_stats._copy()
+
+    @property
+    def buffer_pool(self) -> BufferPool | None:
+        """The `BufferPool` used for arrays returned by `read()`.
+
+        By default, this is the pool given to `set_buffer_pool()` (or
+        ``None``).  Arrays from a pool can be given back with
+        `BufferPool.release()`.
+
+        """
+        if self._buffer_pool is None:
+            return _buffer_pool
+        return self._buffer_pool
+
+    @buffer_pool.setter
+    def buffer_pool(self, pool: BufferPool | None) -> None:
+        if pool is not None and not isinstance(pool, BufferPool):
+            raise TypeError(f"Expected a BufferPool, not {pool!r}")
+        self._buffer_pool = pool
+
     # avoid confusion if something goes wrong before assigning self._file:
     _file = None
+    _read_handles = None
+    _io_stats = None
+    _resampler = None
+    _virtual_io = None
+    _file_refreshed = None
+    _fd = None  # a duplicate of the file descriptor after refresh()
+    _buffer_pool = None
 
     def __repr__(self) -> str:
         compression_setting = (f", compression_level={self.compression_level}"
                                if self.compression_level is not None else "")
         compression_setting += (f", bitrate_mode='{self.bitrate_mode}'"
                                 if self.bitrate_mode is not None else "")
+        compression_setting += (f", vbr_quality={self.vbr_quality}"
+                                if self.vbr_quality is not None else "")
+        compression_setting += (
+            f", ogg_page_latency={self.ogg_page_latency}"
+            if self.ogg_page_latency is not None else "")
         return (f"SoundFile({self.name!r}, mode={self.mode!r}, "
                 f"samplerate={self.samplerate}, channels={self.channels}, "
                 f"format={self.format!r}, subtype={self.subtype!r}, "
@@ -863,19 +2428,23 @@ class SoundFile:
         44100  # this is the file length
 
         """
-        self._check_if_closed()
-        position = _snd.sf_seek(self._file, frames, whence)
-        _error_check(self._errorcode)
+        start = _time.time() if _trace_hooks else None
+        position = self._seek(frames, whence)
+        if start is not None:
+            self._call_trace_hooks('seek', start, position=position)
         return position
 
     def tell(self) -> int:
         """Return the current read/write position."""
-        return self.seek(0, SEEK_CUR)
+        return self._seek(0, SEEK_CUR)
 
 
     def read(self, frames: int = -1, dtype: dtype_str = 'float64',
             always_2d: bool = False, fill_value: float | None = None,
-            out: AudioData | AudioData_2d | None = None) -> AudioData | AudioData_2d:
+            out: AudioData | AudioData_2d | None = None,
+            samplerate_out: int | None = None,
+            mix: MixMatrix | None = None,
+            stats: SignalStats | None = None) -> AudioData | AudioData_2d:
         """Read from the file and return data as NumPy array.
 
         Reads the given number of frames in the given data format
@@ -889,7 +2458,9 @@ class SoundFile:
         ----------
         frames : int, optional
             The number of frames to read. If ``frames < 0``, the whole
-            rest of the file is read.
+            rest of the file is read.  Non-seekable files (e.g. pipes)
+            are read in blocks until the end of the stream, regardless
+            of the length given in their header.
         dtype : {'float64', 'float32', 'int32', 'int16'}, optional
             Data type of the returned array, by default ``'float64'``.
             Floating point audio data is typically in the range from
@@ -935,6 +2506,30 @@ class SoundFile:
             arguments *dtype* and *always_2d* are silently ignored! If
             *frames* is not given, it is obtained from the length of
             *out*.
+        samplerate_out : int, optional
+            If given, the audio data is resampled to this sample rate
+            while reading, using a windowed-sinc filter.  *frames* is
+            then given in frames at the new sample rate.  The filter
+            state is kept between consecutive calls, so that reading a
+            file piece by piece gives the same result as reading it at
+            once.  Only the current block is held in memory at the
+            original sample rate.
+
+            Note that the read/write position (see `tell()`) is still
+            given in frames of the file, and it runs ahead of the
+            returned data by the length of the filter.
+        mix : {'mono'} or array_like, optional
+            Mix the channels of the file while reading.  ``'mono'``
+            averages all channels, alternatively a gain matrix of shape
+            (output channels x file channels) can be given.  The
+            channels are mixed block by block, so the data is never
+            held in memory with all channels of the file.  *out* must
+            have the number of output channels.
+        stats : SignalStats, optional
+            If given, it is updated with the returned data (without
+            frames filled with *fill_value*).  The data is read in
+            blocks, and each block is added to *stats* while it is
+            still in the CPU cache.
 
         Examples
         --------
@@ -954,6 +2549,19 @@ class SoundFile:
         buffer_read, .write
 
         """
+        if frames < 0 and out is None and not self.seekable():
+            return self._read_until_end(dtype, always_2d, samplerate_out,
+                                        mix, stats)
+        if stats is not None:
+            return self._read_with_stats(frames, dtype, always_2d,
+                                         fill_value, out, samplerate_out,
+                                         mix, stats)
+        if mix is not None:
+            return self._read_mixed(frames, dtype, always_2d, fill_value,
+                                    out, samplerate_out, mix)
+        if samplerate_out is not None and samplerate_out != self.samplerate:
+            return self._read_resampled(frames, dtype, always_2d, fill_value,
+                                        out, samplerate_out)
         if out is None:
             frames = self._check_frames(frames, fill_value)
             out = self._create_empty_array(frames, always_2d, dtype)
@@ -999,7 +2607,7 @@ class SoundFile:
         """
         frames = self._check_frames(frames, fill_value=None)
         ctype = self._check_dtype(dtype)
-        cdata = _ffi.new(ctype + '[]', frames * self.channels)
+        cdata = _ffi_new_uninitialized(ctype + '[]', frames * self.channels)
         read_frames = self._cdata_io('read', cdata, ctype, frames)
         assert read_frames == frames
         return _ffi.buffer(cdata)
@@ -1037,26 +2645,176 @@ class SoundFile:
         frames = self._cdata_io('read', cdata, ctype, frames)
         return frames
 
-    def write(self, data: AudioData) -> None:
-        """Write audio data from a NumPy array to the file.
+    def read_at(self, start: int, frames: int = -1,
+                dtype: dtype_str = 'float64', always_2d: bool = False,
+                fill_value: float | None = None,
+                out: AudioData | AudioData_2d | None = None) -> AudioData | AudioData_2d:
+        """Read from a given position without changing the read position.
 
-        Writes a number of frames at the read/write position to the
-        file. This also advances the read/write position by the same
-        number of frames and enlarges the file if necessary.
+        This works like `seek()` followed by `read()`, but the current
+        read/write position is restored afterwards.  Concurrent calls
+        from multiple threads are safe, they are serialised unless more
+        read handles are allowed with `set_read_handles()`.
 
-        Note that writing int values to a float file will *not* scale
-        the values to [-1.0, 1.0). If you write the value
-        ``np.array([42], dtype='int32')``, to a ``subtype='FLOAT'``
-        file, the file will then contain ``np.array([42.],
-        dtype='float32')``.
+        For files opened by name in mode ``'r'``, `read_at()` reads
+        from a separate libsndfile handle (opened on first use), so it
+        can be called while another thread uses `read()`, `seek()` etc.
+
+        .. note:: For all other files, `read_at()` temporarily moves
+            the read/write position of this `SoundFile` and is not
+            thread-safe with respect to other methods.  Don't call
+            `read()`, `tell()`, `seek()` etc. concurrently from other
+            threads.
 
         Parameters
         ----------
-        data : array_like
-            The data to write. Usually two-dimensional (frames x
-            channels), but one-dimensional *data* can be used for mono
-            files. Only the data types ``'float64'``, ``'float32'``,
+        start : int
+            Where to start reading.  A negative value counts from the
+            end.
+        frames : int, optional
+            The number of frames to read. If ``frames < 0``, the whole
+            rest of the file is read.
+
+        Returns
+        -------
+        audiodata : `numpy.ndarray` or type(out)
+            See `read()`.
+
+        Other Parameters
+        ----------------
+        dtype, always_2d, fill_value, out
+            See `read()`.
+
+        Examples
+        --------
+        >>> from soundfile import SoundFile
+        >>> myfile = SoundFile('stereo_file.wav')
+
+        Reading 3 frames starting at frame 100:
+
+        >>> myfile.read_at(100, 3)
+        array([[ 0.71329652,  0.06294799],
+               [-0.26450912, -0.38874483],
+               [ 0.67398441, -0.11516333]])
+        >>> myfile.tell()
+        0
+
+        See Also
+        --------
+        buffer_read_at, .read, set_read_handles
+
+        """
+        with self._read_handle(start, frames) as (f, frames):
+            return f.read(frames, dtype, always_2d, fill_value, out)
+
+    def buffer_read_at(self, start: int, frames: int = -1,
+                       dtype: dtype_str | None = None) -> memoryview:
+        """Read from a given position and return data as buffer object.
+
+        This works like `buffer_read()`, but the current read/write
+        position is not changed.  See `read_at()` for details.
+
+        Parameters
+        ----------
+        start : int
+            Where to start reading.  A negative value counts from the
+            end.
+        frames : int, optional
+            The number of frames to read. If ``frames < 0``, the whole
+            rest of the file is read.
+        dtype : {'float64', 'float32', 'int32', 'int16'}
+            Audio data will be converted to the given data type.
+
+        Returns
+        -------
+        buffer
+            A buffer containing the read data.
+
+        See Also
+        --------
+        read_at, buffer_read
+
+        """
+        with self._read_handle(start, frames) as (f, frames):
+            return f.buffer_read(frames, dtype)
+
+    def set_read_handles(self, count: int) -> None:
+        """Set the number of libsndfile handles used by `read_at()`.
+
+        By default, `read_at()` and `buffer_read_at()` use a single
+        separate read-only handle of the same file and concurrent calls
+        have to wait for each other.  With ``count > 1``, up to
+        ``count`` such handles are opened on demand, which allows
+        concurrent positional reads (e.g. from a thread pool) to decode
+        in parallel.
+
+        This is only supported for files that were opened by name in
+        read-only mode.
+
+        Parameters
+        ----------
+        count : int
+            The maximum number of libsndfile handles used by
+            `read_at()`.
+
+        Examples
+        --------
+        >>> from concurrent.futures import ThreadPoolExecutor
+        >>> from soundfile import SoundFile
+        >>> with SoundFile('long_file.wav') as f:
+        >>>     f.set_read_handles(4)
+        >>>     with ThreadPoolExecutor(4) as executor:
+        >>>         blocks = list(executor.map(
+        >>>             lambda start: f.read_at(start, 4096),
+        >>>             range(0, f.frames, 4096)))
+
+        """
+        self._check_if_closed()
+        if count < 1:
+            raise ValueError("count must be at least 1")
+        if count > 1:
+            if not isinstance(self.name, (str, bytes)):
+                raise ValueError(
+                    "Multiple read handles are only supported for files "
+                    "opened by name")
+            if self.mode.replace('b', '') != 'r':
+                raise ValueError(
+                    "Multiple read handles are only supported in mode 'r'")
+        self._read_handles.max_count = count
+
+    def _open_read_handle(self):
+        """Open another read-only handle of this file for read_at()."""
+        options = dict(normalize=self._normalize, clipping=self._clipping,
+                       scale_float_int_read=self._scale_float_int_read)
+        if self.format == 'RAW':
+            return SoundFile(self.name, 'r', self.samplerate, self.channels,
+                             self.subtype, self.endian, self.format,
+                             **options)
+        return SoundFile(self.name, 'r', **options)
+
+    def write(self, data: AudioData, channels_first: bool = False) -> None:
+        """Write audio data from a NumPy array to the file.
+
+        Writes a number of frames at the read/write position to the
+        file. This also advances the read/write position by the same
+        number of frames and enlarges the file if necessary.
+
+        Note that writing int values to a float file will *not* scale
+        the values to [-1.0, 1.0). If you write the value
+        ``np.array([42], dtype='int32')``, to a ``subtype='FLOAT'``
+        file, the file will then contain ``np.array([42.],
+        dtype='float32')``.
+
+        Parameters
+        ----------
+        data : array_like
+            The data to write. Usually two-dimensional (frames x
+            channels), but one-dimensional *data* can be used for mono
+            files. Only the data types ``'float64'``, ``'float32'``,
             ``'int32'`` and ``'int16'`` are supported.
+            Arrays which are not C-contiguous (e.g. ``x[:, ::2]``,
+            ``x.T`` or Fortran order) are interleaved block by block,
+            without copying all data at once.
 
             .. note:: The data type of *data* does **not** select the
                   data type of the written file. Audio data will be
@@ -1067,6 +2825,12 @@ class SoundFile:
                   file will then contain ``np.array([42.],
                   dtype='float32')``.
 
+        channels_first : bool, optional
+            If ``True``, *data* is given as (channels x frames), either
+            as a two-dimensional array or as a list of one-dimensional
+            arrays (one per channel).  It is interleaved block by block
+            as well.
+
         Examples
         --------
         >>> import numpy as np
@@ -1085,11 +2849,122 @@ class SoundFile:
         """
         import numpy as np
 
-        # no copy is made if data has already the correct memory layout:
-        data = np.ascontiguousarray(data)
-        written = self._array_io('write', data, len(data))
-        assert written == len(data)
+        if channels_first:
+            data = _channel_arrays(data)
+            frames, dtype = self._check_channel_arrays(data)
+
+            def fill(block, start):
+                for i, channel in enumerate(data):
+                    block[:, i] = channel[start:start + len(block)]
+
+            written = self._write_interleaved(frames, dtype, fill)
+        else:
+            data = np.asarray(data)
+            self._check_array(data)
+            if data.flags.c_contiguous:
+                written = self._array_io('write', data, len(data))
+            else:
+                # e.g. a channel slice, a transposed or a Fortran array
+                data_2d = data if data.ndim == 2 else data[:, np.newaxis]
+
+                def fill(block, start):
+                    block[:] = data_2d[start:start + len(block)]
+
+                written = self._write_interleaved(len(data), data.dtype,
+                                                  fill)
+            assert written == len(data)
         self._update_frames(written)
+        self._update_header_if_due()
+
+    def _write_coalesced(self, blocks, min_blocksize, channels_first):
+        """Write blocks, combining the ones shorter than min_blocksize.
+
+        Return the number of frames written.
+
+        """
+        import numpy as np
+
+        pending = None  # buffer for short blocks
+        count = 0  # number of frames in pending
+        written = 0
+
+        def flush():
+            nonlocal count, written
+            if count:
+                self.write(pending[:count])
+                written += count
+                count = 0
+
+        try:
+            for block in blocks:
+                if channels_first:
+                    block = _channel_arrays(block)
+                    frames, dtype = self._check_channel_arrays(block)
+                else:
+                    block = np.asarray(block)
+                    self._check_array(block)
+                    frames, dtype = len(block), block.dtype
+                if frames >= min_blocksize:
+                    flush()
+                    self.write(block, channels_first)
+                    written += frames
+                    continue
+                if pending is not None and pending.dtype != dtype:
+                    flush()
+                    self._release_array(pending)
+                    pending = None
+                elif count + frames > min_blocksize:
+                    flush()
+                if pending is None:
+                    pending = self._create_empty_array(min_blocksize, True,
+                                                       dtype)
+                target = pending[count:count + frames]
+                if channels_first:
+                    for i, channel in enumerate(block):
+                        target[:, i] = channel
+                else:
+                    target[:] = (block if block.ndim == 2
+                                 else block[:, np.newaxis])
+                count += frames
+            flush()
+        finally:
+            if pending is not None:
+                self._release_array(pending)
+        return written
+
+    def _check_channel_arrays(self, channels):
+        """Check arrays from _channel_arrays(), return frames and dtype."""
+        import numpy as np
+        if len(channels) != self.channels:
+            raise ValueError(f"Invalid shape: Expected {self.channels} "
+                             f"channels, got {len(channels)}")
+        frames = len(channels[0])
+        if any(len(channel) != frames for channel in channels):
+            raise ValueError("All channels must have the same length")
+        dtype = np.result_type(*channels)
+        self._check_dtype(dtype.name)
+        return frames, dtype
+
+    def _write_interleaved(self, frames, dtype, fill):
+        """Write frames block-wise, fill(block, start) interleaves them.
+
+        Only a small scratch buffer is used instead of a C-contiguous
+        copy of all data.
+
+        """
+        blocksize = min(frames, 16384)
+        scratch = self._create_empty_array(blocksize, True, dtype)
+        written = 0
+        try:
+            while written < frames:
+                block = scratch[:min(blocksize, frames - written)]
+                fill(block, written)
+                count = self._array_io('write', block, len(block))
+                assert count == len(block)
+                written += count
+        finally:
+            self._release_array(scratch)
+        return written
 
     def buffer_write(self, data: bytes, dtype: dtype_str) -> None:
         """Write audio data from a buffer/bytes object to the file.
@@ -1117,17 +2992,30 @@ class SoundFile:
         written = self._cdata_io('write', cdata, ctype, frames)
         assert written == frames
         self._update_frames(written)
+        self._update_header_if_due()
 
     def blocks(self, blocksize: int | None = None, overlap: int = 0,
                frames: int = -1, dtype: dtype_str = 'float64',
                always_2d: bool = False, fill_value: float | None = None,
-               out: AudioData | AudioData_2d | None = None) -> Generator[AudioData, None, None] | Generator[AudioData_2d, None, None]:
+               out: AudioData | AudioData_2d | None = None,
+               samplerate_out: int | None = None,
+               mix: MixMatrix | None = None,
+               stats: SignalStats | None = None, follow: bool = False,
+               poll_interval: float = 0.1,
+               idle_timeout: float | None = None) -> Generator[AudioData, None, None] | Generator[AudioData_2d, None, None]:
         """Return a generator for block-wise reading.
 
         By default, the generator yields blocks of the given
         *blocksize* (using a given *overlap*) until the end of the file
         is reached; *frames* can be used to stop earlier.
 
+        With *follow*, the file may still be growing (like
+        ``tail -f``): at the end of the file, `refresh()` is called
+        every *poll_interval* seconds and blocks are yielded as soon as
+        enough new frames have appeared.  Iteration stops when no new
+        frames appeared for *idle_timeout* seconds (or never, if it is
+        ``None``), then the last incomplete block is yielded.
+
         Parameters
         ----------
         blocksize : int
@@ -1138,6 +3026,7 @@ class SoundFile:
         frames : int, optional
             The number of frames to read.
             If ``frames < 0``, the file is read until the end.
+            Non-seekable files are read until the end of the stream.
         dtype : {'float64', 'float32', 'int32', 'int16'}, optional
             See `read()`.
 
@@ -1161,6 +3050,24 @@ class SoundFile:
             If *out* is specified, the data is written into the given
             array instead of creating a new array. In this case, the
             arguments *dtype* and *always_2d* are silently ignored!
+        samplerate_out : int, optional
+            Resample while reading, see `read()`.  *blocksize*,
+            *overlap* and *frames* are given in frames at the new
+            sample rate.
+        mix : {'mono'} or array_like, optional
+            Mix the channels while reading, see `read()`.
+        stats : SignalStats, optional
+            Updated with each block as it is read, see `read()`.
+            Overlapping frames are only counted once.
+        follow : bool, optional
+            Wait for new frames at the end of the file, see above.
+            This is only possible in read-only mode, for seekable
+            files and without *samplerate_out*.
+        poll_interval : float, optional
+            How often to check for new frames in *follow* mode, in
+            seconds.
+        idle_timeout : float, optional
+            Stop following after this many seconds without new frames.
 
         Examples
         --------
@@ -1169,18 +3076,39 @@ class SoundFile:
         >>>     for block in f.blocks(blocksize=1024):
         >>>         pass  # do something with 'block'
 
+        Process a recording while it is being written, until nothing
+        was added for 10 seconds:
+
+        >>> with SoundFile('recording.wav') as f:
+        >>>     for block in f.blocks(1024, follow=True, idle_timeout=10):
+        >>>         pass  # do something with 'block'
+
         """
         import numpy as np
 
         if 'r' not in self.mode and '+' not in self.mode:
             raise SoundFileRuntimeError("blocks() is not allowed in write-only mode")
 
-        frames = self._check_frames(frames, fill_value)
+        # growing and non-seekable files are read until their current end
+        until_end = follow or (frames < 0 and not self.seekable())
+        if follow:
+            if samplerate_out is not None:
+                raise ValueError("samplerate_out can't be used with follow")
+            if not self.seekable():
+                raise ValueError("follow is only allowed for seekable files")
+        elif not until_end:
+            frames = self._check_frames(frames, fill_value, samplerate_out)
         if out is None:
             if blocksize is None:
                 raise TypeError("One of {blocksize, out} must be specified")
-            out_size = blocksize if fill_value is not None else min(blocksize, frames)
-            out = self._create_empty_array(out_size, always_2d, dtype)
+            if until_end:
+                out_size = blocksize
+            else:
+                out_size = (blocksize if fill_value is not None
+                            else min(blocksize, frames))
+            channels = None if mix is None else len(self._mix_matrix(mix))
+            out = self._create_empty_array(out_size, always_2d, dtype,
+                                           channels)
             copy_out = True
         else:
             if blocksize is not None:
@@ -1189,29 +3117,168 @@ class SoundFile:
             blocksize = len(out)
             copy_out = False
 
-        overlap_memory = None
-        while frames > 0:
-            if overlap_memory is None:
-                output_offset = 0
-            else:
-                output_offset = len(overlap_memory)
-                out[:output_offset] = overlap_memory
+        try:
+            if until_end:
+                yield from self._blocks_until_end(
+                    out, copy_out, overlap, frames, dtype, always_2d,
+                    fill_value, samplerate_out, mix, stats, follow,
+                    poll_interval, idle_timeout)
+                return
+
+            overlap_memory = None
+            while frames > 0:
+                if overlap_memory is None:
+                    output_offset = 0
+                else:
+                    output_offset = len(overlap_memory)
+                    out[:output_offset] = overlap_memory
 
-            toread = min(blocksize - output_offset, frames)
-            self.read(toread, dtype, always_2d, fill_value, out[output_offset:])
+                toread = min(blocksize - output_offset, frames)
+                self.read(toread, dtype, always_2d, fill_value,
+                          out[output_offset:], samplerate_out, mix, stats)
 
-            if overlap:
-                if overlap_memory is None:
-                    overlap_memory = np.copy(out[-overlap:])
+                if overlap:
+                    if overlap_memory is None:
+                        overlap_memory = np.copy(out[-overlap:])
+                    else:
+                        overlap_memory[:] = out[-overlap:]
+
+                if blocksize > frames + overlap and fill_value is None:
+                    block = out[:frames + overlap]
                 else:
-                    overlap_memory[:] = out[-overlap:]
+                    block = out
+                yield np.copy(block) if copy_out else block
+                frames -= toread
+        finally:
+            # also if the generator is closed early
+            if copy_out:
+                self._release_array(out)
+
+    def _blocks_until_end(self, out, copy_out, overlap, frames, dtype,
+                          always_2d, fill_value, samplerate_out, mix, stats,
+                          follow, poll_interval, idle_timeout):
+        """Yield blocks until the end of a non-seekable or growing file.
+
+        Without *follow*, a short read marks the end of the file.
+        With *follow*, see blocks().  If *frames* is not negative, at
+        most this number of frames is read.
 
-            if blocksize > frames + overlap and fill_value is None:
-                block = out[:frames + overlap]
-            else:
+        """
+        blocksize = len(out)
+        filled = 0  # frames in out, including the overlap
+        new = 0  # frames in out which were not yielded before
+        idle_since = None
+        while frames != 0:
+            toread = blocksize - filled
+            if frames > 0:
+                toread = min(toread, frames)
+            if follow:
+                if self.frames <= self.tell() and self.refresh() <= 0:
+                    now = _time.monotonic()
+                    if idle_since is None:
+                        idle_since = now
+                    if (idle_timeout is not None and
+                            now - idle_since >= idle_timeout):
+                        break
+                    _time.sleep(poll_interval)
+                    continue
+                idle_since = None
+                toread = min(toread, self.frames - self.tell())
+            read = len(self.read(toread, dtype, always_2d, None,
+                                 out[filled:filled + toread], samplerate_out,
+                                 mix, stats))
+            if frames > 0:
+                frames -= read
+            filled += read
+            new += read
+            if filled == blocksize:
+                yield out.copy() if copy_out else out
+                if overlap:
+                    out[:overlap] = out[blocksize - overlap:]
+                filled = overlap
+                new = 0
+            if read < toread and not follow:
+                break
+        if new:
+            if fill_value is not None:
+                out[filled:] = fill_value
                 block = out
-            yield np.copy(block) if copy_out else block
-            frames -= toread
+            else:
+                block = out[:filled]
+            yield block.copy() if copy_out else block
+
+    def refresh(self) -> int:
+        """Update the length of a file which is still being written.
+
+        libsndfile reads the number of frames from the file header
+        when a file is opened and never reads beyond it.  If the
+        underlying file has grown since then, the file is opened again
+        (keeping the read position) and `frames` is updated.  If the
+        file wasn't modified, this is very cheap.
+
+        This is only possible in read-only mode and for seekable files.
+
+        Returns
+        -------
+        int
+            The number of frames which were added since the last call
+            (or since the file was opened).
+
+        See Also
+        --------
+        blocks : With ``follow=True``, new blocks are read as they
+                 appear.
+
+        """
+        self._check_if_closed()
+        if self.mode.replace('b', '') != 'r':
+            raise SoundFileRuntimeError(
+                "refresh() is only allowed in read-only mode")
+        if not self.seekable():
+            raise ValueError("refresh() is only allowed for seekable files")
+        version = self._file_version()
+        if version == self._file_refreshed:
+            return 0
+        self._file_refreshed = version
+        old_frames = self.frames
+        position = self.tell()
+        embed = _ffi.new("SF_EMBED_FILE_INFO*")
+        _snd.sf_command(self._file, _snd.SFC_GET_EMBED_FILE_INFO,
+                        embed, _ffi.sizeof(embed[0]))
+        file = self.name
+        if isinstance(file, int):
+            # the new handle gets its own descriptor, which it closes
+            file = _os.dup(file if self._fd is None else self._fd)
+            _os.lseek(file, embed.offset, SEEK_SET)
+        elif not isinstance(file, (str, bytes)):
+            file.seek(embed.offset, SEEK_SET)
+        old_file, old_virtual_io = self._file, self._virtual_io
+        info = _ffi.new("SF_INFO*")
+        info.samplerate = self._info.samplerate
+        info.channels = self._info.channels
+        info.format = self._info.format
+        old_info, self._info = self._info, info
+        try:
+            self._file = self._open(file, _snd.SFM_READ, True)
+        except BaseException:
+            self._info = old_info
+            if isinstance(file, int):
+                try:
+                    _os.close(file)
+                except OSError:
+                    pass  # libsndfile closes it on some errors
+            raise
+        _snd.sf_close(old_file)
+        del old_virtual_io  # must be kept alive until sf_close()
+        if isinstance(file, int):
+            self._fd = file
+        self._set_conversion_options()
+        pool = _HandlePool(self._read_handles.shared)
+        pool.max_count = self._read_handles.max_count
+        self._read_handles.close()
+        self._read_handles = pool
+        self._seek(position, SEEK_SET)
+        return self.frames - old_frames
 
     def truncate(self, frames: int | None = None) -> None:
         """Truncate the file to a given number of frames.
@@ -1226,6 +3293,7 @@ class SoundFile:
             If not specified, the current read/write position is used.
 
         """
+        start = _time.time() if _trace_hooks else None
         if frames is None:
             frames = self.tell()
         err = _snd.sf_command(self._file, _snd.SFC_FILE_TRUNCATE,
@@ -1236,6 +3304,8 @@ class SoundFile:
             err = _snd.sf_error(self._file)
             raise LibsndfileError(err, "Error truncating the file")
         self._info.frames = frames
+        if start is not None:
+            self._call_trace_hooks('truncate', start)
 
     def flush(self) -> None:
         """Write unwritten data to the file system.
@@ -1249,26 +3319,38 @@ class SoundFile:
 
         """
         self._check_if_closed()
+        start = _time.time() if _trace_hooks else None
         _snd.sf_write_sync(self._file)
+        if start is not None:
+            self._call_trace_hooks('flush', start)
 
     def close(self) -> None:
         """Close the file.  Can be called multiple times."""
         if not self.closed:
+            start = _time.time() if _trace_hooks else None
+            if self._read_handles is not None:
+                self._read_handles.close()
             # be sure to flush data to disk before closing the file
             self.flush()
             err = _snd.sf_close(self._file)
             self._file = None
             _error_check(err)
-
-    # sf_error(NULL) returns a global (non-thread-safe) error code.
-    # When an sf_open* call fails (returns NULL), we must call
-    # sf_error(NULL) to retrieve the error code, but another thread
-    # may clear the global error between our open and our sf_error.
-    # This lock serialises the open+sf_error(NULL) pair to prevent that.
-    _sf_error_lock = _threading.Lock()
+            if start is not None:
+                self._call_trace_hooks('close', start)
+
+    # sf_error(NULL) returns a global (non-thread-safe) error code,
+    # which is reset by every sf_open*() call.  When an sf_open* call
+    # fails (returns NULL), we must call sf_error(NULL) to retrieve the
+    # error code, but another thread may clear or overwrite the global
+    # error between our open and our sf_error.
+    # Opens hold this lock in shared mode, so they can run concurrently.
+    # Only if an open fails while other opens overlapped with it, the
+    # open is repeated while holding the lock exclusively.
+    _sf_error_lock = _SharedLock()
 
     def _open(self, file, mode_int, closefd):
         """Call the appropriate sf_open*() function from libsndfile."""
+        start = _time.time() if _trace_hooks else None
         if isinstance(file, (str, bytes)):
             if _os.path.isfile(file):
                 if 'x' in self.mode:
@@ -1290,11 +3372,35 @@ class SoundFile:
         else:
             raise TypeError(f"Invalid file: {self.name!r}")
 
-        with self._sf_error_lock:
+        # a failed open may have modified self._info:
+        initial_info = _ffi.new("SF_INFO*", self._info[0])
+        if isinstance(file, int) and closefd:
+            rewind = None
+        else:
+            rewind = _rewind_function(file)
+        token = self._sf_error_lock.acquire_shared()
+        try:
             file_ptr = openfunction(file, mode_int, self._info)
             if file_ptr == _ffi.NULL:
                 err = _snd.sf_error(file_ptr)
-                raise LibsndfileError(err, prefix=f"Error opening {self.name!r}: ")
+                reliable = self._sf_error_lock.was_alone(token)
+        finally:
+            self._sf_error_lock.release_shared()
+        # Only repeat the open if it starts at the same position.
+        # libsndfile closes the file descriptor on failure if closefd
+        # is set, pipes and other streams can't be rewound:
+        if file_ptr == _ffi.NULL and not reliable and rewind is not None:
+            rewind()
+            self._info = _ffi.new("SF_INFO*", initial_info[0])
+            self._sf_error_lock.acquire_exclusive()
+            try:
+                file_ptr = openfunction(file, mode_int, self._info)
+                if file_ptr == _ffi.NULL:
+                    err = _snd.sf_error(file_ptr)
+            finally:
+                self._sf_error_lock.release_exclusive()
+        if file_ptr == _ffi.NULL:
+            raise LibsndfileError(err, prefix=f"Error opening {self.name!r}: ")
         if mode_int == _snd.SFM_WRITE:
             # Due to a bug in libsndfile version <= 1.0.25, frames != 0
             # when opening a named pipe in SFM_WRITE mode.
@@ -1302,11 +3408,57 @@ class SoundFile:
             self._info.frames = 0
             # This is not necessary for "normal" files (because
             # frames == 0 in this case), but it doesn't hurt, either.
+        if start is not None:
+            self._call_trace_hooks('open', start)
         return file_ptr
 
+    def _set_conversion_options(self):
+        """Apply clipping, normalize and scaling options to self._file."""
+        _snd.sf_command(self._file, _snd.SFC_SET_CLIPPING, _ffi.NULL,
+                        _snd.SF_TRUE if self._clipping else _snd.SF_FALSE)
+        if not self._normalize:
+            _snd.sf_command(self._file, _snd.SFC_SET_NORM_FLOAT, _ffi.NULL,
+                            _snd.SF_FALSE)
+            _snd.sf_command(self._file, _snd.SFC_SET_NORM_DOUBLE, _ffi.NULL,
+                            _snd.SF_FALSE)
+        if self._scale_float_int_read:
+            _snd.sf_command(self._file, _snd.SFC_SET_SCALE_FLOAT_INT_READ,
+                            _ffi.NULL, _snd.SF_TRUE)
+        if self._scale_int_float_write:
+            _snd.sf_command(self._file, _snd.SFC_SET_SCALE_INT_FLOAT_WRITE,
+                            _ffi.NULL, _snd.SF_TRUE)
+
+    def _file_version(self):
+        """Return something that changes when the file is modified."""
+        file = self.name if self._fd is None else self._fd
+        if isinstance(file, (str, bytes, int)):
+            stat = _os.stat(file)
+            return stat.st_size, stat.st_mtime_ns
+        curr = file.tell()
+        size = file.seek(0, SEEK_END)
+        file.seek(curr, SEEK_SET)
+        return size
+
+    def _seek(self, frames, whence):
+        """Call sf_seek() without calling the trace hooks."""
+        self._check_if_closed()
+        if self._io_stats is not None:
+            _record_io(self._io_stats, seeks=1)
+        position = _snd.sf_seek(self._file, frames, whence)
+        _error_check(self._errorcode)
+        return position
+
+    def _call_trace_hooks(self, event, start, **details):
+        """Call all functions registered with add_trace_hook()."""
+        info = {'name': self.name, 'mode': self.mode,
+                'format': self.format, 'subtype': self.subtype,
+                'frames': self.frames, 'start': start, 'end': _time.time()}
+        info.update(details)
+        for hook in _trace_hooks:
+            hook(event, info)
+
     def _init_virtual_io(self, file):
         """Initialize callback functions for sf_open_virtual()."""
-        @_ffi.callback("sf_vio_get_filelen")
         def vio_get_filelen(user_data):
             curr = file.tell()
             file.seek(0, SEEK_END)
@@ -1314,12 +3466,10 @@ class SoundFile:
             file.seek(curr, SEEK_SET)
             return size
 
-        @_ffi.callback("sf_vio_seek")
         def vio_seek(offset, whence, user_data):
             file.seek(offset, whence)
             return file.tell()
 
-        @_ffi.callback("sf_vio_read")
         def vio_read(ptr, count, user_data):
             # first try readinto(), if not available fall back to read()
             try:
@@ -1332,7 +3482,6 @@ class SoundFile:
                 buf[0:data_read] = data
             return data_read
 
-        @_ffi.callback("sf_vio_write")
         def vio_write(ptr, count, user_data):
             buf = _ffi.buffer(ptr, count)
             data = buf[:]
@@ -1342,19 +3491,40 @@ class SoundFile:
                 written = count
             return written
 
-        @_ffi.callback("sf_vio_tell")
         def vio_tell(user_data):
             return file.tell()
 
+        functions = {'get_filelen': vio_get_filelen,
+                     'seek': vio_seek,
+                     'read': vio_read,
+                     'write': vio_write,
+                     'tell': vio_tell}
+        if self._io_stats is not None:
+            functions = {name: self._counting_vio(name, func)
+                         for name, func in functions.items()}
+
         # Note: the callback functions must be kept alive!
-        self._virtual_io = {'get_filelen': vio_get_filelen,
-                            'seek': vio_seek,
-                            'read': vio_read,
-                            'write': vio_write,
-                            'tell': vio_tell}
+        self._virtual_io = {name: _ffi.callback('sf_vio_' + name, func)
+                            for name, func in functions.items()}
 
         return _ffi.new("SF_VIRTUAL_IO*", self._virtual_io)
 
+    def _counting_vio(self, name, func):
+        """Wrap a virtual I/O function to update self._io_stats."""
+        stats = self._io_stats
+        calls, time = f'vio_{name}_calls', f'vio_{name}_time'
+        size = f'vio_{name}_bytes' if name in ('read', 'write') else None
+
+        def counting_func(*args):
+            start = _time.perf_counter()
+            result = func(*args)
+            counts = {calls: 1, time: _time.perf_counter() - start}
+            if size is not None:
+                counts[size] = result
+            _record_io(stats, **counts)
+            return result
+        return counting_func
+
     def _getAttributeNames(self):
         """Return all attributes used in __setattr__ and __getattr__.
 
@@ -1372,10 +3542,15 @@ class SoundFile:
         if self.closed:
             raise SoundFileRuntimeError("I/O operation on closed file")
 
-    def _check_frames(self, frames, fill_value):
+    def _check_frames(self, frames, fill_value, samplerate_out=None):
         """Reduce frames to no more than are available in the file."""
         if self.seekable():
-            remaining_frames = self.frames - self.tell()
+            if samplerate_out is None or samplerate_out == self.samplerate:
+                remaining_frames = self.frames - self.tell()
+            else:
+                resampler = self._get_resampler(samplerate_out)
+                remaining_frames = (resampler.frames_out(self.frames) -
+                                    resampler.n)
             if frames < 0 or (frames > remaining_frames and
                               fill_value is None):
                 frames = remaining_frames
@@ -1394,15 +3569,26 @@ class SoundFile:
             raise ValueError("Data size must be a multiple of frame size")
         return data, frames
 
-    def _create_empty_array(self, frames, always_2d, dtype):
+    def _create_empty_array(self, frames, always_2d, dtype, channels=None):
         """Create an empty array with appropriate shape."""
         import numpy as np
-        if always_2d or self.channels > 1:
-            shape = frames, self.channels
+        if channels is None:
+            channels = self.channels
+        if always_2d or channels > 1:
+            shape = frames, channels
         else:
             shape = frames,
+        pool = self.buffer_pool
+        if pool is not None:
+            return pool.empty(shape, dtype)
         return np.empty(shape, dtype, order='C')
 
+    def _release_array(self, array):
+        """Give a temporary array back to the buffer pool, if any."""
+        pool = self.buffer_pool
+        if pool is not None:
+            pool.release(array)
+
     def _check_dtype(self, dtype):
         """Check if dtype string is valid and return ctype string."""
         try:
@@ -1410,17 +3596,22 @@ class SoundFile:
         except KeyError:
             raise ValueError(f"dtype must be one of {sorted(_ffi_types.keys())!r} and not {dtype!r}")
 
-    def _array_io(self, action, array, frames):
-        """Check array and call low-level IO function."""
+    def _check_array(self, array):
+        """Check array shape and dtype and return ctype string."""
         if array.ndim not in (1,2):
             raise ValueError(f"Invalid shape: {array.shape!r} ({'0 dimensions not supported' if array.ndim < 1 else 'too many dimensions'})")
         array_channels = 1 if array.ndim == 1 else array.shape[1]
         if array_channels != self.channels:
             raise ValueError(f"Invalid shape: {array.shape!r} (Expected {self.channels} channels, got {array_channels})")
-        if not array.flags.c_contiguous:
-            raise ValueError("Data must be C-contiguous")
         ctype = self._check_dtype(array.dtype.name)
         assert array.dtype.itemsize == _ffi.sizeof(ctype)
+        return ctype
+
+    def _array_io(self, action, array, frames):
+        """Check array and call low-level IO function."""
+        ctype = self._check_array(array)
+        if not array.flags.c_contiguous:
+            raise ValueError("Data must be C-contiguous")
         cdata = _ffi.cast(ctype + '*', array.__array_interface__['data'][0])
         return self._cdata_io(action, cdata, ctype, frames)
 
@@ -1428,41 +3619,267 @@ class SoundFile:
         """Call one of libsndfile's read/write functions."""
         assert ctype in _ffi_types.values()
         self._check_if_closed()
+        start = _time.time() if _trace_hooks else None
         curr = 0
         if self.seekable():
             curr = self.tell()
         func = getattr(_snd, 'sf_' + action + 'f_' + ctype)
-        frames = func(self._file, data, frames)
+        if self._io_stats is None:
+            frames = func(self._file, data, frames)
+        else:
+            clock = _time.perf_counter()
+            frames = func(self._file, data, frames)
+            duration = _time.perf_counter() - clock
+            size = frames * self.channels * _ffi.sizeof(ctype)
+            if action == 'read':
+                _record_io(self._io_stats, read_calls=1, frames_read=frames,
+                           bytes_read=size, read_time=duration)
+            else:
+                _record_io(self._io_stats, write_calls=1,
+                           frames_written=frames, bytes_written=size,
+                           write_time=duration)
         _error_check(self._errorcode)
         if self.seekable():
-            self.seek(curr + frames, SEEK_SET)  # Update read & write position
+            self._seek(curr + frames, SEEK_SET)  # Update read & write position
+        if start is not None:
+            self._call_trace_hooks(action, start, count=frames)
         return frames
 
     def _update_frames(self, written):
         """Update self.frames after writing."""
         if self.seekable():
             curr = self.tell()
-            self._info.frames = self.seek(0, SEEK_END)
-            self.seek(curr, SEEK_SET)
+            self._info.frames = self._seek(0, SEEK_END)
+            self._seek(curr, SEEK_SET)
         else:
             self._info.frames += written
 
-    def _prepare_read(self, start, stop, frames):
-        """Seek to start frame and calculate length."""
+    def _update_header_if_due(self):
+        """Update the header if update_header seconds have passed."""
+        if self._update_header is True or not self._update_header:
+            return
+        now = _time.monotonic()
+        if now - self._header_updated >= self._update_header:
+            _snd.sf_command(self._file, _snd.SFC_UPDATE_HEADER_NOW,
+                            _ffi.NULL, 0)
+            self._header_updated = now
+
+    def _prepare_read(self, start, stop, frames, samplerate_out=None):
+        """Seek to start frame and calculate length.
+
+        If *samplerate_out* is given, *start*, *stop* and *frames* are
+        given in frames at this sample rate.
+
+        """
         if start != 0 and not self.seekable():
             raise ValueError("start is only allowed for seekable files")
         if frames >= 0 and stop is not None:
             raise TypeError("Only one of {frames, stop} may be used")
 
-        start, stop, _ = slice(start, stop).indices(self.frames)
+        resample = (samplerate_out is not None and
+                    samplerate_out != self.samplerate)
+        total = self.frames
+        if resample:
+            total = self._get_resampler(samplerate_out).frames_out(total)
+        to_end = stop is None
+        start, stop, _ = slice(start, stop).indices(total)
         if stop < start:
             stop = start
         if frames < 0:
-            frames = stop - start
+            if to_end and not self.seekable():
+                # the length in the header may be a placeholder
+                frames = -1
+            else:
+                frames = stop - start
         if self.seekable():
-            self.seek(start, SEEK_SET)
+            if resample:
+                self._seek_resampler(start)
+            else:
+                self.seek(start, SEEK_SET)
         return frames
 
+    def _get_resampler(self, samplerate_out):
+        """Return a resampler which continues at the current position."""
+        resampler = self._resampler
+        if resampler is None or resampler.samplerate_out != samplerate_out:
+            resampler = _Resampler(self.samplerate, samplerate_out,
+                                   self.channels)
+            self._resampler = resampler
+            if self.seekable():
+                self._seek_resampler(resampler.frames_out(self.tell()))
+        elif self.seekable() and self.tell() != resampler.position:
+            # the position was changed by seek(), read() etc.
+            self._seek_resampler(resampler.frames_out(self.tell()))
+        return resampler
+
+    def _seek_resampler(self, frame):
+        """Let the resampler continue at the given output frame."""
+        first = self._resampler.reset(frame)
+        self.seek(first, SEEK_SET)
+        self._resampler.position = first
+
+    def _read_until_end(self, dtype, always_2d, samplerate_out, mix, stats):
+        """Read a non-seekable file in growing chunks until the end."""
+        chunks = []
+        blocksize = 4096
+        while True:
+            chunk = self.read(blocksize, dtype, always_2d, None, None,
+                              samplerate_out, mix, stats)
+            chunks.append(chunk)
+            if len(chunk) < blocksize:
+                break
+            blocksize = min(2 * blocksize, 2**20)
+        if len(chunks) == 1:
+            return chunks[0]
+        data = numpy.concatenate(chunks)
+        for chunk in chunks:
+            self._release_array(chunk)
+        return data
+
+    def _read_resampled(self, frames, dtype, always_2d, fill_value, out,
+                        samplerate_out):
+        """Read from the file and resample to samplerate_out."""
+        resampler = self._get_resampler(samplerate_out)
+        if out is None:
+            frames = self._check_frames(frames, fill_value, samplerate_out)
+            out = self._create_empty_array(frames, always_2d, dtype)
+        else:
+            if frames < 0 or frames > len(out):
+                frames = len(out)
+            dtype = out.dtype.name
+        self._check_array(out)
+        out_2d = out if out.ndim == 2 else out[:, None]
+        read = 0
+        while read < frames:
+            # Limit the amount of data at the original sample rate:
+            toread = min(frames - read, 16 * resampler.chunksize)
+            needed = resampler.needed(toread)
+            if needed:
+                data = self.read(needed, dtype, always_2d=True)
+                resampler.push(data)
+                if len(data) < needed:
+                    resampler.finish()
+            pulled = resampler.pull(out_2d[read:read + toread])
+            if not pulled:
+                break
+            read += pulled
+        if self.seekable():
+            resampler.position = self.tell()
+        if len(out) > read:
+            if fill_value is None:
+                out = out[:read]
+            else:
+                out[read:] = fill_value
+        return out
+
+    @_contextmanager
+    def _read_handle(self, start, frames):
+        """Borrow a handle from the read_at() pool and seek to start.
+
+        The read/write position of the handle is restored afterwards.
+
+        """
+        self._check_if_closed()
+        if not self.seekable():
+            raise ValueError("read_at() is only allowed for seekable files")
+        handle = self._read_handles.acquire(self._open_read_handle)
+        f = self if handle is None else handle
+        try:
+            curr = f.tell()
+            try:
+                yield f, f._prepare_read(start, None, frames)
+            finally:
+                f.seek(curr, SEEK_SET)
+        finally:
+            self._read_handles.release(handle)
+
+    def _mix_matrix(self, mix):
+        """Check mix argument and return gain matrix (out x in)."""
+        import numpy as np
+        if isinstance(mix, str):
+            if mix != 'mono':
+                raise ValueError(f"Invalid mix: {mix!r}")
+            return np.full((1, self.channels), 1 / self.channels)
+        matrix = np.asarray(mix, dtype='float64')
+        if matrix.ndim != 2 or matrix.shape[1] != self.channels:
+            raise ValueError(
+                f"mix must have shape (out_channels, {self.channels}), "
+                f"not {matrix.shape!r}")
+        return matrix
+
+    def _read_mixed(self, frames, dtype, always_2d, fill_value, out,
+                    samplerate_out, mix):
+        """Read from the file and mix channels block-wise."""
+        import numpy as np
+        matrix = self._mix_matrix(mix)
+        if out is None:
+            frames = self._check_frames(frames, fill_value, samplerate_out)
+            out = self._create_empty_array(frames, always_2d, dtype,
+                                           len(matrix))
+        else:
+            if frames < 0 or frames > len(out):
+                frames = len(out)
+            dtype = out.dtype.name
+        out_2d = out if out.ndim == 2 else out[:, None]
+        if out.ndim not in (1, 2) or out_2d.shape[1] != len(matrix):
+            raise ValueError(f"Invalid shape: {out.shape!r} (Expected "
+                             f"{len(matrix)} channels for mix)")
+        self._check_dtype(dtype)
+        if dtype == 'float32':
+            matrix = matrix.astype('float32')
+        # (in x out), to be multiplied from the right:
+        matrix = matrix.T
+        scratch = self._create_empty_array(min(frames, 4096), True, dtype)
+        read = 0
+        try:
+            while read < frames:
+                block = self.read(frames - read, dtype, True, None, scratch,
+                                  samplerate_out)
+                if not len(block):
+                    break
+                target = out_2d[read:read + len(block)]
+                if out.dtype.kind == 'f':
+                    np.matmul(block, matrix, out=target)
+                else:
+                    info = np.iinfo(out.dtype)
+                    target[:] = np.rint(block @ matrix).clip(info.min,
+                                                             info.max)
+                read += len(block)
+        finally:
+            self._release_array(scratch)
+        if len(out) > read:
+            if fill_value is None:
+                out = out[:read]
+            else:
+                out[read:] = fill_value
+        return out
+
+    def _read_with_stats(self, frames, dtype, always_2d, fill_value, out,
+                         samplerate_out, mix, stats):
+        """Read block-wise and update stats with each block."""
+        if out is None:
+            frames = self._check_frames(frames, fill_value, samplerate_out)
+            channels = None if mix is None else len(self._mix_matrix(mix))
+            out = self._create_empty_array(frames, always_2d, dtype,
+                                           channels)
+        else:
+            if frames < 0 or frames > len(out):
+                frames = len(out)
+        read = 0
+        while read < frames:
+            block = self.read(min(frames - read, 16384), dtype, always_2d,
+                              None, out[read:], samplerate_out, mix)
+            if not len(block):
+                break
+            stats.update(block)
+            read += len(block)
+        if len(out) > read:
+            if fill_value is None:
+                out = out[:read]
+            else:
+                out[read:] = fill_value
+        return out
+
     def copy_metadata(self) -> dict[str, str]:
         """Get all metadata present in this SoundFile
 
@@ -1481,61 +3898,1407 @@ class SoundFile:
                 strs[strtype] = _ffi.string(data).decode('utf-8', 'replace')
         return strs
 
-    def _set_bitrate_mode(self, bitrate_mode):
-        """Call libsndfile's set bitrate mode function."""
-        assert bitrate_mode in _bitrate_modes
+    def signal_max(self, per_channel: bool = False) -> float | numpy.ndarray | None:
+        """Return the peak value stored in the file header.
 
-        pointer_bitrate_mode = _ffi.new("int[1]")
-        pointer_bitrate_mode[0] = _bitrate_modes[bitrate_mode]
-        err = _snd.sf_command(self._file, _snd.SFC_SET_BITRATE_MODE, pointer_bitrate_mode, _ffi.sizeof(pointer_bitrate_mode))
-        if err != _snd.SF_TRUE:
-            err = _snd.sf_error(self._file)
-            raise LibsndfileError(err, f"Error set bitrate mode {bitrate_mode}")
+        This reads the PEAK chunk (e.g. of WAV and AIFF files with
+        floating point data), without decoding any audio data.
 
+        Parameters
+        ----------
+        per_channel : bool, optional
+            If ``True``, return an array with the peak value of each
+            channel instead of the peak over all channels.
 
-    def _set_compression_level(self, compression_level):
-        """Call libsndfile's set compression level function."""
-        if not (0 <= compression_level <= 1):
-            raise ValueError("Compression level must be in range [0..1]")
+        Returns
+        -------
+        float or `numpy.ndarray` or None
+            The largest absolute sample value, or ``None`` if the file
+            has no PEAK chunk.
 
-        pointer_compression_level = _ffi.new("double[1]")
-        pointer_compression_level[0] = compression_level
-        err = _snd.sf_command(self._file, _snd.SFC_SET_COMPRESSION_LEVEL, pointer_compression_level, _ffi.sizeof(pointer_compression_level))
-        if err != _snd.SF_TRUE:
-            err = _snd.sf_error(self._file)
-            raise LibsndfileError(err, f"Error set compression level {compression_level}")
+        See Also
+        --------
+        calc_signal_max
 
+        """
+        self._check_if_closed()
+        if per_channel:
+            command = _snd.SFC_GET_MAX_ALL_CHANNELS
+        else:
+            command = _snd.SFC_GET_SIGNAL_MAX
+        found, values = self._signal_max_command(command, per_channel)
+        if found != _snd.SF_TRUE:
+            return None
+        return values
 
-def _error_check(err, prefix=""):
-    """Raise LibsndfileError if there is an error."""
-    if err != 0:
-        raise LibsndfileError(err, prefix=prefix)
+    def calc_signal_max(self, per_channel: bool = False,
+                        normalized: bool = True) -> float | numpy.ndarray:
+        """Scan the whole file and return its peak value.
 
+        Unlike `signal_max()`, this decodes the whole file (but only
+        one buffer at a time), which can take a while for large files.
+        The read/write position is not changed.
 
-def _format_int(format, subtype, endian):
-    """Return numeric ID for given format|subtype|endian combo."""
-    result = _check_format(format)
-    if subtype is None:
-        subtype = default_subtype(format)
-        if subtype is None:
-            raise TypeError(
-                f"No default subtype for major format {format!r}")
-    elif not isinstance(subtype, str):
-        raise TypeError(f"Invalid subtype: {subtype!r}")
-    try:
-        result |= _subtypes[subtype.upper()]
-    except KeyError:
-        raise ValueError(f"Unknown subtype: {subtype!r}")
-    if endian is None:
-        endian = 'FILE'
-    elif not isinstance(endian, str):
-        raise TypeError(f"Invalid endian-ness: {endian!r}")
-    try:
-        result |= _endians[endian.upper()]
-    except KeyError:
-        raise ValueError(f"Unknown endian-ness: {endian!r}")
+        Parameters
+        ----------
+        per_channel : bool, optional
+            If ``True``, return an array with the peak value of each
+            channel instead of the peak over all channels.
+        normalized : bool, optional
+            By default, the value is relative to full scale (as if the
+            file was read with ``dtype='float64'``).  With
+            ``normalized=False``, the value is given in the range of
+            the file's subtype, e.g. ``32767`` for ``'PCM_16'``.
 
-    info = _ffi.new("SF_INFO*")
+        Returns
+        -------
+        float or `numpy.ndarray`
+            The largest absolute sample value.
+
+        """
+        self._check_if_closed()
+        if 'r' not in self.mode and '+' not in self.mode:
+            raise SoundFileRuntimeError(
+                "calc_signal_max() is not allowed in write-only mode")
+        if not self.seekable():
+            raise ValueError(
+                "calc_signal_max() is only allowed for seekable files")
+        if per_channel:
+            command = (_snd.SFC_CALC_NORM_MAX_ALL_CHANNELS if normalized
+                       else _snd.SFC_CALC_MAX_ALL_CHANNELS)
+        else:
+            command = (_snd.SFC_CALC_NORM_SIGNAL_MAX if normalized
+                       else _snd.SFC_CALC_SIGNAL_MAX)
+        _, values = self._signal_max_command(command, per_channel)
+        _error_check(self._errorcode, "Error calculating signal maximum: ")
+        return values
+
+    def _signal_max_command(self, command, per_channel):
+        """Call one of libsndfile's signal maximum commands."""
+        values = _ffi.new("double[]", self.channels if per_channel else 1)
+        result = _snd.sf_command(self._file, command, values,
+                                 _ffi.sizeof(values))
+        if per_channel:
+            return result, numpy.frombuffer(_ffi.buffer(values)).copy()
+        return result, values[0]
+
+    def chunks(self) -> list[tuple[str, int]]:
+        """Return the identifiers and sizes of the chunks in the file.
+
+        This is only supported for some major formats (e.g. WAV, AIFF
+        and CAF), for other formats an empty list is returned.  The
+        chunks are indexed by libsndfile when the file is opened, but
+        libsndfile only provides the identifier of a chunk together
+        with its data.  Therefore, the first byte of each chunk
+        (including the ``'data'`` chunk) is read, which takes one seek
+        and one small read per chunk.  No audio data is decoded.
+
+        Returns
+        -------
+        list of tuple
+            A ``(chunk_id, size)`` tuple for each chunk, in the order
+            of the file.  The size is given in bytes.
+
+        See Also
+        --------
+        get_chunk, set_chunk
+
+        """
+        self._check_if_closed()
+        return [(_ffi.string(info.id, info.id_size).decode('latin-1'),
+                 info.datalen)
+                for _, info in self._iter_chunks(None)]
+
+    def get_chunk(self, chunk_id: str) -> memoryview | None:
+        """Return the data of a chunk.
+
+        Only the requested chunk is read from the file, directly into
+        the returned buffer.
+
+        Parameters
+        ----------
+        chunk_id : str
+            The identifier of the chunk, e.g. ``'bext'`` or ``'LIST'``.
+            If there are several chunks with this identifier, the first
+            one is returned.
+
+        Returns
+        -------
+        buffer or None
+            A buffer containing the chunk data (without the chunk
+            header), or ``None`` if there is no such chunk.
+
+        """
+        self._check_if_closed()
+        for iterator, info in self._iter_chunks(chunk_id):
+            data = _ffi_new_uninitialized('char[]', info.datalen)
+            if info.datalen:
+                info.data = data
+                _error_check(_snd.sf_get_chunk_data(iterator, info),
+                             f"Error reading chunk {chunk_id!r}: ")
+            return _ffi.buffer(data)
+        return None
+
+    def set_chunk(self, chunk_id: str, data: bytes) -> None:
+        """Add a chunk to the file header.
+
+        This must be called after opening a new file for writing and
+        before any audio data is written.  Chunks are only supported for
+        some major formats (e.g. WAV, AIFF and CAF).
+
+        Parameters
+        ----------
+        chunk_id : str
+            The identifier of the chunk, usually four characters.
+        data : buffer or bytes
+            The chunk data (without the chunk header).  It is padded
+            to a multiple of four bytes.
+
+        """
+        self._check_if_closed()
+        if self.frames:
+            raise SoundFileRuntimeError(
+                "set_chunk() must be called before writing audio data")
+        info = self._chunk_info(chunk_id)
+        data = _ffi.from_buffer(data)
+        info.data = data
+        info.datalen = len(data)
+        _error_check(_snd.sf_set_chunk(self._file, info),
+                     f"Error setting chunk {chunk_id!r}: ")
+
+    def _chunk_info(self, chunk_id):
+        """Create SF_CHUNK_INFO struct with the given identifier."""
+        if not isinstance(chunk_id, str):
+            raise TypeError(f"Invalid chunk_id: {chunk_id!r}")
+        id_bytes = chunk_id.encode('latin-1')
+        if not 0 < len(id_bytes) <= 64:
+            raise ValueError(f"Invalid chunk_id: {chunk_id!r}")
+        info = _ffi.new('SF_CHUNK_INFO*')
+        info.id = id_bytes
+        info.id_size = len(id_bytes)
+        return info
+
+    def _iter_chunks(self, chunk_id):
+        """Yield iterator and SF_CHUNK_INFO (id and size) of chunks.
+
+        If *chunk_id* is ``None``, all chunks are returned.
+
+        """
+        info = _ffi.NULL if chunk_id is None else self._chunk_info(chunk_id)
+        iterator = _snd.sf_get_chunk_iterator(self._file, info)
+        while iterator != _ffi.NULL:
+            if chunk_id is None:
+                info = _ffi.new('SF_CHUNK_INFO*')
+            else:
+                info = self._chunk_info(chunk_id)
+            _error_check(_snd.sf_get_chunk_size(iterator, info))
+            if chunk_id is None:
+                # The identifier is only filled in when reading data
+                # (and reading zero bytes fails with virtual I/O), so
+                # one byte is read:
+                size = info.datalen
+                dummy = _ffi.new('char[1]')
+                info.data = dummy
+                info.datalen = 1
+                _error_check(_snd.sf_get_chunk_data(iterator, info))
+                info.datalen = size
+            yield iterator, info
+            iterator = _snd.sf_next_chunk_iterator(iterator)
+
+    def get_broadcast_info(self) -> dict[str, Any] | None:
+        """Return the Broadcast Wave Format metadata (BEXT chunk).
+
+        Returns
+        -------
+        dict or None
+            A dict with the keys ``'description'``, ``'originator'``,
+            ``'originator_reference'``, ``'origination_date'``,
+            ``'origination_time'``, ``'time_reference'`` (the position
+            of the first sample in samples since midnight),
+            ``'version'``, ``'umid'`` (bytes),
+            ``'loudness_value'``, ``'loudness_range'``,
+            ``'max_true_peak_level'``, ``'max_momentary_loudness'``,
+            ``'max_shortterm_loudness'`` (in LUFS, LU and dBTP) and
+            ``'coding_history'``.
+            ``None`` if the file has no BEXT chunk.
+
+        See Also
+        --------
+        set_broadcast_info
+
+        """
+        self._check_if_closed()
+        bext = _ffi.new('SF_BROADCAST_INFO*',
+                        {'coding_history': _max_coding_history})
+        if _snd.sf_command(self._file, _snd.SFC_GET_BROADCAST_INFO, bext,
+                           _ffi.sizeof(bext[0])) != _snd.SF_TRUE:
+            return None
+        info = {name: _ffi.string(getattr(bext, name)).decode('utf-8',
+                                                              'replace')
+                for name in _broadcast_str_fields}
+        info['time_reference'] = (bext.time_reference_high << 32 |
+                                  bext.time_reference_low)
+        info['version'] = bext.version
+        info['umid'] = bytes(_ffi.buffer(bext.umid))
+        for name in _broadcast_loudness_fields:
+            info[name] = getattr(bext, name) / 100
+        size = min(bext.coding_history_size, _max_coding_history)
+        info['coding_history'] = _ffi.string(
+            bext.coding_history, size).decode('utf-8', 'replace')
+        return info
+
+    def set_broadcast_info(self, info: dict[str, Any]) -> None:
+        """Write Broadcast Wave Format metadata (BEXT chunk).
+
+        This is only supported for WAV-based formats, and it must be
+        called before any audio data is written.
+
+        Parameters
+        ----------
+        info : dict
+            See `get_broadcast_info()` for the possible keys, missing
+            keys are left empty.  libsndfile sets the ``'version'``
+            and appends a line to the ``'coding_history'``.
+
+        """
+        unknown = set(info).difference(
+            _broadcast_str_fields + _broadcast_loudness_fields +
+            ('time_reference', 'version', 'umid', 'coding_history'))
+        if unknown:
+            raise ValueError(f"Invalid broadcast info: {sorted(unknown)!r}")
+        coding_history = info.get('coding_history', '').encode('utf-8')
+        bext = _ffi.new('SF_BROADCAST_INFO*',
+                        {'coding_history': len(coding_history) + 1})
+        for name in _broadcast_str_fields:
+            _set_char_array(bext, name, info.get(name, '').encode('utf-8'))
+        _set_char_array(bext, 'umid', info.get('umid', b''))
+        time_reference = info.get('time_reference', 0)
+        bext.time_reference_low = time_reference & 0xFFFFFFFF
+        bext.time_reference_high = time_reference >> 32
+        bext.version = info.get('version', 0)
+        for name in _broadcast_loudness_fields:
+            setattr(bext, name, round(info.get(name, 0) * 100))
+        bext.coding_history = coding_history
+        bext.coding_history_size = len(coding_history)
+        self._set_header_command(_snd.SFC_SET_BROADCAST_INFO, bext,
+                                 'set_broadcast_info')
+
+    def get_cue_points(self) -> list[dict[str, Any]]:
+        """Return the cue points of the file.
+
+        Returns
+        -------
+        list of dict
+            A dict for each cue point with the keys ``'index'``,
+            ``'position'``, ``'fcc_chunk'``, ``'chunk_start'``,
+            ``'block_start'``, ``'sample_offset'`` and ``'name'``.
+            *position* and *sample_offset* are given in frames.
+
+        See Also
+        --------
+        set_cue_points
+
+        """
+        self._check_if_closed()
+        count = _ffi.new('uint32_t*')
+        if _snd.sf_command(self._file, _snd.SFC_GET_CUE_COUNT, count,
+                           _ffi.sizeof('uint32_t')) != _snd.SF_TRUE:
+            return []
+        cues = _ffi.new('SF_CUES*', {'cue_points': count[0]})
+        if _snd.sf_command(self._file, _snd.SFC_GET_CUE, cues,
+                           _ffi.sizeof(cues[0])) != _snd.SF_TRUE:
+            return []
+        return [dict(zip(_cue_point_fields, (
+                    cue.indx, cue.position, cue.fcc_chunk, cue.chunk_start,
+                    cue.block_start, cue.sample_offset,
+                    _ffi.string(cue.name).decode('utf-8', 'replace'))))
+                for cue in cues.cue_points[0:cues.cue_count]]
+
+    def set_cue_points(self, cue_points: list[dict[str, Any]]) -> None:
+        """Write cue points to the file.
+
+        This must be called before any audio data is written.
+
+        Parameters
+        ----------
+        cue_points : list of dict
+            See `get_cue_points()` for the possible keys.  Only
+            ``'position'`` is required, by default the ``'index'`` is
+            counted from 1, ``'fcc_chunk'`` refers to the ``'data'``
+            chunk and ``'sample_offset'`` is the same as
+            ``'position'``.
+
+        """
+        cues = _ffi.new('SF_CUES*', {'cue_points': len(cue_points)})
+        cues.cue_count = len(cue_points)
+        for i, (point, cue) in enumerate(zip(cue_points, cues.cue_points)):
+            unknown = set(point).difference(_cue_point_fields)
+            if unknown:
+                raise ValueError(f"Invalid cue point: {sorted(unknown)!r}")
+            cue.indx = point.get('index', i + 1)
+            cue.position = point['position']
+            cue.fcc_chunk = point.get('fcc_chunk',
+                                      int.from_bytes(b'data', 'little'))
+            cue.chunk_start = point.get('chunk_start', 0)
+            cue.block_start = point.get('block_start', 0)
+            cue.sample_offset = point.get('sample_offset', point['position'])
+            _set_char_array(cue, 'name',
+                            point.get('name', '').encode('utf-8'))
+        self._set_header_command(_snd.SFC_SET_CUE, cues, 'set_cue_points')
+
+    def get_instrument(self) -> dict[str, Any] | None:
+        """Return the sampler metadata of the file.
+
+        Returns
+        -------
+        dict or None
+            A dict with the keys ``'gain'``, ``'basenote'``,
+            ``'detune'``, ``'velocity_lo'``, ``'velocity_hi'``,
+            ``'key_lo'``, ``'key_hi'`` and ``'loops'``, which is a list
+            of dicts with the keys ``'mode'`` (``'NONE'``,
+            ``'FORWARD'``, ``'BACKWARD'`` or ``'ALTERNATING'``),
+            ``'start'``, ``'end'`` (in frames) and ``'count'``.
+            ``None`` if the file has no instrument metadata.
+
+        See Also
+        --------
+        set_instrument
+
+        """
+        self._check_if_closed()
+        inst = _ffi.new('SF_INSTRUMENT*')
+        if _snd.sf_command(self._file, _snd.SFC_GET_INSTRUMENT, inst,
+                           _ffi.sizeof(inst[0])) != _snd.SF_TRUE:
+            return None
+        loop_modes = {v: k for k, v in _loop_modes.items()}
+        info = {name: getattr(inst, name) for name in _instrument_fields}
+        info['loops'] = [{'mode': loop_modes.get(loop.mode, 'NONE'),
+                          'start': loop.start, 'end': loop.end,
+                          'count': loop.count}
+                         for loop in inst.loops[0:inst.loop_count]]
+        return info
+
+    def set_instrument(self, info: dict[str, Any]) -> None:
+        """Write sampler metadata to the file.
+
+        This must be called before any audio data is written.
+
+        Parameters
+        ----------
+        info : dict
+            See `get_instrument()` for the possible keys.  By default,
+            the *basenote* is 60 (middle C), the velocity and key
+            ranges are 0 to 127, and there are no loops.  A loop
+            must have a *start* and *end*, its *mode* is
+            ``'FORWARD'`` by default.
+
+        """
+        unknown = set(info).difference(_instrument_fields + ('loops',))
+        if unknown:
+            raise ValueError(f"Invalid instrument: {sorted(unknown)!r}")
+        loops = info.get('loops', [])
+        inst = _ffi.new('SF_INSTRUMENT*')
+        if len(loops) > len(inst.loops):
+            raise ValueError(
+                f"At most {len(inst.loops)} loops are supported")
+        defaults = {'basenote': 60, 'velocity_hi': 127, 'key_hi': 127}
+        for name in _instrument_fields:
+            setattr(inst, name, info.get(name, defaults.get(name, 0)))
+        inst.loop_count = len(loops)
+        for loop, target in zip(loops, inst.loops):
+            mode = loop.get('mode', 'FORWARD')
+            if mode not in _loop_modes:
+                raise ValueError(f"Invalid loop mode: {mode!r}")
+            target.mode = _loop_modes[mode]
+            target.start = loop['start']
+            target.end = loop['end']
+            target.count = loop.get('count', 0)
+        self._set_header_command(_snd.SFC_SET_INSTRUMENT, inst,
+                                 'set_instrument')
+
+    def _set_header_command(self, command, data, name):
+        """Call a libsndfile command which changes the file header."""
+        self._check_if_closed()
+        if self.frames:
+            raise SoundFileRuntimeError(
+                f"{name}() must be called before writing audio data")
+        if _snd.sf_command(self._file, command, data,
+                           _ffi.sizeof(data[0])) != _snd.SF_TRUE:
+            err = _snd.sf_error(self._file)
+            if err:
+                raise LibsndfileError(err, f"Error in {name}(): ")
+            raise SoundFileRuntimeError(
+                f"{name}() is not supported for {self.format} files")
+
+    def _set_bitrate_mode(self, bitrate_mode):
+        """Call libsndfile's set bitrate mode function."""
+        assert bitrate_mode in _bitrate_modes
+
+        pointer_bitrate_mode = _ffi.new("int[1]")
+        pointer_bitrate_mode[0] = _bitrate_modes[bitrate_mode]
+        err = _snd.sf_command(self._file, _snd.SFC_SET_BITRATE_MODE, pointer_bitrate_mode, _ffi.sizeof(pointer_bitrate_mode))
+        if err != _snd.SF_TRUE:
+            err = _snd.sf_error(self._file)
+            raise LibsndfileError(err, f"Error set bitrate mode {bitrate_mode}")
+
+
+    def _set_compression_level(self, compression_level):
+        """Call libsndfile's set compression level function."""
+        if not (0 <= compression_level <= 1):
+            raise ValueError("Compression level must be in range [0..1]")
+
+        pointer_compression_level = _ffi.new("double[1]")
+        pointer_compression_level[0] = compression_level
+        err = _snd.sf_command(self._file, _snd.SFC_SET_COMPRESSION_LEVEL, pointer_compression_level, _ffi.sizeof(pointer_compression_level))
+        if err != _snd.SF_TRUE:
+            err = _snd.sf_error(self._file)
+            raise LibsndfileError(err, f"Error set compression level {compression_level}")
+
+    def _set_vbr_quality(self, vbr_quality):
+        """Call libsndfile's set VBR encoding quality function."""
+        pointer_vbr_quality = _ffi.new("double[1]")
+        pointer_vbr_quality[0] = vbr_quality
+        err = _snd.sf_command(self._file, _snd.SFC_SET_VBR_ENCODING_QUALITY, pointer_vbr_quality, _ffi.sizeof(pointer_vbr_quality))
+        if err != _snd.SF_TRUE:
+            err = _snd.sf_error(self._file)
+            raise LibsndfileError(err, f"Error set VBR quality {vbr_quality}")
+
+    def _set_ogg_page_latency(self, latency):
+        """Call libsndfile's set Ogg page latency function."""
+        pointer_latency = _ffi.new("double[1]")
+        pointer_latency[0] = latency
+        # The return value is not meaningful for this command
+        _snd.sf_command(self._file, _snd.SFC_SET_OGG_PAGE_LATENCY_MS, pointer_latency, _ffi.sizeof(pointer_latency))
+        err = _snd.sf_error(self._file)
+        if err:
+            raise LibsndfileError(err, f"Error set Ogg page latency {latency}")
+
+
+class BackgroundWriter:
+    """Encode and write audio data on a background thread.
+
+    `write()` only copies the given data into a bounded queue, the
+    actual encoding (which can be expensive, e.g. for FLAC, OGG or MP3)
+    happens on a worker thread.  If the queue is full, `write()` blocks
+    until there is room again (see `queue_depth` for monitoring).
+
+    Errors raised on the worker thread are re-raised by the next call
+    to `write()`, `flush()` or `close()`.
+
+    The `SoundFile` must not be used directly while it is wrapped,
+    it is closed when the `BackgroundWriter` is closed.
+
+    Parameters
+    ----------
+    file : SoundFile
+        An open `SoundFile` (in a mode that allows writing).
+    maxsize : int, optional
+        The maximum number of blocks waiting to be written.
+
+    Examples
+    --------
+    >>> import soundfile as sf
+    >>> f = sf.SoundFile('recording.flac', 'w', 48000, 2)
+    >>> with sf.BackgroundWriter(f) as writer:
+    >>>     for block in capture():
+    >>>         writer.write(block)
+
+    """
+
+    def __init__(self, file: SoundFile, maxsize: int = 16) -> None:
+        import queue
+        self._thread = None
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        file._check_if_closed()
+        self._file = file
+        self._queue = queue.Queue(maxsize)
+        self._errors = []
+        self._error_reported = False
+        # The worker must not reference self, otherwise an unclosed
+        # writer would never be garbage-collected (and flushed).
+        self._thread = _threading.Thread(
+            target=_background_writer_worker,
+            args=(file, self._queue, self._errors),
+            name=f"BackgroundWriter({file.name!r})", daemon=True)
+        self._thread.start()
+
+    file = property(lambda self: self._file)
+    """The `SoundFile` which is written to."""
+    closed = property(lambda self: self._thread is None)
+    """Whether the writer (and its `SoundFile`) is closed."""
+
+    @property
+    def queue_depth(self) -> int:
+        """The number of blocks that are waiting to be written."""
+        return self._queue.qsize()
+
+    def __repr__(self) -> str:
+        return f"BackgroundWriter({self._file!r})"
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        self.close()
+
+    def write(self, data: AudioData, channels_first: bool = False) -> None:
+        """Copy audio data into the queue to be written in the background.
+
+        This blocks if the queue is full.
+
+        Parameters
+        ----------
+        data : array_like
+            See `SoundFile.write()`.
+        channels_first : bool, optional
+            *data* is given as (channels x frames), see
+            `SoundFile.write()`.
+
+        """
+        self._check_if_closed()
+        self._raise_error()
+        if channels_first:
+            data = _channel_arrays(data)
+            self._file._check_channel_arrays(data)
+            data = numpy.column_stack(data)
+        else:
+            data = numpy.array(data, order='C')
+        self._file._check_array(data)
+        self._queue.put(data)
+
+    def flush(self) -> None:
+        """Wait until all queued data is written and flush the file."""
+        self._check_if_closed()
+        self._queue.join()
+        self._raise_error()
+        self._file.flush()
+
+    def close(self) -> None:
+        """Write all queued data and close the file.
+
+        Can be called multiple times.
+
+        """
+        if self.closed:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        self._file.close()
+        if not self._error_reported:
+            self._raise_error()
+
+    def _raise_error(self):
+        if self._errors:
+            self._error_reported = True
+            raise self._errors[0]
+
+    def _check_if_closed(self):
+        if self.closed:
+            raise SoundFileRuntimeError("I/O operation on closed file")
+
+
+def _background_writer_worker(file, queue, errors):
+    """Write the queued blocks of a BackgroundWriter until None is queued.
+
+    The first error is appended to *errors*, later blocks are dropped.
+
+    """
+    while True:
+        data = queue.get()
+        try:
+            if data is None:
+                return
+            if not errors:
+                file.write(data)
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            queue.task_done()
+
+
+class RangeSource:
+    """A read-only file-like object which fetches byte ranges on demand.
+
+    This can be used as *file* argument of `SoundFile`, e.g. to read
+    from object storage with HTTP range requests.  Data is fetched in
+    blocks of *block_size* bytes and kept in an LRU cache, so that the
+    many small reads and seeks done by libsndfile (especially while
+    parsing the header) don't each cause a request.
+
+    When a block is missing, it is fetched together with up to
+    *read_ahead* following blocks in a single request.  The first block
+    (containing the header) and, with *prefetch_tail*, the last block
+    (some formats have trailing metadata chunks) are fetched when the
+    `RangeSource` is created.
+
+    Parameters
+    ----------
+    read_range : callable
+        ``read_range(offset, length)`` must return *length* bytes
+        starting at *offset* (or fewer at the end of the data).
+    size : int
+        The total size of the data in bytes.
+    block_size : int, optional
+        The size of the cached blocks in bytes.
+    cache_size : int, optional
+        The maximum number of cached blocks.
+    read_ahead : int, optional
+        The number of following blocks to fetch with a missing block.
+    prefetch_tail : bool, optional
+        Whether to fetch the last block up front.
+
+    Attributes
+    ----------
+    requests : int
+        The number of calls to *read_range*.
+    bytes_fetched : int
+        The number of bytes returned by *read_range*.
+
+    Examples
+    --------
+    >>> import requests
+    >>> import soundfile as sf
+    >>> def read_range(offset, length):
+    ...     headers = {'Range': f'bytes={offset}-{offset + length - 1}'}
+    ...     return requests.get(url, headers=headers).content
+    >>> size = int(requests.head(url).headers['Content-Length'])
+    >>> data, samplerate = sf.read(sf.RangeSource(read_range, size))
+
+    """
+
+    def __init__(self, read_range: Callable[[int, int], bytes], size: int,
+                 block_size: int = 65536, cache_size: int = 64,
+                 read_ahead: int = 3, prefetch_tail: bool = True) -> None:
+        from collections import OrderedDict
+        if size < 0:
+            raise ValueError("size must not be negative")
+        if block_size < 1:
+            raise ValueError("block_size must be at least 1")
+        if cache_size < 1 + read_ahead:
+            raise ValueError("cache_size must be larger than read_ahead")
+        if read_ahead < 0:
+            raise ValueError("read_ahead must not be negative")
+        self._read_range = read_range
+        self._size = size
+        self._block_size = block_size
+        self._cache_size = cache_size
+        self._read_ahead = read_ahead
+        self._cache = OrderedDict()
+        self._position = 0
+        self._closed = False
+        self.requests = 0
+        self.bytes_fetched = 0
+        last_block = (size - 1) // block_size
+        if size:
+            self._block(0)
+        if prefetch_tail and size and last_block not in self._cache:
+            self._fetch(last_block, 1)
+
+    size = property(lambda self: self._size)
+    """The total size of the data in bytes."""
+    closed = property(lambda self: self._closed)
+    """Whether the `RangeSource` is closed."""
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def writable(self) -> bool:
+        return False
+
+    def tell(self) -> int:
+        """Return the current position."""
+        self._check_if_closed()
+        return self._position
+
+    def seek(self, offset: int, whence: int = SEEK_SET) -> int:
+        """Change the current position and return the new position."""
+        self._check_if_closed()
+        if whence == SEEK_CUR:
+            offset += self._position
+        elif whence == SEEK_END:
+            offset += self._size
+        elif whence != SEEK_SET:
+            raise ValueError(f"Invalid whence: {whence!r}")
+        if offset < 0:
+            raise ValueError(f"Negative seek position: {offset}")
+        self._position = offset
+        return offset
+
+    def readinto(self, buffer) -> int:
+        """Read into a writable buffer and return the number of bytes."""
+        self._check_if_closed()
+        view = memoryview(buffer).cast('B')
+        count = max(0, min(len(view), self._size - self._position))
+        done = 0
+        while done < count:
+            index, offset = divmod(self._position + done, self._block_size)
+            block = self._block(index)
+            n = min(count - done, len(block) - offset)
+            if n <= 0:
+                break  # read_range() returned less than expected
+            view[done:done + n] = block[offset:offset + n]
+            done += n
+        self._position += done
+        return done
+
+    def read(self, size: int = -1) -> bytes:
+        """Read at most *size* bytes (everything if negative)."""
+        self._check_if_closed()
+        if size is None or size < 0:
+            size = max(0, self._size - self._position)
+        buffer = bytearray(min(size, max(0, self._size - self._position)))
+        return bytes(buffer[:self.readinto(buffer)])
+
+    def close(self) -> None:
+        """Release the cached blocks."""
+        self._cache.clear()
+        self._closed = True
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _block(self, index):
+        """Return a cached block, fetching it (and read-ahead) if needed."""
+        block = self._cache.get(index)
+        if block is None:
+            last_block = (self._size - 1) // self._block_size
+            count = 1
+            # fetch following blocks in the same request, up to the
+            # first one which is already cached
+            while (count <= self._read_ahead and
+                   index + count <= last_block and
+                   index + count not in self._cache):
+                count += 1
+            self._fetch(index, count)
+            block = self._cache[index]
+        else:
+            self._cache.move_to_end(index)
+        return block
+
+    def _fetch(self, index, count):
+        """Fetch *count* blocks with one call to read_range()."""
+        offset = index * self._block_size
+        length = min(count * self._block_size, self._size - offset)
+        data = memoryview(bytes(self._read_range(offset, length)))
+        self.requests += 1
+        self.bytes_fetched += len(data)
+        for i in range(count):
+            block = data[i * self._block_size:(i + 1) * self._block_size]
+            self._cache[index + i] = block
+            self._cache.move_to_end(index + i)
+        # the first block is used right away, keep it most recent
+        self._cache.move_to_end(index)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def _check_if_closed(self):
+        if self._closed:
+            raise ValueError("I/O operation on closed RangeSource")
+
+
+class EmbeddedSource:
+    """A read-only file-like view of a byte range of a larger file.
+
+    This can be used as *file* argument of `SoundFile` to read a sound
+    file which is stored inside another file, e.g. an uncompressed
+    member of a tar or zip archive (see `index_tar()` and
+    `index_zip()`), without extracting it.  Data is read with
+    ``os.preadv()`` (where available) directly into libsndfile's
+    buffers, so nothing is copied.
+
+    Parameters
+    ----------
+    file : str or int
+        The path or file descriptor of the containing file.  Several
+        `EmbeddedSource` objects can share one file descriptor, it is
+        not moved.
+    offset : int
+        The byte offset of the embedded file.
+    length : int, optional
+        The length of the embedded file in bytes, by default up to the
+        end of the containing file.
+    closefd : bool, optional
+        Whether to close the file descriptor on `close()`.  Files
+        opened by name are always closed.
+
+    Examples
+    --------
+    >>> import soundfile as sf
+    >>> index = sf.index_tar('clips.tar')
+    >>> with sf.SoundFile(sf.EmbeddedSource('clips.tar',
+    ...                                     *index['clip1.wav'])) as f:
+    ...     data = f.read()
+
+    """
+
+    _fd = None
+
+    def __init__(self, file: str | int | _os.PathLike[Any], offset: int,
+                 length: int | None = None, closefd: bool = False) -> None:
+        if isinstance(file, int):
+            self._fd = file
+            self._closefd = closefd
+        else:
+            self._fd = _os.open(file,
+                                _os.O_RDONLY | getattr(_os, 'O_BINARY', 0))
+            self._closefd = True
+        try:
+            size = _os.fstat(self._fd).st_size
+            if offset < 0 or offset > size:
+                raise ValueError(f"offset {offset} is outside of the file")
+            if length is None:
+                length = size - offset
+            elif length < 0 or offset + length > size:
+                raise ValueError(f"length {length} is outside of the file")
+        except BaseException:
+            self.close()
+            raise
+        self._name = file
+        self._offset = offset
+        self._length = length
+        self._position = 0
+
+    name = property(lambda self: self._name)
+    """The containing file."""
+    offset = property(lambda self: self._offset)
+    """The byte offset of the embedded file."""
+    length = property(lambda self: self._length)
+    """The length of the embedded file in bytes."""
+    closed = property(lambda self: self._fd is None)
+    """Whether the `EmbeddedSource` is closed."""
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def writable(self) -> bool:
+        return False
+
+    def tell(self) -> int:
+        """Return the current position within the embedded file."""
+        self._check_if_closed()
+        return self._position
+
+    def seek(self, offset: int, whence: int = SEEK_SET) -> int:
+        """Change the current position and return the new position."""
+        self._check_if_closed()
+        if whence == SEEK_CUR:
+            offset += self._position
+        elif whence == SEEK_END:
+            offset += self._length
+        elif whence != SEEK_SET:
+            raise ValueError(f"Invalid whence: {whence!r}")
+        if offset < 0:
+            raise ValueError(f"Negative seek position: {offset}")
+        self._position = offset
+        return offset
+
+    def readinto(self, buffer) -> int:
+        """Read into a writable buffer and return the number of bytes."""
+        self._check_if_closed()
+        view = memoryview(buffer).cast('B')
+        count = max(0, min(len(view), self._length - self._position))
+        position = self._offset + self._position
+        done = 0
+        while done < count:
+            chunk = view[done:count]
+            if hasattr(_os, 'preadv'):
+                n = _os.preadv(self._fd, [chunk], position + done)
+            else:
+                _os.lseek(self._fd, position + done, SEEK_SET)
+                data = _os.read(self._fd, len(chunk))
+                n = len(data)
+                chunk[:n] = data
+            if not n:
+                break  # the containing file was truncated
+            done += n
+        self._position += done
+        return done
+
+    def read(self, size: int = -1) -> bytes:
+        """Read at most *size* bytes (everything if negative)."""
+        self._check_if_closed()
+        remaining = max(0, self._length - self._position)
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        buffer = bytearray(size)
+        return bytes(buffer[:self.readinto(buffer)])
+
+    def close(self) -> None:
+        """Close the file descriptor (if it is owned)."""
+        if self._fd is not None:
+            if self._closefd:
+                _os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        self.close()
+
+    def _check_if_closed(self):
+        if self._fd is None:
+            raise ValueError("I/O operation on closed EmbeddedSource")
+
+
+def index_tar(file: str | _os.PathLike[Any] | BinaryIO) -> dict[str, tuple[int, int]]:
+    """Return the offset and length of all regular files in a tar archive.
+
+    The archive must not be compressed.  The result maps member names
+    to ``(offset, length)`` tuples, which can be used to open the
+    members with `EmbeddedSource`.
+
+    """
+    import tarfile
+    if isinstance(file, (str, _os.PathLike)):
+        archive = tarfile.open(file, 'r:')
+    else:
+        archive = tarfile.open(fileobj=file, mode='r:')
+    with archive:
+        return {member.name: (member.offset_data, member.size)
+                for member in archive
+                if member.isreg() and not member.issparse()}
+
+
+def index_zip(file: str | _os.PathLike[Any] | BinaryIO) -> dict[str, tuple[int, int]]:
+    """Return the offset and length of all stored members of a zip file.
+
+    Only members which are stored without compression (and without
+    encryption) can be read in place, all other members are omitted.
+    The result maps member names to ``(offset, length)`` tuples, which
+    can be used to open the members with `EmbeddedSource`.
+
+    """
+    import struct
+    import zipfile
+    index = {}
+    with zipfile.ZipFile(file) as archive:
+        fileobj = archive.fp
+        for member in archive.infolist():
+            if (member.compress_type != zipfile.ZIP_STORED or
+                    member.flag_bits & 0x1 or member.is_dir()):
+                continue
+            # the data follows the local header, whose name and extra
+            # field may differ from the central directory
+            fileobj.seek(member.header_offset)
+            header = fileobj.read(30)
+            if header[:4] != b'PK\x03\x04':
+                raise ValueError(f"Invalid local header for {member.filename!r}")
+            name_length, extra_length = struct.unpack('<HH', header[26:30])
+            offset = member.header_offset + 30 + name_length + extra_length
+            index[member.filename] = offset, member.file_size
+    return index
+
+
+class ShardEntry:
+    """The index entry of a clip in a shard, see `ShardReader`.
+
+    Attributes
+    ----------
+    key : str
+        The name of the clip.
+    offset, length : int
+        The byte range of the clip in the shard.
+    samplerate, channels, frames : int
+        The properties of the clip.
+
+    """
+
+    def __init__(self, key, offset, length, samplerate, channels, frames):
+        self.key: str = key
+        self.offset: int = offset
+        self.length: int = length
+        self.samplerate: int = samplerate
+        self.channels: int = channels
+        self.frames: int = frames
+
+    def __repr__(self) -> str:
+        return (f"ShardEntry({self.key!r}, offset={self.offset}, "
+                f"length={self.length}, samplerate={self.samplerate}, "
+                f"channels={self.channels}, frames={self.frames})")
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ShardEntry):
+            return NotImplemented
+        return vars(self) == vars(other)
+
+
+_shard_magic = b'SFSHARD1'
+_shard_entry = '<QQIHQH'  # offset, length, samplerate, channels, frames,
+                          # key length (followed by the UTF-8 encoded key)
+_shard_max_key_length = 0xFFFF
+
+
+def _shard_index_name(shard, index):
+    if index is not None:
+        return index
+    return _os.fspath(shard) + '.index'
+
+
+def _read_shard_index(filename):
+    """Return a dict of ShardEntry objects read from an index file.
+
+    Additionally, return the size of the complete entries, an entry
+    which was not written completely (e.g. after a crash) is ignored.
+
+    """
+    import struct
+    entry_size = struct.calcsize(_shard_entry)
+    with open(filename, 'rb') as f:
+        content = f.read()
+    if content[:len(_shard_magic)] != _shard_magic:
+        raise ValueError(f"Not a shard index: {filename!r}")
+    entries = {}
+    position = len(_shard_magic)
+    while position + entry_size <= len(content):
+        *values, key_length = struct.unpack_from(_shard_entry, content,
+                                                 position)
+        end = position + entry_size + key_length
+        if end > len(content):
+            break
+        key = content[position + entry_size:end].decode('utf-8')
+        entries[key] = ShardEntry(key, *values)
+        position = end
+    return entries, position
+
+
+def _pack_shard_entry(entry):
+    import struct
+    key = entry.key.encode('utf-8')
+    return struct.pack(_shard_entry, entry.offset, entry.length,
+                       entry.samplerate, entry.channels, entry.frames,
+                       len(key)) + key
+
+
+class ShardWriter:
+    """Pack many sound files into one large shard file.
+
+    Each clip is encoded with `SoundFile` directly into the shard, one
+    after the other.  A compact binary index with the byte range,
+    sample rate, channels and frames of each clip is written to a
+    separate file.  Each entry is appended and flushed (after the clip
+    itself) by `add()`, so the clips written before a crash can still
+    be opened.  Use `ShardReader` to open the clips again.
+
+    Parameters
+    ----------
+    file : str or path-like
+        The name of the shard file.
+    mode : {'w', 'x', 'a'}, optional
+        Whether to create a new shard (``'w'`` overwrites an existing
+        one) or to append to an existing shard and its index.
+    format : str, optional
+        The major format of the clips, see `available_formats()`.
+    index : str or path-like, optional
+        The name of the index file, by default the name of the shard
+        with ``'.index'`` appended.
+    **kwargs
+        Default arguments for `add()`, e.g. *subtype*.
+
+    Examples
+    --------
+    >>> import soundfile as sf
+    >>> with sf.ShardWriter('clips.shard', format='FLAC') as shard:
+    ...     for i, clip in enumerate(clips):
+    ...         shard.add(f'clip{i}', clip, 16000)
+
+    """
+
+    def __init__(self, file: str | _os.PathLike[Any], mode: str = 'w',
+                 format: str = 'WAV', index: str | _os.PathLike[Any] | None = None,
+                 **kwargs: Any) -> None:
+        if mode not in ('w', 'x', 'a'):
+            raise ValueError(f"Invalid mode: {mode!r}")
+        _check_format(format)
+        self._index_name = _shard_index_name(file, index)
+        self._entries = {}
+        created_index = not (mode == 'a' and
+                             _os.path.exists(self._index_name))
+        if created_index:
+            self._index = open(self._index_name, 'wb' if mode == 'a'
+                               else mode + 'b')
+            self._index.write(_shard_magic)
+            self._index.flush()
+        else:
+            self._entries, size = _read_shard_index(self._index_name)
+            self._index = open(self._index_name, 'r+b')
+            self._index.truncate(size)
+            self._index.seek(size)
+        try:
+            # not 'ab', clips must be able to seek back to their header
+            if mode != 'a':
+                self._file = open(file, mode + 'b')
+            elif _os.path.exists(file):
+                self._file = open(file, 'r+b')
+            else:
+                self._file = open(file, 'w+b')
+        except BaseException:
+            self._index.close()
+            if created_index:
+                _os.remove(self._index_name)
+            raise
+        self._name = file
+        self._format = format
+        self._kwargs = kwargs
+        # a clip which is not in the index (e.g. after a crash) is dropped
+        self._end = max((entry.offset + entry.length
+                         for entry in self._entries.values()), default=0)
+        self._file.truncate(self._end)
+
+    name = property(lambda self: self._name)
+    """The name of the shard file."""
+    closed = property(lambda self: self._file is None)
+    """Whether the shard is closed."""
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def add(self, key: str, data: AudioData, samplerate: int,
+            channels_first: bool = False, **kwargs: Any) -> ShardEntry:
+        """Encode a clip and append it to the shard.
+
+        Parameters
+        ----------
+        key : str
+            A unique name of the clip.
+        data : array_like
+            The audio data, see `write()`.
+        samplerate : int
+            The sample rate of the audio data.
+        channels_first : bool, optional
+            *data* is given as (channels x frames), see `write()`.
+        **kwargs
+            Further arguments for `SoundFile`, e.g. *subtype*.  These
+            take precedence over the ones given to `ShardWriter`.
+
+        Returns
+        -------
+        ShardEntry
+            The index entry of the new clip.
+
+        """
+        self._check_if_closed()
+        if key in self._entries:
+            raise ValueError(f"Duplicate key: {key!r}")
+        if len(key.encode('utf-8')) > _shard_max_key_length:
+            raise ValueError(f"Keys must not be longer than "
+                             f"{_shard_max_key_length} bytes (UTF-8)")
+        data, channels = _data_channels(data, channels_first)
+        options = dict(self._kwargs, **kwargs)
+        options.setdefault('format', self._format)
+        member = _ShardMember(self._file, self._end)
+        try:
+            with SoundFile(member, 'w', samplerate, channels,
+                           **options) as f:
+                f.write(data, channels_first)
+                frames = f.frames
+        except BaseException:
+            # discard the partially written clip
+            self._file.truncate(self._end)
+            raise
+        entry = ShardEntry(key, self._end, member.length, samplerate,
+                           channels, frames)
+        # the clip must be complete before it is listed in the index:
+        self._file.flush()
+        self._index.write(_pack_shard_entry(entry))
+        self._index.flush()
+        self._entries[key] = entry
+        self._end += member.length
+        return entry
+
+    def close(self) -> None:
+        """Close the shard and its index."""
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        self._index.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _check_if_closed(self):
+        if self._file is None:
+            raise SoundFileRuntimeError("I/O operation on closed shard")
+
+
+class _ShardMember:
+    """File-like object for writing one clip at an offset of a shard."""
+
+    def __init__(self, file, offset):
+        self._file = file
+        self._offset = offset
+        self._position = 0
+        self.length = 0
+
+    def seek(self, offset, whence=SEEK_SET):
+        if whence == SEEK_CUR:
+            offset += self._position
+        elif whence == SEEK_END:
+            offset += self.length
+        self._position = offset
+        return offset
+
+    def tell(self):
+        return self._position
+
+    def write(self, data):
+        self._file.seek(self._offset + self._position)
+        written = self._file.write(data)
+        self._position += written
+        self.length = max(self.length, self._position)
+        return written
+
+
+class ShardReader:
+    """Open the clips of a shard written with `ShardWriter`.
+
+    The index is loaded once, so opening a clip only takes a dictionary
+    lookup and parsing its header.  All clips are read through the same
+    file descriptor with `EmbeddedSource`.
+
+    Parameters
+    ----------
+    file : str or path-like
+        The name of the shard file.
+    index : str or path-like, optional
+        The name of the index file, by default the name of the shard
+        with ``'.index'`` appended.
+
+    Examples
+    --------
+    >>> import soundfile as sf
+    >>> with sf.ShardReader('clips.shard') as shard:
+    ...     data, samplerate = shard.read('clip42')
+
+    """
+
+    def __init__(self, file: str | _os.PathLike[Any],
+                 index: str | _os.PathLike[Any] | None = None) -> None:
+        self._entries, _ = _read_shard_index(_shard_index_name(file, index))
+        self._name = file
+        self._fd = _os.open(file, _os.O_RDONLY | getattr(_os, 'O_BINARY', 0))
+
+    name = property(lambda self: self._name)
+    """The name of the shard file."""
+    closed = property(lambda self: self._fd is None)
+    """Whether the shard is closed."""
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def keys(self):
+        """Return the keys of all clips."""
+        return self._entries.keys()
+
+    def entry(self, key: str) -> ShardEntry:
+        """Return the index entry of a clip."""
+        return self._entries[key]
+
+    def open(self, key: str, **kwargs: Any) -> SoundFile:
+        """Return a `SoundFile` for reading a clip.
+
+        *kwargs* are passed to `SoundFile`.
+
+        """
+        self._check_if_closed()
+        entry = self._entries[key]
+        source = EmbeddedSource(self._fd, entry.offset, entry.length)
+        return SoundFile(source, 'r', **kwargs)
+
+    def read(self, key: str, **kwargs: Any) -> tuple[AudioData, int]:
+        """Read a whole clip and return its data and sample rate.
+
+        *kwargs* are passed to `SoundFile.read()`.
+
+        """
+        with self.open(key) as f:
+            return f.read(**kwargs), f.samplerate
+
+    def close(self) -> None:
+        """Close the shard file."""
+        if self._fd is not None:
+            _os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _check_if_closed(self):
+        if self._fd is None:
+            raise SoundFileRuntimeError("I/O operation on closed shard")
+
+
+def _error_check(err, prefix=""):
+    """Raise LibsndfileError if there is an error."""
+    if err != 0:
+        raise LibsndfileError(err, prefix=prefix)
+
+
+def _set_char_array(struct, name, value):
+    """Set a char array field of a struct and check the length."""
+    size = len(getattr(struct, name))
+    if len(value) > size:
+        raise ValueError(f"{name} must not be longer than {size} bytes")
+    setattr(struct, name, value)
+
+
+def _format_int(format, subtype, endian):
+    """Return numeric ID for given format|subtype|endian combo."""
+    result = _check_format(format)
+    if subtype is None:
+        subtype = default_subtype(format)
+        if subtype is None:
+            raise TypeError(
+                f"No default subtype for major format {format!r}")
+    elif not isinstance(subtype, str):
+        raise TypeError(f"Invalid subtype: {subtype!r}")
+    try:
+        result |= _subtypes[subtype.upper()]
+    except KeyError:
+        raise ValueError(f"Unknown subtype: {subtype!r}")
+    if endian is None:
+        endian = 'FILE'
+    elif not isinstance(endian, str):
+        raise TypeError(f"Invalid endian-ness: {endian!r}")
+    try:
+        result |= _endians[endian.upper()]
+    except KeyError:
+        raise ValueError(f"Unknown endian-ness: {endian!r}")
+
+    info = _ffi.new("SF_INFO*")
     info.format = result
     info.channels = 1
     if _snd.sf_format_check(info) == _snd.SF_FALSE:
@@ -1544,6 +5307,77 @@ def _format_int(format, subtype, endian):
     return result
 
 
+def _check_update_header(update_header):
+    """Check update_header argument and return it."""
+    if isinstance(update_header, bool):
+        return update_header
+    if not isinstance(update_header, (int, float)) or update_header <= 0:
+        raise ValueError(f"update_header must be a bool or a positive "
+                         f"number of seconds, not {update_header!r}")
+    return update_header
+
+
+def _check_vbr_quality(vbr_quality):
+    """Check vbr_quality argument before opening the file."""
+    if not (0 <= vbr_quality <= 1):
+        raise ValueError("VBR quality must be in range [0..1]")
+
+
+def _check_ogg_page_latency(latency, mode, info):
+    """Check ogg_page_latency argument before opening the file."""
+    if 'r' in mode:
+        raise ValueError("ogg_page_latency can only be used for new files")
+    if info.format & _snd.SF_FORMAT_TYPEMASK != _formats['OGG']:
+        raise ValueError("ogg_page_latency is only supported for OGG files")
+    if not isinstance(latency, (int, float)) or latency <= 0:
+        raise ValueError(f"ogg_page_latency must be a positive number of "
+                         f"milliseconds, not {latency!r}")
+
+
+def _channel_arrays(data):
+    """Return a list of 1-D arrays from (channels x frames) data."""
+    if isinstance(data, numpy.ndarray):
+        if data.ndim != 2:
+            raise ValueError(f"Invalid shape: {data.shape!r} (channels_first "
+                             f"data must be two-dimensional)")
+        return list(data)
+    channels = [numpy.asarray(channel) for channel in data]
+    if not channels or any(channel.ndim != 1 for channel in channels):
+        raise ValueError("channels_first data must be a non-empty sequence "
+                         "of one-dimensional arrays")
+    return channels
+
+
+def _data_channels(data, channels_first=False):
+    """Return data (as array(s)) and its number of channels."""
+    if channels_first:
+        data = _channel_arrays(data)
+        return data, len(data)
+    data = numpy.asarray(data)
+    return data, 1 if data.ndim == 1 else data.shape[1]
+
+
+def _rewind_function(file):
+    """Return a function which restores the current position of file.
+
+    Named files are reopened anyway, ``None`` is returned for file
+    descriptors and file-like objects which are not seekable.
+
+    """
+    if isinstance(file, (str, bytes)):
+        return lambda: None
+    try:
+        if isinstance(file, int):
+            position = _os.lseek(file, 0, SEEK_CUR)
+            return lambda: _os.lseek(file, position, SEEK_SET)
+        if hasattr(file, 'seekable') and not file.seekable():
+            return None
+        position = file.tell()
+    except (OSError, ValueError, AttributeError):
+        return None
+    return lambda: file.seek(position, SEEK_SET)
+
+
 def _check_mode(mode):
     """Check if mode is valid and return its integer representation."""
     if not isinstance(mode, str):
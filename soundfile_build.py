@@ -16,19 +16,52 @@ enum
 {
     SFC_GET_LIB_VERSION             = 0x1000,
     SFC_GET_LOG_INFO                = 0x1001,
+
+    SFC_GET_NORM_DOUBLE             = 0x1010,
+    SFC_GET_NORM_FLOAT              = 0x1011,
+    SFC_SET_NORM_DOUBLE             = 0x1012,
+    SFC_SET_NORM_FLOAT              = 0x1013,
+
     SFC_GET_FORMAT_INFO             = 0x1028,
 
     SFC_GET_FORMAT_MAJOR_COUNT      = 0x1030,
     SFC_GET_FORMAT_MAJOR            = 0x1031,
     SFC_GET_FORMAT_SUBTYPE_COUNT    = 0x1032,
     SFC_GET_FORMAT_SUBTYPE          = 0x1033,
+
+    SFC_CALC_SIGNAL_MAX             = 0x1040,
+    SFC_CALC_NORM_SIGNAL_MAX        = 0x1041,
+    SFC_CALC_MAX_ALL_CHANNELS       = 0x1042,
+    SFC_CALC_NORM_MAX_ALL_CHANNELS  = 0x1043,
+    SFC_GET_SIGNAL_MAX              = 0x1044,
+    SFC_GET_MAX_ALL_CHANNELS        = 0x1045,
+
+    SFC_SET_ADD_PEAK_CHUNK          = 0x1050,
+
+    SFC_UPDATE_HEADER_NOW           = 0x1060,
+    SFC_SET_UPDATE_HEADER_AUTO      = 0x1061,
+
     SFC_FILE_TRUNCATE               = 0x1080,
+    SFC_GET_EMBED_FILE_INFO         = 0x10B0,
     SFC_SET_CLIPPING                = 0x10C0,
+    SFC_GET_CLIPPING                = 0x10C1,
+
+    SFC_GET_CUE_COUNT               = 0x10CD,
+    SFC_GET_CUE                     = 0x10CE,
+    SFC_SET_CUE                     = 0x10CF,
+
+    SFC_GET_INSTRUMENT              = 0x10D0,
+    SFC_SET_INSTRUMENT              = 0x10D1,
+
+    SFC_GET_BROADCAST_INFO          = 0x10F0,
+    SFC_SET_BROADCAST_INFO          = 0x10F1,
 
     SFC_SET_SCALE_FLOAT_INT_READ    = 0x1014,
     SFC_SET_SCALE_INT_FLOAT_WRITE   = 0x1015,
                 
+    SFC_SET_VBR_ENCODING_QUALITY    = 0x1300,
     SFC_SET_COMPRESSION_LEVEL		= 0x1301,
+    SFC_SET_OGG_PAGE_LATENCY_MS     = 0x1302,
 	SFC_SET_BITRATE_MODE			= 0x1305,
 } ;
 
@@ -46,6 +79,12 @@ enum
     SF_BITRATE_MODE_CONSTANT    = 0,
     SF_BITRATE_MODE_AVERAGE     = 1,
     SF_BITRATE_MODE_VARIABLE    = 2,
+
+    /* Loop modes of SF_INSTRUMENT. */
+    SF_LOOP_NONE                = 800,
+    SF_LOOP_FORWARD             = 801,
+    SF_LOOP_BACKWARD            = 802,
+    SF_LOOP_ALTERNATING         = 803,
 } ;
 
 typedef int64_t sf_count_t ;
@@ -110,6 +149,83 @@ const char* sf_get_string    (SNDFILE *sndfile, int str_type) ;
 int         sf_set_string    (SNDFILE *sndfile, int str_type, const char* str) ;
 const char * sf_version_string (void) ;
 
+/* Note: In sndfile.h, the following structs have fixed-size arrays for
+         cue points and the coding history, here they are declared as
+         variable-length to allow any number of items.
+         The small integer fields of SF_INSTRUMENT are declared as "signed
+         char" instead of "char" to get Python integers. */
+typedef struct
+{   int32_t     indx ;
+    uint32_t    position ;
+    int32_t     fcc_chunk ;
+    int32_t     chunk_start ;
+    int32_t     block_start ;
+    uint32_t    sample_offset ;
+    char        name [256] ;
+} SF_CUE_POINT ;
+
+typedef struct
+{   uint32_t        cue_count ;
+    SF_CUE_POINT    cue_points [] ;
+} SF_CUES ;
+
+typedef struct
+{   int gain ;
+    signed char basenote, detune ;
+    signed char velocity_lo, velocity_hi ;
+    signed char key_lo, key_hi ;
+    int loop_count ;
+
+    struct
+    {   int mode ;
+        uint32_t start ;
+        uint32_t end ;
+        uint32_t count ;
+    } loops [16] ;
+} SF_INSTRUMENT ;
+
+typedef struct
+{   char        description [256] ;
+    char        originator [32] ;
+    char        originator_reference [32] ;
+    char        origination_date [10] ;
+    char        origination_time [8] ;
+    uint32_t    time_reference_low ;
+    uint32_t    time_reference_high ;
+    short       version ;
+    char        umid [64] ;
+    int16_t     loudness_value ;
+    int16_t     loudness_range ;
+    int16_t     max_true_peak_level ;
+    int16_t     max_momentary_loudness ;
+    int16_t     max_shortterm_loudness ;
+    char        reserved [180] ;
+    uint32_t    coding_history_size ;
+    char        coding_history [] ;
+} SF_BROADCAST_INFO ;
+
+typedef struct
+{   sf_count_t  offset ;
+    sf_count_t  length ;
+} SF_EMBED_FILE_INFO ;
+
+typedef struct SF_CHUNK_INFO
+{   char        id [64] ;   /* The chunk identifier. */
+    unsigned    id_size ;   /* The size of the chunk identifier. */
+    unsigned    datalen ;   /* The size of that data. */
+    void        *data ;     /* Pointer to the data. */
+} SF_CHUNK_INFO ;
+
+typedef struct SF_CHUNK_ITERATOR SF_CHUNK_ITERATOR ;
+
+int         sf_set_chunk     (SNDFILE *sndfile, const SF_CHUNK_INFO *chunk_info) ;
+
+SF_CHUNK_ITERATOR * sf_get_chunk_iterator (SNDFILE *sndfile, const SF_CHUNK_INFO *chunk_info) ;
+SF_CHUNK_ITERATOR * sf_next_chunk_iterator (SF_CHUNK_ITERATOR *iterator) ;
+
+int         sf_get_chunk_size (const SF_CHUNK_ITERATOR *it, SF_CHUNK_INFO *chunk_info) ;
+int         sf_get_chunk_data (const SF_CHUNK_ITERATOR *it, SF_CHUNK_INFO *chunk_info) ;
+
 typedef sf_count_t  (*sf_vio_get_filelen) (void *user_data) ;
 typedef sf_count_t  (*sf_vio_seek)        (sf_count_t offset, int whence, void *user_data) ;
 typedef sf_count_t  (*sf_vio_read)        (void *ptr, sf_count_t count, void *user_data) ;
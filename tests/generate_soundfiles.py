@@ -1,6 +1,13 @@
 #!/usr/bin/env python
+"""Create the test files in the current directory.
 
+Use ``--benchmarks DIRECTORY`` to also create the (larger) files used
+by the benchmarks.
+
+"""
+import os
 import struct
+import sys
 
 
 def uint32(number):
@@ -65,11 +72,61 @@ stereo_data = (
     stereo_raw
 )
 
-with open('stereo.wav', 'wb') as f:
-    f.write(stereo_data)
+# Larger files for the benchmarks in ../benchmarks/, as (format, subtype):
+benchmark_formats = [
+    ('WAV', 'PCM_16'),
+    ('WAV', 'PCM_24'),
+    ('WAV', 'FLOAT'),
+    ('FLAC', 'PCM_16'),
+    ('OGG', 'VORBIS'),
+]
+
+
+def benchmark_filename(directory, format, subtype, channels=2):
+    extension = {'OGG': 'ogg', 'FLAC': 'flac'}.get(format, 'wav')
+    name = 'bench_{}_{}_{}ch.{}'.format(format, subtype, channels, extension)
+    return os.path.join(directory, name.lower())
+
+
+def generate_benchmark_files(directory, seconds=10, samplerate=44100,
+                             channels=2):
+    """Create (or re-use) the benchmark files in *directory*.
+
+    This needs NumPy and the soundfile module.  The audio data is
+    deterministic, so that results are comparable across runs.
+
+    Returns a dict mapping (format, subtype) to file names.
+
+    """
+    import numpy as np
+    import soundfile as sf
+
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    t = np.arange(seconds * samplerate) / samplerate
+    rng = np.random.default_rng(0)
+    data = np.empty((len(t), channels))
+    for channel in range(channels):
+        data[:, channel] = 0.5 * np.sin(2 * np.pi * 440 * (channel + 1) * t)
+    data += rng.uniform(-0.1, 0.1, data.shape)
+    filenames = {}
+    for format, subtype in benchmark_formats:
+        filename = benchmark_filename(directory, format, subtype, channels)
+        if not os.path.exists(filename):
+            sf.write(filename, data, samplerate, subtype, format=format)
+        filenames[format, subtype] = filename
+    return filenames
+
+
+if __name__ == '__main__':
+    with open('stereo.wav', 'wb') as f:
+        f.write(stereo_data)
+
+    with open('mono.wav', 'wb') as f:
+        f.write(mono_data)
 
-with open('mono.wav', 'wb') as f:
-    f.write(mono_data)
+    with open('mono.raw', 'wb') as f:
+        f.write(mono_raw)
 
-with open('mono.raw', 'wb') as f:
-    f.write(mono_raw)
+    if '--benchmarks' in sys.argv:
+        generate_benchmark_files(sys.argv[sys.argv.index('--benchmarks') + 1])
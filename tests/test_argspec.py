@@ -32,6 +32,11 @@ def test_read_defaults():
     del init_defaults['mode']  # mode is always 'r'
     del init_defaults['compression_level'] # only write()
     del init_defaults['bitrate_mode'] # only write()
+    del init_defaults['scale_int_float_write'] # only write()
+    del init_defaults['update_header'] # only SoundFile
+    del init_defaults['add_peak_chunk'] # only write()
+    del init_defaults['vbr_quality'] # only write()
+    del init_defaults['ogg_page_latency'] # only write()
 
     del func_defaults['start']
     del func_defaults['stop']
@@ -47,15 +52,29 @@ def test_write_defaults():
     write_defaults = defaults(sf.write)
     init_defaults = defaults(sf.SoundFile.__init__)
 
+    # Same default value as SoundFile.write():
+    write_defaults = remove_items(write_defaults,
+                                  defaults(sf.SoundFile.write))
+
     # Same default values as SoundFile.__init__()
     init_defaults = remove_items(init_defaults, write_defaults)
 
     del init_defaults['mode']  # mode is always 'x' or 'w'
     del init_defaults['channels']  # Inferred from data
     del init_defaults['samplerate']  # Obligatory in write()
+    del init_defaults['scale_float_int_read']  # only read()
+    del init_defaults['update_header']  # only SoundFile
     assert not init_defaults  # No more arguments should be left
 
 
+def test_write_stream_defaults():
+    stream_defaults = defaults(sf.write_stream)
+    write_defaults = defaults(sf.write)
+
+    del stream_defaults['min_blocksize']  # only write_stream()
+    assert stream_defaults == write_defaults
+
+
 def test_if_blocks_function_and_method_have_same_defaults():
     func_defaults = defaults(sf.blocks)
     meth_defaults = defaults(sf.SoundFile.blocks)
@@ -63,6 +82,11 @@ def test_if_blocks_function_and_method_have_same_defaults():
 
     del init_defaults['compression_level'] # only write()
     del init_defaults['bitrate_mode'] # only write()
+    del init_defaults['scale_int_float_write'] # only write()
+    del init_defaults['update_header'] # only SoundFile
+    del init_defaults['add_peak_chunk'] # only write()
+    del init_defaults['vbr_quality'] # only write()
+    del init_defaults['ogg_page_latency'] # only write()
 
     del func_defaults['start']
     del func_defaults['stop']
@@ -81,4 +105,6 @@ def test_order_of_blocks_arguments():
     meth_args = list(signature(sf.SoundFile.blocks).parameters)[1:]
     meth_args[3:3] = ['start', 'stop']
     func_args = list(signature(sf.blocks).parameters)
-    assert func_args[:10] == ['file'] + meth_args
+    assert func_args[:10] == ['file'] + meth_args[:9]
+    # Newer arguments are appended after the SoundFile arguments:
+    assert func_args[len(func_args) - len(meth_args[9:]):] == meth_args[9:]
@@ -9,6 +9,7 @@ import sys
 import gc
 import weakref
 import threading
+import time
 
 # floating point data is typically limited to the interval [-1.0, 1.0],
 # but smaller/larger values are supported as well
@@ -245,6 +246,84 @@ def test_read_non_existing_file():
     assert "Error opening 'i_do_not_exist.wav'" in str(excinfo.value)
 
 
+@pytest.fixture
+def batch_files(tmp_path):
+    clips = [np.arange(10 * i, dtype='int16').reshape(-1, 2) for i in (3, 1, 5)]
+    filenames = [str(tmp_path / f'clip{i}.wav') for i in range(len(clips))]
+    for filename, clip in zip(filenames, clips):
+        sf.write(filename, clip, 8000, subtype='PCM_16')
+    return filenames, clips
+
+
+@pytest.mark.parametrize('workers', [None, 2])
+def test_read_batch(batch_files, workers):
+    filenames, clips = batch_files
+    data, lengths = sf.read_batch(filenames, dtype='int16', pad_value=-1,
+                                  workers=workers)
+    assert data.shape == (3, 25, 2)
+    assert list(lengths) == [15, 5, 25]
+    for item, clip in zip(data, clips):
+        assert np.all(item[:len(clip)] == clip)
+        assert np.all(item[len(clip):] == -1)
+
+
+def test_read_batch_planar_with_offsets(batch_files):
+    filenames, clips = batch_files
+    data, lengths = sf.read_batch(filenames, frames=10, dtype='int16',
+                                  planar=True, offsets=[10, 0, 2])
+    assert data.shape == (3, 2, 10)
+    assert list(lengths) == [5, 5, 10]
+    assert np.all(data[0, :, :5] == clips[0][10:].T)
+    assert np.all(data[0, :, 5:] == 0)
+    assert np.all(data[2] == clips[2][2:12].T)
+
+
+def test_read_batch_random_crop(batch_files):
+    filenames, clips = batch_files
+    data, lengths = sf.read_batch(filenames, frames=4, dtype='int16',
+                                  random_crop=True, rng=42)
+    assert list(lengths) == [4, 4, 4]
+    for item, clip in zip(data, clips):
+        offset = item[0, 0] // 2
+        assert np.all(item == clip[offset:offset + 4])
+    again, _ = sf.read_batch(filenames, frames=4, dtype='int16',
+                             random_crop=True, rng=42)
+    assert np.all(data == again)
+
+
+def test_read_batch_opens_one_file_at_a_time(batch_files, monkeypatch):
+    filenames, clips = batch_files
+    instances = []
+    max_open = []
+    original_init = sf.SoundFile.__init__
+
+    def init(self, *args, **kwargs):
+        max_open.append(sum(not f.closed for f in instances))
+        original_init(self, *args, **kwargs)
+        instances.append(self)
+
+    monkeypatch.setattr(sf.SoundFile, '__init__', init)
+    with open(filenames[1], 'rb') as fobj:
+        data, lengths = sf.read_batch(filenames + [fobj], dtype='int16')
+    assert list(lengths) == [15, 5, 25, 5]
+    assert np.all(data[3, :5] == clips[1])
+    # the file object stays open, but only one named file is open
+    assert max(max_open) <= 2
+    assert all(f.closed for f in instances)
+
+
+def test_read_batch_errors(batch_files):
+    filenames, _ = batch_files
+    with pytest.raises(ValueError):
+        sf.read_batch(filenames + [filename_mono])
+    with pytest.raises(ValueError):
+        sf.read_batch(filenames, offsets=[0, 0])
+    with pytest.raises(ValueError):
+        sf.read_batch(filenames, offsets=[0, 0, 0], random_crop=True)
+    with pytest.raises(ValueError):
+        sf.read_batch([])
+
+
 
 # -----------------------------------------------------------------------------
 # Test write() function
@@ -295,6 +374,68 @@ def test_write_int_data_to_float_file(file_inmemory):
     assert fs == 44100
 
 
+@pytest.mark.parametrize('data', [
+    np.arange(40, dtype='int16').reshape(-1, 4)[:, ::2],
+    np.arange(20, dtype='int16').reshape(2, -1).T,
+    np.asfortranarray(np.arange(20, dtype='int16').reshape(-1, 2)),
+])
+def test_write_non_contiguous_data(file_inmemory, data):
+    assert not data.flags.c_contiguous
+    sf.write(file_inmemory, data, 44100, format='WAV', subtype='PCM_16')
+    file_inmemory.seek(0)
+    read, fs = sf.read(file_inmemory, dtype='int16')
+    assert np.all(read == data)
+
+
+def test_write_non_contiguous_mono_data_in_blocks(file_inmemory):
+    data = np.arange(100000, dtype='int32')[::2]
+    sf.write(file_inmemory, data, 44100, format='WAV', subtype='PCM_32')
+    file_inmemory.seek(0)
+    read, fs = sf.read(file_inmemory, dtype='int32')
+    assert np.all(read == data)
+
+
+def test_write_list_of_channels(file_inmemory):
+    left = np.arange(20000, dtype='int16')
+    right = -left.astype('int32')
+    sf.write(file_inmemory, [left, right], 44100, format='WAV',
+             subtype='PCM_32', channels_first=True)
+    file_inmemory.seek(0)
+    read, fs = sf.read(file_inmemory, dtype='int32')
+    assert np.all(read == np.column_stack([left, right]))
+
+
+def test_write_channels_first_array(file_inmemory):
+    data = np.arange(20, dtype='int16').reshape(2, -1)
+    sf.write(file_inmemory, data, 44100, format='WAV', subtype='PCM_16',
+             channels_first=True)
+    file_inmemory.seek(0)
+    read, fs = sf.read(file_inmemory, dtype='int16')
+    assert np.all(read == data.T)
+
+
+def test_write_list_of_arrays_is_frames_by_default(file_inmemory):
+    rows = [np.array([1, 2, 3], dtype='int16'),
+            np.array([4, 5, 6], dtype='int16')]
+    sf.write(file_inmemory, rows, 44100, format='WAV', subtype='PCM_16')
+    file_inmemory.seek(0)
+    read, fs = sf.read(file_inmemory, dtype='int16')
+    assert np.all(read == np.array(rows))
+
+
+def test_write_list_of_channels_errors(file_inmemory):
+    with sf.SoundFile(file_inmemory, 'w', 44100, 2, format='WAV') as f:
+        with pytest.raises(ValueError):
+            f.write([np.zeros(10), np.zeros(11)], channels_first=True)
+        with pytest.raises(ValueError):
+            f.write([np.zeros(10)] * 3, channels_first=True)
+        with pytest.raises(ValueError):
+            f.write([np.zeros(10, 'int8')] * 2, channels_first=True)
+        with pytest.raises(ValueError):
+            f.write(np.zeros(10), channels_first=True)
+        assert f.frames == 0
+
+
 @pytest.mark.parametrize("filename", ["wav", ".wav", "wav.py"])
 def test_write_with_unknown_extension(filename):
     with pytest.raises(TypeError) as excinfo:
@@ -357,6 +498,501 @@ def test_write_flac_compression():
     assert high_compression_size < low_compression_size
 
 
+def test_write_vbr_quality():
+    data = np.random.uniform(-0.5, 0.5, (48000, 1))
+    sizes = []
+    for quality in 0.0, 1.0:
+        fobj = io.BytesIO()
+        sf.write(fobj, data, 48000, format='OGG', subtype='VORBIS',
+                 vbr_quality=quality)
+        sizes.append(len(fobj.getvalue()))
+    low_quality_size, high_quality_size = sizes
+    assert low_quality_size < high_quality_size
+
+    with pytest.raises(ValueError) as excinfo:
+        sf.write(io.BytesIO(), data, 48000, format='OGG', subtype='VORBIS',
+                 vbr_quality=0.5, compression_level=0.5)
+    assert "Only one of" in str(excinfo.value)
+    with pytest.raises(ValueError):
+        sf.write(io.BytesIO(), data, 48000, format='OGG', subtype='VORBIS',
+                 vbr_quality=1.5)
+
+
+def test_write_invalid_vbr_quality_creates_no_file(tmp_path):
+    filename = tmp_path / 'out.ogg'
+    with pytest.raises(ValueError) as excinfo:
+        sf.SoundFile(filename, 'w', 48000, 1, format='OGG',
+                     subtype='VORBIS', vbr_quality=-0.5)
+    assert "VBR quality" in str(excinfo.value)
+    assert not filename.exists()
+
+
+def _bytes_per_write(ogg_page_latency):
+    fobj = io.BytesIO()
+    block = np.random.uniform(-0.5, 0.5, 960)  # 20 ms
+    sizes = []
+    with sf.SoundFile(fobj, 'w', 48000, 1, format='OGG', subtype='OPUS',
+                      ogg_page_latency=ogg_page_latency) as f:
+        assert f.ogg_page_latency == ogg_page_latency
+        for _ in range(100):
+            before = fobj.tell()
+            f.write(block)
+            sizes.append(fobj.tell() - before)
+    return sizes
+
+
+def test_write_ogg_page_latency():
+    low_latency = _bytes_per_write(50)
+    high_latency = _bytes_per_write(1000)
+    # pages are emitted more often and are smaller with low latency
+    assert (sum(1 for size in low_latency if size) >
+            2 * sum(1 for size in high_latency if size))
+    assert max(low_latency) < max(high_latency)
+
+    with pytest.raises(ValueError) as excinfo:
+        sf.SoundFile(io.BytesIO(), 'w', 44100, 1, format='WAV',
+                     ogg_page_latency=50)
+    assert "OGG" in str(excinfo.value)
+    with pytest.raises(ValueError):
+        sf.SoundFile(io.BytesIO(), 'w', 48000, 1, format='OGG',
+                     subtype='OPUS', ogg_page_latency=0)
+
+
+def test_write_stream_coalesces_short_blocks(file_inmemory, monkeypatch):
+    calls = []
+    array_io = sf.SoundFile._array_io
+    monkeypatch.setattr(sf.SoundFile, '_array_io', lambda self, *args:
+                        calls.append(args[2]) or array_io(self, *args))
+    data = np.arange(1000, dtype='int16')
+    blocks = (data[i:i + 30] for i in range(0, len(data), 30))
+    frames = sf.write_stream(file_inmemory, blocks, 44100, format='WAV',
+                             min_blocksize=256)
+    assert frames == len(data)
+    assert calls == [240, 240, 240, 240, 40]
+    file_inmemory.seek(0)
+    assert np.all(sf.read(file_inmemory, dtype='int16')[0] == data)
+
+
+def test_write_stream_mixed_blocks(file_inmemory):
+    left = np.arange(5000, dtype='int16')
+    blocks = [np.column_stack([left[:10], left[:10]]),
+              np.column_stack([left[10:4000], left[10:4000]]),
+              np.column_stack([left[4000:], left[4000:]]).astype('float64')]
+    assert sf.write_stream(file_inmemory, iter(blocks), 44100,
+                           format='WAV', subtype='PCM_16',
+                           min_blocksize=100) == 5000
+    file_inmemory.seek(0)
+    read, fs = sf.read(file_inmemory, dtype='int16')
+    assert np.all(read[:4000] == np.column_stack([left, left])[:4000])
+    assert np.all(read[4000:] == 2**15 - 1)  # float data is clipped
+
+
+def test_write_stream_channels_first(file_inmemory):
+    data = np.arange(1000, dtype='int16').reshape(2, -1)
+    blocks = ([data[0, i:i + 30], data[1, i:i + 30]]
+              for i in range(0, data.shape[1], 30))
+    assert sf.write_stream(file_inmemory, blocks, 44100, format='WAV',
+                           subtype='PCM_16', channels_first=True,
+                           min_blocksize=100) == 500
+    file_inmemory.seek(0)
+    assert np.all(sf.read(file_inmemory, dtype='int16')[0] == data.T)
+
+
+def test_write_stream_from_blocks(file_inmemory):
+    out = np.empty((3, 2))
+    frames = sf.write_stream(file_inmemory,
+                             sf.blocks(filename_stereo, out=out), 44100,
+                             format='WAV', subtype='DOUBLE')
+    assert frames == len(data_stereo)
+    file_inmemory.seek(0)
+    assert np.all(sf.read(file_inmemory)[0] == data_stereo)
+
+
+def test_write_stream_errors(file_inmemory):
+    with pytest.raises(ValueError):
+        sf.write_stream(file_inmemory, [], 44100, format='WAV')
+    with pytest.raises(ValueError):
+        sf.write_stream(file_inmemory, [np.zeros((10, 2)), np.zeros(10)],
+                        44100, format='WAV')
+
+
+def test_write_many(tmp_path):
+    items = [(tmp_path / f'{i}.wav', data_mono * i, 44100)
+             for i in range(10)]
+    items.append((tmp_path / 'float.flac', data_stereo / 2, 48000,
+                  {'subtype': 'PCM_24'}))
+    results = sf.write_many(iter(items), workers=3, max_pending=2,
+                            subtype='PCM_16')
+    assert [result.file for result in results] == [item[0] for item in items]
+    assert all(result.error is None for result in results)
+    assert all(result.duration > 0 for result in results)
+    for i in range(10):
+        data, fs = sf.read(tmp_path / f'{i}.wav', dtype='int16')
+        assert np.all(data == data_mono * i)
+    with sf.SoundFile(tmp_path / 'float.flac') as f:
+        assert (f.samplerate, f.subtype) == (48000, 'PCM_24')
+
+
+def test_write_many_errors(tmp_path):
+    results = sf.write_many([
+        (tmp_path / 'good.wav', data_mono, 44100),
+        (tmp_path / 'bad.xyz', data_mono, 44100),
+        (tmp_path / 'bad.wav', data_mono, 44100, {'subtype': 'VORBIS'}),
+    ], workers=2)
+    assert results[0].error is None
+    assert isinstance(results[1].error, TypeError)
+    assert isinstance(results[2].error, ValueError)
+    with pytest.raises(TypeError):
+        sf.write_many([('too short', data_mono)])
+
+
+def test_write_many_atomic(tmp_path):
+    filename = tmp_path / 'atomic.wav'
+    sf.write(filename, data_mono, 44100)
+    results = sf.write_many([
+        (filename, data_mono[:2], 44100),
+        (tmp_path / 'failed.wav', data_mono, 44100, {'subtype': 'VORBIS'}),
+    ], atomic=True)
+    assert results[0].error is None
+    assert isinstance(results[1].error, ValueError)
+    assert len(sf.read(filename)[0]) == 2
+    # no temporary files are left behind
+    assert sorted(os.listdir(tmp_path)) == ['atomic.wav']
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason="POSIX permissions")
+def test_write_many_atomic_permissions(tmp_path):
+    plain = tmp_path / 'plain.wav'
+    sf.write(plain, data_mono, 44100)
+    existing = tmp_path / 'existing.wav'
+    sf.write(existing, data_mono, 44100)
+    os.chmod(existing, 0o640)
+    results = sf.write_many([(tmp_path / 'new.wav', data_mono, 44100),
+                             (existing, data_mono, 44100)], atomic=True)
+    assert [r.error for r in results] == [None, None]
+    mode = os.stat(plain).st_mode & 0o777
+    assert os.stat(tmp_path / 'new.wav').st_mode & 0o777 == mode
+    assert os.stat(existing).st_mode & 0o777 == 0o640
+
+
+def test_write_many_process_pool(tmp_path):
+    items = [(str(tmp_path / f'{i}.wav'), data_mono, 44100) for i in range(3)]
+    results = sf.write_many(items, workers=2, executor='process')
+    assert all(result.error is None for result in results)
+    assert np.all(sf.read(items[2][0], dtype='int16')[0] == data_mono)
+
+
+# -----------------------------------------------------------------------------
+# Test convert() function
+# -----------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("blocksize", [1, 3, 65536])
+def test_convert_to_other_format(file_w, blocksize):
+    frames = sf.convert(filename_mono, file_w, format='FLAC',
+                        blocksize=blocksize)
+    assert frames == len(data_mono)
+    data, fs = sf.read(filename_new, dtype='int16')
+    assert fs == 44100
+    assert np.all(data == data_mono)
+    assert sf.info(filename_new).subtype == 'PCM_16'
+
+
+def test_convert_float_to_pcm():
+    with io.BytesIO() as f:
+        frames = sf.convert(filename_stereo, f, format='AIFF',
+                            subtype='PCM_24', blocksize=3)
+        assert frames == len(data_stereo)
+        f.seek(0)
+        data, fs = sf.read(f)
+    assert np.allclose(data, data_stereo.clip(-1, 1), atol=2**-23)
+
+
+def test_convert_pcm_to_float():
+    with io.BytesIO() as f:
+        sf.convert(filename_mono, f, format='WAV', subtype='DOUBLE')
+        f.seek(0)
+        data, fs = sf.read(f)
+    assert np.all(data == data_mono / 2**15)
+
+
+def test_convert_with_raw_copy(file_w):
+    with sf.SoundFile(filename_stereo) as f:
+        assert sf._is_raw_copy_possible(f, f)
+    assert sf.convert(filename_stereo, file_w, format='WAV',
+                      blocksize=3) == len(data_stereo)
+    with sf.SoundFile(filename_new) as f:
+        assert f.subtype == 'FLOAT'
+        assert f.frames == len(data_stereo)
+        assert np.all(f.read() == data_stereo)
+
+
+def test_convert_copies_metadata(file_w):
+    with io.BytesIO() as f:
+        with sf.SoundFile(f, 'w', 44100, 1, format='WAV') as g:
+            g.title = 'title'
+            g.artist = 'artist'
+            g.write(data_mono)
+        f.seek(0)
+        sf.convert(f, file_w, format='FLAC')
+    with sf.SoundFile(filename_new) as f:
+        assert f.copy_metadata() == {'title': 'title', 'artist': 'artist'}
+
+
+@pytest.mark.parametrize("src, dst, dtype", [
+    ('PCM_16', 'PCM_24', 'int16'),
+    ('PCM_24', 'PCM_16', 'int32'),
+    ('PCM_16', 'FLOAT', 'float32'),
+    ('PCM_24', 'VORBIS', 'float32'),
+    ('PCM_32', 'DOUBLE', 'float64'),
+    ('FLOAT', 'PCM_16', 'float32'),
+    ('DOUBLE', 'FLOAT', 'float64'),
+])
+def test_convert_dtype(src, dst, dtype):
+    assert sf._convert_dtype(src, dst) == dtype
+
+
+# -----------------------------------------------------------------------------
+# Test resampling
+# -----------------------------------------------------------------------------
+
+
+@pytest.fixture
+def sine_48k():
+    t = np.arange(4800) / 48000
+    data = 0.5 * np.stack([np.sin(2 * np.pi * 440 * t),
+                           np.cos(2 * np.pi * 1000 * t)], axis=1)
+    f = io.BytesIO()
+    sf.write(f, data, 48000, format='WAV', subtype='DOUBLE')
+    f.seek(0)
+    return f
+
+
+def _sine_16k(frames):
+    t = np.arange(frames) / 16000
+    return 0.5 * np.stack([np.sin(2 * np.pi * 440 * t),
+                           np.cos(2 * np.pi * 1000 * t)], axis=1)
+
+
+def test_read_with_samplerate_out(sine_48k):
+    data, fs = sf.read(sine_48k, samplerate_out=16000)
+    assert fs == 16000
+    assert data.shape == (1600, 2)
+    # ignore the edges, where the signal is cut off:
+    assert np.allclose(data[50:-50], _sine_16k(1600)[50:-50], atol=1e-4)
+
+
+@pytest.mark.parametrize("samplerate_out", [16000, 22050, 96000])
+def test_read_resampled_in_pieces(sine_48k, samplerate_out):
+    expected, _ = sf.read(sine_48k, samplerate_out=samplerate_out)
+    sine_48k.seek(0)
+    with sf.SoundFile(sine_48k) as f:
+        pieces = [f.read(n, samplerate_out=samplerate_out)
+                  for n in [1, 7, 100, 1000, 100000]]
+    assert np.allclose(np.concatenate(pieces), expected, rtol=0, atol=1e-12)
+
+
+def test_read_resampled_with_start_and_stop(sine_48k):
+    expected, _ = sf.read(sine_48k, samplerate_out=16000)
+    sine_48k.seek(0)
+    data, _ = sf.read(sine_48k, start=100, stop=-100, samplerate_out=16000)
+    assert np.allclose(data, expected[100:-100], rtol=0, atol=1e-12)
+    sine_48k.seek(0)
+    data, _ = sf.read(sine_48k, start=-10, frames=20, fill_value=0,
+                      samplerate_out=16000)
+    assert np.allclose(data[:10], expected[-10:], rtol=0, atol=1e-12)
+    assert np.all(data[10:] == 0)
+
+
+def test_read_resampled_after_seek(sine_48k):
+    expected, _ = sf.read(sine_48k, samplerate_out=16000)
+    sine_48k.seek(0)
+    with sf.SoundFile(sine_48k) as f:
+        f.read(10, samplerate_out=16000)
+        f.seek(300)
+        data = f.read(5, samplerate_out=16000)
+    assert np.allclose(data, expected[100:105], rtol=0, atol=1e-12)
+
+
+def test_read_resampled_int16(sine_48k):
+    data, _ = sf.read(sine_48k)
+    f = io.BytesIO()
+    sf.write(f, data, 48000, format='WAV', subtype='PCM_16')
+    f.seek(0)
+    expected, _ = sf.read(f, samplerate_out=16000)
+    f.seek(0)
+    data, _ = sf.read(f, dtype='int16', samplerate_out=16000)
+    assert data.dtype == np.int16
+    assert np.all(np.abs(data - expected * 2**15) <= 1)
+
+
+def test_read_with_same_samplerate_out(file_stereo_r):
+    data, fs = sf.read(file_stereo_r, samplerate_out=44100)
+    assert fs == 44100
+    assert np.all(data == data_stereo)
+
+
+def test_blocks_with_samplerate_out(sine_48k):
+    expected, _ = sf.read(sine_48k, samplerate_out=16000)
+    sine_48k.seek(0)
+    blocks = list(sf.blocks(sine_48k, blocksize=256, overlap=56,
+                            samplerate_out=16000))
+    assert len(blocks) == 8
+    assert np.allclose(blocks[1], expected[200:456], rtol=0, atol=1e-12)
+    assert np.allclose(blocks[-1], expected[1400:], rtol=0, atol=1e-12)
+
+
+# -----------------------------------------------------------------------------
+# Test channel mixing
+# -----------------------------------------------------------------------------
+
+
+def test_read_mix_mono(file_stereo_r):
+    data, fs = sf.read(file_stereo_r, mix='mono')
+    assert data.shape == (len(data_stereo),)
+    assert np.all(data == data_stereo.mean(axis=1))
+
+
+def test_read_mix_matrix(file_stereo_r):
+    matrix = [[1, 0], [0.5, 0.25], [0, 2]]
+    data, fs = sf.read(file_stereo_r, dtype='float32', mix=matrix)
+    assert data.dtype == np.float32
+    assert np.allclose(data, data_stereo @ np.transpose(matrix))
+
+
+def test_read_mix_int16(file_mono_r):
+    data, fs = sf.read(file_mono_r, dtype='int16', always_2d=True,
+                       mix=[[1], [-0.5]])
+    assert data.dtype == np.int16
+    assert np.all(data[:, 0] == data_mono)
+    assert np.all(data[:, 1] == np.rint(-0.5 * data_mono))
+
+
+def test_read_mix_into_out_with_fill_value(sf_stereo_r):
+    out = np.ones(6)
+    data = sf_stereo_r.read(out=out, fill_value=0, mix=[[1, 0]])
+    assert data is out
+    assert np.all(data == [1.75, 1.0, 0.5, 0.25, 0, 0])
+    with pytest.raises(ValueError) as excinfo:
+        sf_stereo_r.read(out=np.empty((3, 2)), mix='mono')
+    assert "channels" in str(excinfo.value)
+
+
+def test_read_mix_with_invalid_matrix(sf_stereo_r):
+    with pytest.raises(ValueError) as excinfo:
+        sf_stereo_r.read(mix=[[1, 0, 0]])
+    assert "shape" in str(excinfo.value)
+    with pytest.raises(ValueError) as excinfo:
+        sf_stereo_r.read(mix='stereo')
+    assert "Invalid mix" in str(excinfo.value)
+
+
+def test_blocks_mix(file_stereo_r):
+    blocks = list(sf.blocks(file_stereo_r, blocksize=3, mix=[[1, 0]]))
+    assert_equal_list_of_arrays(blocks, [data_stereo[:3, 0],
+                                         data_stereo[3:, 0]])
+
+
+# -----------------------------------------------------------------------------
+# Test signal maximum and statistics
+# -----------------------------------------------------------------------------
+
+
+def test_signal_max_from_peak_chunk(file_inmemory):
+    sf.write(file_inmemory, data_stereo / 2, 44100, format='WAV',
+             subtype='FLOAT')
+    file_inmemory.seek(0)
+    with sf.SoundFile(file_inmemory) as f:
+        assert f.signal_max() == 0.875
+        assert np.all(f.signal_max(per_channel=True) == [0.875, 0.875])
+
+
+def test_signal_max_without_peak_chunk(file_inmemory):
+    sf.write(file_inmemory, data_mono, 44100, format='WAV',
+             subtype='PCM_16')
+    file_inmemory.seek(0)
+    with sf.SoundFile(file_inmemory) as f:
+        assert f.signal_max() is None
+        assert f.signal_max(per_channel=True) is None
+
+
+def test_calc_signal_max(file_inmemory):
+    sf.write(file_inmemory, data_mono, 44100, format='WAV',
+             subtype='PCM_16')
+    file_inmemory.seek(0)
+    with sf.SoundFile(file_inmemory) as f:
+        f.seek(2)
+        assert f.calc_signal_max() == 2 / 2**15
+        assert f.calc_signal_max(normalized=False) == 2
+        assert np.all(f.calc_signal_max(per_channel=True,
+                                        normalized=False) == [2])
+        assert f.tell() == 2
+
+
+def test_calc_signal_max_in_write_mode(sf_stereo_w):
+    with pytest.raises(sf.SoundFileRuntimeError) as excinfo:
+        sf_stereo_w.calc_signal_max()
+    assert "write-only" in str(excinfo.value)
+
+
+def test_read_with_stats(file_stereo_r):
+    stats = sf.SignalStats()
+    data, fs = sf.read(file_stereo_r, stats=stats)
+    assert np.all(data == data_stereo)
+    assert stats.frames == len(data_stereo)
+    assert stats.channels == 2
+    assert np.all(stats.peak == [1.75, 1.75])
+    assert np.all(stats.max == [1.75, -0.25])
+    assert np.allclose(stats.rms, np.sqrt(np.mean(data_stereo**2, axis=0)))
+    assert np.allclose(stats.dc_offset, data_stereo.mean(axis=0))
+    assert np.all(stats.clipped == [2, 2])
+
+
+def test_read_with_stats_int16(file_mono_r):
+    stats = sf.SignalStats()
+    data, fs = sf.read(file_mono_r, dtype='int16', fill_value=0,
+                       frames=10, stats=stats)
+    assert len(data) == 10
+    # values are relative to full scale, fill_value is not counted:
+    assert stats.frames == len(data_mono)
+    assert stats.peak == [2 / 2**15]
+    assert stats.dc_offset == [0]
+    assert stats.clipped == [0]
+
+
+@pytest.mark.parametrize('dtype', ['int16', 'int32'])
+def test_stats_clipped_integers(dtype):
+    info = np.iinfo(dtype)
+    stats = sf.SignalStats()
+    stats.update(np.array([info.max, info.min, info.max - 1, info.min + 1,
+                           0], dtype=dtype))
+    assert stats.clipped == [2]
+    float_stats = sf.SignalStats()
+    float_stats.update(np.array([1.0, -1.0, 0.5]))
+    assert float_stats.clipped == [2]
+
+
+def test_blocks_with_stats_and_overlap(file_stereo_r):
+    stats = sf.SignalStats()
+    blocks = list(sf.blocks(file_stereo_r, blocksize=3, overlap=2,
+                            stats=stats))
+    assert len(blocks) == 2
+    assert stats.frames == len(data_stereo)
+    assert np.allclose(stats.dc_offset, data_stereo.mean(axis=0))
+
+
+def test_stats_without_data():
+    stats = sf.SignalStats()
+    assert stats.frames == 0
+    assert stats.channels == 0
+    assert len(stats.peak) == 0
+    stats.update(np.empty((0, 2)))
+    assert np.all(stats.rms == [0, 0])
+    with pytest.raises(ValueError) as excinfo:
+        stats.update(np.zeros(3))
+    assert "channels" in str(excinfo.value)
+
+
 # -----------------------------------------------------------------------------
 # Test blocks() function
 # -----------------------------------------------------------------------------
@@ -515,6 +1151,80 @@ def test_blocks_write(sf_stereo_w):
         list(sf_stereo_w.blocks(blocksize=2))
 
 
+def _grow_file(writer, data, blocksize, delay):
+    for start in range(0, len(data), blocksize):
+        time.sleep(delay)
+        writer.write(data[start:start + blocksize])
+        writer.flush()
+    writer.close()
+
+
+def test_refresh():
+    data = np.arange(300, dtype='int16')
+    with sf.SoundFile(filename_new, 'w', 44100, 1, 'PCM_16', format='WAV',
+                      update_header=True) as w:
+        w.write(data[:100])
+        w.flush()
+        with sf.SoundFile(filename_new) as f:
+            assert f.frames == 100
+            assert f.refresh() == 0
+            assert np.all(f.read(dtype='int16') == data[:100])
+            w.write(data[100:])
+            w.flush()
+            assert f.refresh() == 200
+            assert f.frames == 300
+            assert f.tell() == 100
+            assert np.all(f.read(dtype='int16') == data[100:])
+            assert f.refresh() == 0
+    os.remove(filename_new)
+
+
+def test_refresh_in_write_mode(sf_stereo_w):
+    with pytest.raises(sf.SoundFileRuntimeError) as excinfo:
+        sf_stereo_w.refresh()
+    assert "read-only mode" in str(excinfo.value)
+
+
+@pytest.mark.parametrize("overlap", [0, 3])
+def test_blocks_follow(overlap):
+    data = np.arange(1000, dtype='int16')
+    writer = sf.SoundFile(filename_new, 'w', 44100, 1, 'PCM_16',
+                          format='WAV', update_header=True)
+    writer.write(data[:10])
+    writer.flush()
+    thread = threading.Thread(target=_grow_file,
+                              args=(writer, data[10:], 90, 0.01))
+    thread.start()
+    try:
+        blocks = list(sf.blocks(filename_new, blocksize=64, overlap=overlap,
+                                dtype='int16', follow=True,
+                                poll_interval=0.001, idle_timeout=0.5))
+    finally:
+        thread.join()
+    os.remove(filename_new)
+    assert all(len(block) == 64 for block in blocks[:-1])
+    assert len(blocks[-1]) <= 64
+    step = 64 - overlap
+    expected = [data[i:i + 64] for i in range(0, len(data) - overlap, step)]
+    assert_equal_list_of_arrays(blocks, expected)
+    assert len(blocks) == len(expected)
+
+
+def test_blocks_follow_idle_timeout(file_stereo_r):
+    start = time.monotonic()
+    blocks = list(sf.blocks(filename_stereo, blocksize=3, follow=True,
+                            idle_timeout=0.05, poll_interval=0.01))
+    assert 0.05 <= time.monotonic() - start < 1
+    assert_equal_list_of_arrays(blocks, [data_stereo[0:3], data_stereo[3:4]])
+
+
+def test_blocks_follow_with_frames_and_fill_value():
+    blocks = list(sf.blocks(filename_stereo, blocksize=3, frames=4,
+                            fill_value=0, follow=True, idle_timeout=0))
+    assert_equal_list_of_arrays(
+        blocks, [data_stereo[0:3], [data_stereo[3], [0, 0], [0, 0]]])
+
+
 # -----------------------------------------------------------------------------
 # Test SoundFile.__init__()
 # -----------------------------------------------------------------------------
@@ -734,6 +1444,155 @@ def test_file_truthiness(file_w):
         assert f
 
 
+def test_chunks(sf_stereo_r):
+    chunks = sf_stereo_r.chunks()
+    assert [chunk_id for chunk_id, size in chunks][-1] == 'data'
+    assert ('fmt ', 16) in chunks
+    assert ('data', data_stereo.size * 4) in chunks
+
+
+@pytest.mark.parametrize('format', ['WAV', 'AIFF'])
+def test_set_and_get_chunk(file_inmemory, format):
+    with sf.SoundFile(file_inmemory, 'w', 44100, 1, format=format) as f:
+        f.set_chunk('abcd', b'hello')
+        f.write(data_mono)
+    file_inmemory.seek(0)
+    with sf.SoundFile(file_inmemory) as f:
+        f.seek(2)
+        assert ('abcd', 8) in f.chunks()
+        # the chunk data is padded:
+        assert bytes(f.get_chunk('abcd')) == b'hello\0\0\0'
+        assert f.get_chunk('efgh') is None
+        assert np.all(f.read(dtype='int16') == data_mono[2:])
+
+
+def test_set_chunk_after_writing_should_fail(sf_stereo_w):
+    sf_stereo_w.write(data_stereo)
+    with pytest.raises(sf.SoundFileRuntimeError) as excinfo:
+        sf_stereo_w.set_chunk('abcd', b'1234')
+    assert "before writing" in str(excinfo.value)
+
+
+def test_chunks_with_unsupported_format(file_inmemory):
+    with sf.SoundFile(file_inmemory, 'w', 44100, 1, format='FLAC') as f:
+        with pytest.raises(sf.LibsndfileError):
+            f.set_chunk('abcd', b'1234')
+        f.write(data_mono)
+    file_inmemory.seek(0)
+    with sf.SoundFile(file_inmemory) as f:
+        assert f.chunks() == []
+        assert f.get_chunk('abcd') is None
+
+
+def test_invalid_chunk_id(sf_stereo_r):
+    with pytest.raises(ValueError):
+        sf_stereo_r.get_chunk('')
+    with pytest.raises(TypeError):
+        sf_stereo_r.get_chunk(b'fmt ')
+
+
+def test_file_without_header_metadata(sf_stereo_r):
+    assert sf_stereo_r.get_broadcast_info() is None
+    assert sf_stereo_r.get_cue_points() == []
+    assert sf_stereo_r.get_instrument() is None
+
+
+def test_broadcast_info(file_inmemory):
+    with sf.SoundFile(file_inmemory, 'w', 44100, 1, format='WAV') as f:
+        f.set_broadcast_info({'description': 'Interview',
+                              'originator': 'Studio 1',
+                              'time_reference': 2**32 + 44100,
+                              'loudness_value': -23.5,
+                              'coding_history': 'A=PCM,F=48000\r\n'})
+        f.write(data_mono)
+    file_inmemory.seek(0)
+    with sf.SoundFile(file_inmemory) as f:
+        info = f.get_broadcast_info()
+    assert info['description'] == 'Interview'
+    assert info['originator'] == 'Studio 1'
+    assert info['originator_reference'] == ''
+    assert info['time_reference'] == 2**32 + 44100
+    assert info['loudness_value'] == -23.5
+    assert info['umid'] == bytes(64)
+    # libsndfile appends its own line:
+    assert info['coding_history'].startswith('A=PCM,F=48000\r\n')
+
+
+def test_broadcast_info_with_invalid_fields(sf_stereo_w):
+    with pytest.raises(ValueError) as excinfo:
+        sf_stereo_w.set_broadcast_info({'title': 'x'})
+    assert "title" in str(excinfo.value)
+    with pytest.raises(ValueError) as excinfo:
+        sf_stereo_w.set_broadcast_info({'originator': 'x' * 33})
+    assert "originator" in str(excinfo.value)
+
+
+def test_cue_points(file_inmemory):
+    with sf.SoundFile(file_inmemory, 'w', 44100, 1, format='WAV') as f:
+        f.set_cue_points([{'position': 1}, {'position': 3, 'index': 7}])
+        f.write(data_mono)
+    file_inmemory.seek(0)
+    with sf.SoundFile(file_inmemory) as f:
+        cue_points = f.get_cue_points()
+    assert [(cue['index'], cue['position'], cue['sample_offset'])
+            for cue in cue_points] == [(1, 1, 1), (7, 3, 3)]
+    assert cue_points[0]['fcc_chunk'] == int.from_bytes(b'data', 'little')
+
+
+def test_instrument(file_inmemory):
+    with sf.SoundFile(file_inmemory, 'w', 44100, 1, format='WAV') as f:
+        f.set_instrument({'basenote': 64,
+                          'loops': [{'start': 1, 'end': 4},
+                                    {'mode': 'BACKWARD', 'start': 0,
+                                     'end': 2, 'count': 3}]})
+        f.write(data_mono)
+    file_inmemory.seek(0)
+    with sf.SoundFile(file_inmemory) as f:
+        instrument = f.get_instrument()
+    assert instrument['basenote'] == 64
+    assert instrument['velocity_hi'] == 127
+    assert instrument['loops'] == [
+        {'mode': 'FORWARD', 'start': 1, 'end': 4, 'count': 0},
+        {'mode': 'BACKWARD', 'start': 0, 'end': 2, 'count': 3}]
+
+
+def test_instrument_with_invalid_loop_mode(sf_stereo_w):
+    with pytest.raises(ValueError) as excinfo:
+        sf_stereo_w.set_instrument({'loops': [{'mode': 'UP', 'start': 0,
+                                               'end': 1}]})
+    assert "loop mode" in str(excinfo.value)
+
+
+def test_header_metadata_after_writing_should_fail(sf_stereo_w):
+    sf_stereo_w.write(data_stereo)
+    with pytest.raises(sf.SoundFileRuntimeError) as excinfo:
+        sf_stereo_w.set_cue_points([{'position': 0}])
+    assert "before writing" in str(excinfo.value)
+
+
+def test_broadcast_info_with_unsupported_format(file_inmemory):
+    with sf.SoundFile(file_inmemory, 'w', 44100, 1, format='AIFF') as f:
+        with pytest.raises(sf.SoundFileRuntimeError) as excinfo:
+            f.set_broadcast_info({'description': 'x'})
+    assert "not supported" in str(excinfo.value)
+
+
+def test_info_contains_header_metadata(file_inmemory):
+    with sf.SoundFile(file_inmemory, 'w', 44100, 1, format='WAV') as f:
+        f.title = 'Title'
+        f.set_broadcast_info({'description': 'Interview'})
+        f.set_cue_points([{'position': 2}])
+        f.write(data_mono)
+    file_inmemory.seek(0)
+    info = sf.info(file_inmemory, verbose=True)
+    assert info.metadata == {'title': 'Title'}
+    assert info.broadcast_info['description'] == 'Interview'
+    assert info.cue_points[0]['position'] == 2
+    assert info.instrument is None
+    assert "cue_points: " in repr(info)
+    assert "instrument: " not in repr(info)
+
+
 # -----------------------------------------------------------------------------
 # Test seek/tell
 # -----------------------------------------------------------------------------
@@ -875,6 +1734,90 @@ def test_concurrent_open_error_reporting(file_inmemory):
     assert n_reported_errors[0] == n_threads * n_trials_per_thread
 
 
+def test_concurrent_open_error_codes_with_successful_opens():
+    # Successful opens reset libsndfile's global error code, failed
+    # opens must still report the correct one.
+
+    n_threads = 4
+    n_trials_per_thread = 20
+
+    error_codes = []
+
+    def failing():
+        for _ in range(n_trials_per_thread):
+            try:
+                sf.SoundFile('i_do_not_exist.wav')
+            except sf.LibsndfileError as e:
+                error_codes.append(e.code)
+
+    def succeeding():
+        for _ in range(n_trials_per_thread):
+            sf.SoundFile(filename_stereo).close()
+
+    threads = [threading.Thread(target=target)
+               for _ in range(n_threads)
+               for target in (failing, succeeding)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert error_codes == [2] * n_threads * n_trials_per_thread  # SF_ERR_SYSTEM
+
+
+class _NonSeekable(io.RawIOBase):
+    """A readable stream without seek(), like a pipe."""
+
+    def __init__(self, data):
+        self._data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        return self._data.readinto(buffer)
+
+
+@pytest.fixture
+def unreliable_open_errors(monkeypatch):
+    """Pretend that each failed open overlapped with another open."""
+    monkeypatch.setattr(sf._SharedLock, 'was_alone',
+                        lambda self, token: False)
+    positions = []
+    init_virtual_io = sf.SoundFile._init_virtual_io
+
+    def record_position(self, file):
+        positions.append(file.tell() if file.seekable() else None)
+        return init_virtual_io(self, file)
+
+    monkeypatch.setattr(sf.SoundFile, '_init_virtual_io', record_position)
+    return positions
+
+
+def test_failed_open_is_repeated_at_start_position(unreliable_open_errors):
+    file = io.BytesIO(b'junk' + b'not a sound file' * 10)
+    file.seek(4)
+    with pytest.raises(sf.LibsndfileError):
+        sf.SoundFile(file)
+    assert unreliable_open_errors == [4, 4]
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason="uses os.pipe()")
+def test_failed_opens_of_streams_are_not_repeated():
+    read_fd, write_fd = os.pipe()
+    try:
+        assert sf._rewind_function(read_fd) is None
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
+    assert sf._rewind_function(_NonSeekable(b'')) is None
+    file = io.BytesIO(b'data')
+    file.seek(2)
+    rewind = sf._rewind_function(file)
+    file.read()
+    rewind()
+    assert file.tell() == 2
+
+
 # -----------------------------------------------------------------------------
 # Test buffer read
 # -----------------------------------------------------------------------------
@@ -916,6 +1859,118 @@ def test_buffer_read_into(sf_stereo_r):
     assert sf_stereo_r.seek(0, sf.SEEK_CUR) == 4
 
 
+# -----------------------------------------------------------------------------
+# Test positional read
+# -----------------------------------------------------------------------------
+
+
+def test_read_at_does_not_change_position(sf_stereo_r):
+    sf_stereo_r.seek(1)
+    data = sf_stereo_r.read_at(2, 2)
+    assert np.all(data == data_stereo[2:4])
+    assert sf_stereo_r.tell() == 1
+    data = sf_stereo_r.read_at(-1, dtype='float32', always_2d=True)
+    assert np.all(data == data_stereo[-1:])
+    assert data.dtype == np.float32
+    assert sf_stereo_r.tell() == 1
+
+
+def test_read_at_with_fill_value_and_out(sf_stereo_r):
+    data = sf_stereo_r.read_at(3, 3, fill_value=0)
+    assert np.all(data == [[0.25, -0.25], [0, 0], [0, 0]])
+    out = np.empty((2, 2))
+    data = sf_stereo_r.read_at(1, out=out)
+    assert data is out
+    assert np.all(data == data_stereo[1:3])
+    assert sf_stereo_r.tell() == 0
+
+
+def test_buffer_read_at(sf_stereo_r):
+    buf = sf_stereo_r.buffer_read_at(1, 2, dtype='float64')
+    data = np.frombuffer(buf, dtype='float64').reshape(-1, 2)
+    assert np.all(data == data_stereo[1:3])
+    assert sf_stereo_r.tell() == 0
+
+
+def test_read_at_non_seekable_file(file_w):
+    with sf.SoundFile(file_w, 'w', 44100, 1, format='XI') as f:
+        f.write(data_mono)
+    with sf.SoundFile(filename_new) as f:
+        with pytest.raises(ValueError) as excinfo:
+            f.read_at(0, 1)
+        assert "seekable" in str(excinfo.value)
+
+
+def test_read_at_concurrently_with_multiple_handles():
+    with sf.SoundFile(filename_stereo) as f:
+        f.set_read_handles(3)
+        results = {}
+
+        def target(start):
+            for _ in range(50):
+                results[start] = f.read_at(start, 1)
+
+        threads = [threading.Thread(target=target, args=(start,))
+                   for start in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert f.tell() == 0
+        assert f._read_handles._count <= 3
+    for start in range(4):
+        assert np.all(results[start] == data_stereo[start:start + 1])
+
+
+def test_read_at_uses_separate_handle_for_named_files():
+    with sf.SoundFile(filename_stereo) as f:
+        f.seek(1)
+        handle = f._file
+        opened = []
+        original_open = f._open_read_handle
+
+        def open_read_handle():
+            opened.append(original_open())
+            return opened[-1]
+
+        f._open_read_handle = open_read_handle
+        assert np.all(f.read_at(2, 2) == data_stereo[2:4])
+        assert np.all(f.read_at(0, 1) == data_stereo[:1])
+        assert len(opened) == 1
+        assert opened[0]._file != handle
+        assert f.tell() == 1
+        assert np.all(f.read(1) == data_stereo[1:2])
+    assert opened[0].closed
+
+
+def test_read_at_keeps_conversion_options():
+    with sf.SoundFile(filename_stereo, normalize=False) as f:
+        assert np.all(f.read_at(0, 2, dtype='float64') ==
+                      f.read(2, dtype='float64'))
+
+
+def test_read_at_uses_own_handle_for_file_objects(file_stereo_r):
+    if isinstance(file_stereo_r, (str, pathlib.Path)):
+        pytest.skip("only for files not opened by name")
+    with sf.SoundFile(file_stereo_r) as f:
+        assert f._read_handles.shared
+        assert np.all(f.read_at(1, 2) == data_stereo[1:3])
+        assert f.tell() == 0
+
+
+def test_set_read_handles_requires_file_name(file_stereo_r):
+    with sf.SoundFile(file_stereo_r) as f:
+        if isinstance(file_stereo_r, (str, pathlib.Path)):
+            f.set_read_handles(2)
+            assert np.all(f.read_at(0) == data_stereo)
+        else:
+            with pytest.raises(ValueError) as excinfo:
+                f.set_read_handles(2)
+            assert "opened by name" in str(excinfo.value)
+        with pytest.raises(ValueError):
+            f.set_read_handles(0)
+
+
 # -----------------------------------------------------------------------------
 # Test write
 # -----------------------------------------------------------------------------
@@ -960,6 +2015,121 @@ def test_rplus_append_data(sf_stereo_rplus):
     assert np.all(data[len(data_stereo):] == data_stereo / 2)
 
 
+def _wav_data_size(f):
+    header = f.getvalue()
+    pos = header.find(b'data')
+    return int.from_bytes(header[pos + 4:pos + 8], 'little')
+
+
+@pytest.mark.parametrize('update_header, expected', [(False, 0), (True, 16)])
+def test_write_update_header(file_inmemory, update_header, expected):
+    with sf.SoundFile(file_inmemory, 'w', 44100, 1, 'PCM_16', format='WAV',
+                      update_header=update_header) as f:
+        assert f.update_header == update_header
+        f.write(data_stereo[:, 0])
+        f.write(data_stereo[:, 1])
+        assert _wav_data_size(file_inmemory) == expected
+    assert _wav_data_size(file_inmemory) == 16
+
+
+def test_write_update_header_every_n_seconds(file_inmemory, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(sf._time, 'monotonic', lambda: now[0])
+    with sf.SoundFile(file_inmemory, 'w', 44100, 1, 'PCM_16', format='WAV',
+                      update_header=10) as f:
+        f.write(data_mono)
+        assert _wav_data_size(file_inmemory) == 0
+        now[0] += 10
+        f.write(data_mono)
+        assert _wav_data_size(file_inmemory) == 20
+        now[0] += 5
+        f.buffer_write(data_mono.tobytes(), 'int16')
+        assert _wav_data_size(file_inmemory) == 20
+
+
+def test_write_with_invalid_update_header(file_inmemory):
+    with pytest.raises(ValueError) as excinfo:
+        sf.SoundFile(file_inmemory, 'w', 44100, 1, format='WAV',
+                     update_header=0)
+    assert "update_header" in str(excinfo.value)
+
+
+def test_write_without_peak_chunk(file_inmemory):
+    sf.write(file_inmemory, data_stereo, 44100, format='WAV',
+             subtype='FLOAT', add_peak_chunk=False)
+    assert b'PEAK' not in file_inmemory.getvalue()
+    file_inmemory.seek(0)
+    with sf.SoundFile(file_inmemory) as f:
+        assert f.signal_max() is None
+
+
+# -----------------------------------------------------------------------------
+# Test BackgroundWriter
+# -----------------------------------------------------------------------------
+
+
+def test_background_writer(file_w):
+    f = sf.SoundFile(file_w, 'w', 44100, 2, format='WAV', subtype='FLOAT')
+    with sf.BackgroundWriter(f, maxsize=2) as writer:
+        block = np.empty((1, 2))
+        for frame in data_stereo:
+            # the block is copied, so it can be reused right away
+            block[:] = frame
+            writer.write(block)
+            assert writer.queue_depth <= 2
+        writer.flush()
+        assert writer.queue_depth == 0
+        assert f.frames == len(data_stereo)
+    assert writer.closed
+    assert f.closed
+    data, fs = sf.read(filename_new)
+    assert np.all(data == data_stereo)
+
+
+def test_background_writer_channels_first(file_w):
+    f = sf.SoundFile(file_w, 'w', 44100, 2, format='WAV', subtype='FLOAT')
+    with sf.BackgroundWriter(f) as writer:
+        writer.write(list(data_stereo.T), channels_first=True)
+        with pytest.raises(ValueError):
+            writer.write(data_stereo, channels_first=True)
+    data, fs = sf.read(filename_new)
+    assert np.all(data == data_stereo)
+
+
+def test_background_writer_is_closed_when_garbage_collected(file_w):
+    f = sf.SoundFile(file_w, 'w', 44100, 2, format='WAV', subtype='FLOAT')
+    writer = sf.BackgroundWriter(f)
+    thread = writer._thread
+    writer.write(data_stereo)
+    del writer
+    gc.collect()
+    assert not thread.is_alive()
+    assert f.closed
+    data, fs = sf.read(filename_new)
+    assert np.all(data == data_stereo)
+
+
+def test_background_writer_checks_shape_immediately(sf_stereo_w):
+    writer = sf.BackgroundWriter(sf_stereo_w)
+    with pytest.raises(ValueError) as excinfo:
+        writer.write(data_mono)
+    assert "channels" in str(excinfo.value)
+    writer.close()
+
+
+def test_background_writer_reports_worker_errors(sf_stereo_r):
+    writer = sf.BackgroundWriter(sf_stereo_r)
+    writer.write(data_stereo)
+    with pytest.raises(sf.SoundFileError):
+        writer.flush()
+    with pytest.raises(sf.SoundFileError):
+        writer.write(data_stereo)
+    writer.close()
+    with pytest.raises(sf.SoundFileError) as excinfo:
+        writer.write(data_stereo)
+    assert "closed file" in str(excinfo.value)
+
+
 # -----------------------------------------------------------------------------
 # Test buffer write
 # -----------------------------------------------------------------------------
@@ -992,6 +2162,526 @@ def test_buffer_write_with_wrong_size(sf_stereo_w):
     assert "multiple of frame size" in str(excinfo.value)
 
 
+# -----------------------------------------------------------------------------
+# Test I/O statistics
+# -----------------------------------------------------------------------------
+
+@pytest.fixture
+def io_stats_enabled():
+    sf.enable_io_stats()
+    sf.reset_io_stats()
+    yield
+    sf.enable_io_stats(False)
+    sf.reset_io_stats()
+
+
+def test_io_stats_disabled_by_default():
+    with sf.SoundFile(filename_stereo) as f:
+        f.read()
+        assert f.io_stats is None
+    assert sf.io_stats() == sf.IOStats()
+
+
+def test_io_stats_read(io_stats_enabled):
+    with sf.SoundFile(filename_stereo) as f:
+        f.read(dtype='float32')
+        stats = f.io_stats
+    assert stats.read_calls == 1
+    assert stats.frames_read == len(data_stereo)
+    assert stats.bytes_read == len(data_stereo) * 2 * 4
+    assert stats.read_time > 0
+    assert stats.seeks > 0
+    assert stats.write_calls == stats.frames_written == 0
+    assert stats.vio_read_calls == 0
+    assert sf.io_stats() == stats
+
+
+def test_io_stats_write_file_object(io_stats_enabled):
+    fobj = io.BytesIO()
+    with sf.SoundFile(fobj, 'w', 44100, 1, format='WAV') as f:
+        f.write(data_mono)
+        stats = f.io_stats
+    assert stats.write_calls == 1
+    assert stats.frames_written == len(data_mono)
+    assert stats.bytes_written == data_mono.nbytes
+    assert stats.vio_write_calls > 0
+    assert stats.vio_write_bytes > 0
+    total = sf.io_stats()
+    assert total.vio_write_bytes >= len(fobj.getvalue())
+    assert total.vio_seek_calls > 0
+
+
+def test_io_stats_aggregate_and_reset(io_stats_enabled):
+    sf.read(filename_stereo)
+    sf.read(filename_mono)
+    assert sf.io_stats().frames_read == len(data_stereo) + len(data_mono)
+    with sf.SoundFile(filename_stereo) as f:
+        f.read()
+        sf.reset_io_stats()
+        assert sf.io_stats().frames_read == 0
+        assert f.io_stats.frames_read == len(data_stereo)
+    snapshot = sf.io_stats()
+    sf.read(filename_mono)
+    assert snapshot.frames_read == 0
+    assert set(snapshot.as_dict()) == set(sf.IOStats._fields)
+
+
+# -----------------------------------------------------------------------------
+# Test buffer pool
+# -----------------------------------------------------------------------------
+
+def test_buffer_pool_reuses_aligned_arrays():
+    pool = sf.BufferPool(alignment=64)
+    a = pool.empty((100, 2), 'float32')
+    assert a.shape == (100, 2) and a.dtype == np.float32
+    assert a.flags.c_contiguous
+    assert a.ctypes.data % 64 == 0
+    pool.release(a[:10])  # a view can be given back, too
+    b = pool.empty(300, 'int16')  # 600 bytes, same size class as 800
+    assert b.ctypes.data == a.ctypes.data
+    assert (pool.allocations, pool.reuses) == (1, 1)
+    with pytest.raises(ValueError):
+        pool.release(b.copy())
+    pool.release(b)
+    with pytest.raises(ValueError):
+        pool.release(b)
+    with pytest.raises(ValueError):
+        sf.BufferPool(alignment=48)
+
+
+def test_buffer_pool_max_bytes():
+    pool = sf.BufferPool(max_bytes=1024)
+    arrays = [pool.empty(1024, 'uint8') for _ in range(2)]
+    for array in arrays:
+        pool.release(array)
+    pool.empty(1024, 'uint8')
+    pool.empty(1024, 'uint8')
+    assert (pool.allocations, pool.reuses) == (3, 1)
+
+
+def test_read_with_buffer_pool(file_stereo_r):
+    pool = sf.BufferPool()
+    with sf.SoundFile(file_stereo_r) as f:
+        assert f.buffer_pool is None
+        f.buffer_pool = pool
+        for expected in data_stereo:
+            block = f.read(1)
+            assert np.all(block == expected)
+            pool.release(block)
+    assert (pool.allocations, pool.reuses) == (1, len(data_stereo) - 1)
+
+
+def test_global_buffer_pool():
+    pool = sf.BufferPool()
+    sf.set_buffer_pool(pool)
+    try:
+        with sf.SoundFile(filename_stereo) as f:
+            assert f.buffer_pool is pool
+            # the mixing buffer is given back internally
+            data = f.read(mix='mono')
+        assert np.allclose(data, data_stereo.mean(axis=1))
+        assert pool.allocations == 2
+        assert pool.empty(len(data_stereo) * 2).ctypes.data != \
+            data.ctypes.data
+        assert pool.reuses == 1
+    finally:
+        sf.set_buffer_pool(None)
+    with pytest.raises(TypeError):
+        sf.set_buffer_pool(object())
+
+
+def test_buffer_pool_does_not_keep_unreleased_arrays():
+    pool = sf.BufferPool()
+    sf.set_buffer_pool(pool)
+    try:
+        for _ in range(50):
+            data, _ = sf.read(filename_stereo)
+        del data
+        assert len(pool._in_use) == 0
+    finally:
+        sf.set_buffer_pool(None)
+
+
+def test_blocks_releases_buffer_when_closed_early(file_stereo_r):
+    pool = sf.BufferPool()
+    with sf.SoundFile(file_stereo_r) as f:
+        f.buffer_pool = pool
+        for block in f.blocks(2):
+            break
+    assert pool.allocations == 1
+    pool.empty((2, 2))
+    assert pool.reuses == 1
+
+
+def test_buffer_read_is_not_affected_by_previous_contents(file_stereo_r):
+    with sf.SoundFile(file_stereo_r) as f:
+        first = bytes(f.buffer_read(dtype='float64'))
+        f.seek(0)
+        assert bytes(f.buffer_read(dtype='float64')) == first
+
+
+# -----------------------------------------------------------------------------
+# Test trace hooks
+# -----------------------------------------------------------------------------
+
+@pytest.fixture
+def trace_events():
+    events = []
+
+    def hook(event, info):
+        events.append((event, info))
+
+    sf.add_trace_hook(hook)
+    yield events
+    sf.remove_trace_hook(hook)
+
+
+def test_trace_hooks_read(trace_events):
+    with sf.SoundFile(filename_stereo) as f:
+        f.seek(1)
+        f.read(2)
+    assert [event for event, _ in trace_events] == [
+        'open', 'seek', 'read', 'flush', 'close']
+    for _, info in trace_events:
+        assert info['name'] == filename_stereo
+        assert info['format'] == 'WAV'
+        assert info['subtype'] == 'FLOAT'
+        assert info['frames'] == len(data_stereo)
+        assert info['start'] <= info['end']
+    assert trace_events[1][1]['position'] == 1
+    assert trace_events[2][1]['count'] == 2
+
+
+def test_trace_hooks_write(trace_events):
+    with sf.SoundFile(filename_new, 'w', 44100, 1, format='WAV') as f:
+        f.write(data_mono)
+        f.truncate(2)
+    os.remove(filename_new)
+    events = dict((event, info) for event, info in trace_events)
+    assert events['write']['count'] == len(data_mono)
+    assert events['write']['mode'] == 'w'
+    assert events['truncate']['frames'] == 2
+
+
+def test_trace_hooks_with_io_stats(trace_events, io_stats_enabled):
+    with sf.SoundFile(filename_new, 'w', 44100, 1, format='WAV') as f:
+        f.write(data_mono)
+    with sf.SoundFile(filename_new) as f:
+        f.read()
+    os.remove(filename_new)
+    events = dict((event, info) for event, info in trace_events)
+    for event in 'read', 'write':
+        assert 0 <= events[event]['end'] - events[event]['start'] < 60
+
+
+def test_trace_hook_errors_are_propagated():
+    def hook(event, info):
+        raise ZeroDivisionError(event)
+
+    sf.add_trace_hook(hook)
+    try:
+        with pytest.raises(ZeroDivisionError, match='open'):
+            sf.SoundFile(filename_stereo)
+    finally:
+        sf.remove_trace_hook(hook)
+    with pytest.raises(ValueError, match='not registered'):
+        sf.remove_trace_hook(hook)
+    with pytest.raises(TypeError):
+        sf.add_trace_hook('not a function')
+
+
+def test_slow_operation_logger(caplog):
+    sf.add_trace_hook(sf.slow_operation_logger(0))
+    try:
+        with caplog.at_level('WARNING', logger='soundfile'):
+            sf.read(filename_stereo)
+    finally:
+        sf.remove_trace_hook(sf._trace_hooks[-1])
+    messages = [record.getMessage() for record in caplog.records]
+    assert any(message.startswith("read of 'tests/stereo.wav' (WAV, FLOAT)")
+               for message in messages)
+    caplog.clear()
+    hook = sf.slow_operation_logger(10)
+    sf.add_trace_hook(hook)
+    try:
+        sf.read(filename_stereo)
+    finally:
+        sf.remove_trace_hook(hook)
+    assert not caplog.records
+
+
+# -----------------------------------------------------------------------------
+# Test RangeSource
+# -----------------------------------------------------------------------------
+
+class FakeObjectStorage:
+    """Serves byte ranges of a file and records the requests."""
+
+    def __init__(self, filename):
+        with open(filename, 'rb') as f:
+            self.content = f.read()
+        self.requests = []
+
+    def read_range(self, offset, length):
+        self.requests.append((offset, length))
+        return self.content[offset:offset + length]
+
+
+@pytest.mark.parametrize("filename", [filename_stereo, filename_flac])
+def test_range_source_read(filename):
+    storage = FakeObjectStorage(filename)
+    source = sf.RangeSource(storage.read_range, len(storage.content),
+                            block_size=16, cache_size=10000)
+    data, samplerate = sf.read(source)
+    expected, expected_samplerate = sf.read(filename)
+    assert samplerate == expected_samplerate
+    assert np.all(data == expected)
+    assert source.requests == len(storage.requests)
+    # with a large enough cache, each block is only fetched once
+    assert sum(length for _, length in storage.requests) == len(storage.content)
+
+
+def test_range_source_fetches_header_and_tail_up_front():
+    storage = FakeObjectStorage(filename_stereo)
+    size = len(storage.content)
+    source = sf.RangeSource(storage.read_range, size, block_size=32,
+                            read_ahead=1)
+    assert storage.requests == [(0, 64), (size // 32 * 32, size % 32)]
+    source = sf.RangeSource(storage.read_range, size, block_size=32,
+                            read_ahead=0, prefetch_tail=False)
+    assert storage.requests[2:] == [(0, 32)]
+    assert source.bytes_fetched == 32
+
+
+def test_range_source_file_interface():
+    content = bytes(range(100))
+    source = sf.RangeSource(lambda offset, length:
+                            content[offset:offset + length],
+                            len(content), block_size=10, cache_size=3,
+                            read_ahead=1, prefetch_tail=False)
+    assert source.read(5) == content[:5]
+    assert source.tell() == 5
+    assert source.seek(-10, sf.SEEK_END) == 90
+    assert source.read() == content[90:]
+    assert source.read() == b''
+    source.seek(42)
+    buffer = bytearray(30)
+    assert source.readinto(buffer) == 30
+    assert buffer == content[42:72]
+    assert source.seek(5, sf.SEEK_CUR) == 77
+    # blocks 0 and 9 were evicted, only 3 blocks are cached
+    requests = source.requests
+    source.seek(0)
+    assert source.read(10) == content[:10]
+    assert source.requests == requests + 1
+    with pytest.raises(ValueError):
+        source.seek(-1)
+    source.close()
+    with pytest.raises(ValueError):
+        source.read()
+
+
+# -----------------------------------------------------------------------------
+# Test embedded files
+# -----------------------------------------------------------------------------
+
+@pytest.fixture
+def tar_archive(tmp_path):
+    import tarfile
+    filename = str(tmp_path / 'clips.tar')
+    with tarfile.open(filename, 'w') as archive:
+        archive.add(filename_stereo, 'clips/stereo.wav')
+        archive.add(filename_flac, 'clips/stereo.flac')
+        archive.add(filename_mono, 'clips/mono.wav')
+    return filename
+
+
+def test_embedded_source(tar_archive):
+    index = sf.index_tar(tar_archive)
+    assert sorted(index) == ['clips/mono.wav', 'clips/stereo.flac',
+                             'clips/stereo.wav']
+    for name, original in [('clips/stereo.wav', filename_stereo),
+                           ('clips/stereo.flac', filename_flac),
+                           ('clips/mono.wav', filename_mono)]:
+        offset, length = index[name]
+        assert length == os.path.getsize(original)
+        with sf.SoundFile(sf.EmbeddedSource(tar_archive, offset,
+                                            length)) as f:
+            assert f.embed_info == (offset, length)
+            assert np.all(f.read() == sf.read(original)[0])
+
+
+def test_embedded_source_shared_fd(tar_archive):
+    index = sf.index_tar(tar_archive)
+    fd = os.open(tar_archive, os.O_RDONLY)
+    try:
+        a = sf.SoundFile(sf.EmbeddedSource(fd, *index['clips/stereo.wav']))
+        b = sf.SoundFile(sf.EmbeddedSource(fd, *index['clips/mono.wav']))
+        assert np.all(b.read(dtype='int16') == data_mono)
+        assert np.all(a.read() == data_stereo)
+        a.close()
+        b.close()
+        assert os.lseek(fd, 0, os.SEEK_CUR) == 0
+    finally:
+        os.close(fd)
+
+
+def test_embedded_source_file_interface(tmp_path):
+    filename = str(tmp_path / 'data')
+    with open(filename, 'wb') as f:
+        f.write(bytes(range(100)))
+    with sf.EmbeddedSource(filename, 10, 20) as source:
+        assert source.read(5) == bytes(range(10, 15))
+        assert source.seek(-5, sf.SEEK_END) == 15
+        assert source.read() == bytes(range(25, 30))
+        assert source.read(10) == b''
+        source.seek(2)
+        buffer = bytearray(5)
+        assert source.readinto(buffer) == 5
+        assert buffer == bytes(range(12, 17))
+    assert source.closed
+    with pytest.raises(ValueError):
+        source.read()
+    with pytest.raises(ValueError):
+        sf.EmbeddedSource(filename, 90, 20)
+
+
+def test_embed_info_of_file_descriptor(tmp_path):
+    filename = str(tmp_path / 'prefixed')
+    with open(filename_stereo, 'rb') as f:
+        content = f.read()
+    with open(filename, 'wb') as f:
+        f.write(b'\0' * 100 + content)
+    fd = os.open(filename, os.O_RDONLY)
+    os.lseek(fd, 100, os.SEEK_SET)
+    with sf.SoundFile(fd) as f:
+        assert f.embed_info == (100, len(content))
+        assert np.all(f.read() == data_stereo)
+    with sf.SoundFile(filename_stereo) as f:
+        assert f.embed_info == (0, len(content))
+
+
+def test_index_zip(tmp_path):
+    import zipfile
+    filename = str(tmp_path / 'clips.zip')
+    with zipfile.ZipFile(filename, 'w') as archive:
+        archive.write(filename_stereo, 'stored.wav', zipfile.ZIP_STORED)
+        archive.write(filename_mono, 'deflated.wav', zipfile.ZIP_DEFLATED)
+    index = sf.index_zip(filename)
+    assert list(index) == ['stored.wav']
+    with sf.SoundFile(sf.EmbeddedSource(filename,
+                                        *index['stored.wav'])) as f:
+        assert np.all(f.read() == data_stereo)
+
+
+def test_shard_roundtrip(tmp_path):
+    filename = str(tmp_path / 'clips.shard')
+    with sf.ShardWriter(filename, format='FLAC') as shard:
+        first = shard.add('stereo', data_stereo, 44100, format='WAV',
+                          subtype='DOUBLE')
+        shard.add('mono', data_mono, 48000)
+        with pytest.raises(ValueError):
+            shard.add('mono', data_mono, 48000)
+        assert len(shard) == 2 and 'stereo' in shard
+    assert shard.closed
+    assert first == sf.ShardEntry('stereo', 0, first.length, 44100, 2,
+                                  len(data_stereo))
+    with sf.ShardReader(filename) as shard:
+        assert list(shard) == ['stereo', 'mono']
+        entry = shard.entry('mono')
+        assert entry.offset == first.length
+        assert entry.offset + entry.length == os.path.getsize(filename)
+        assert (entry.samplerate, entry.channels) == (48000, 1)
+        data, samplerate = shard.read('stereo')
+        assert samplerate == 44100
+        assert np.all(data == data_stereo)
+        with shard.open('mono') as f:
+            assert f.format == 'FLAC'
+            assert np.all(f.read(dtype='int16') == data_mono)
+    with pytest.raises(sf.SoundFileRuntimeError):
+        shard.open('mono')
+
+
+def test_shard_append(tmp_path):
+    filename = str(tmp_path / 'clips.shard')
+    with sf.ShardWriter(filename) as shard:
+        shard.add('a', data_mono, 44100, subtype='PCM_16')
+    with sf.ShardWriter(filename, 'a') as shard:
+        assert 'a' in shard
+        shard.add('b', data_stereo, 44100, subtype='DOUBLE')
+    with sf.ShardReader(filename) as shard:
+        assert np.all(shard.read('a', dtype='int16')[0] == data_mono)
+        assert np.all(shard.read('b')[0] == data_stereo)
+
+
+def test_shard_append_to_new_file(tmp_path):
+    filename = str(tmp_path / 'clips.shard')
+    with sf.ShardWriter(filename, 'a') as shard:
+        shard.add('a', data_mono, 44100, subtype='PCM_16')
+        shard.add('b', data_stereo, 44100, subtype='DOUBLE')
+        shard.add('c', data_mono, 44100, subtype='PCM_16')
+    with sf.ShardReader(filename) as shard:
+        assert np.all(shard.read('a', dtype='int16')[0] == data_mono)
+        assert np.all(shard.read('b')[0] == data_stereo)
+        assert np.all(shard.read('c', dtype='int16')[0] == data_mono)
+
+
+def test_shard_append_drops_unindexed_clip(tmp_path):
+    filename = str(tmp_path / 'clips.shard')
+    with sf.ShardWriter(filename) as shard:
+        shard.add('a', data_mono, 44100, subtype='PCM_16')
+    size = os.path.getsize(filename)
+    with open(filename, 'ab') as f:
+        f.write(b'RIFF' + b'\0' * 20)  # partial clip, e.g. after a crash
+    with sf.ShardWriter(filename, 'a') as shard:
+        entry = shard.add('b', data_mono, 44100, subtype='PCM_16')
+    assert entry.offset == size
+    with sf.ShardReader(filename) as shard:
+        assert np.all(shard.read('b', dtype='int16')[0] == data_mono)
+
+
+def test_shard_removes_new_index_if_shard_cannot_be_opened(tmp_path):
+    filename = str(tmp_path / 'missing' / 'clips.shard')
+    index = str(tmp_path / 'clips.index')
+    with pytest.raises(OSError):
+        sf.ShardWriter(filename, index=index)
+    assert not os.path.exists(index)
+
+
+def test_shard_discards_failed_clip(tmp_path):
+    filename = str(tmp_path / 'clips.shard')
+    with sf.ShardWriter(filename, index=str(tmp_path / 'index')) as shard:
+        shard.add('a', data_mono, 44100, subtype='PCM_16')
+        size = os.path.getsize(filename)
+        with pytest.raises(ValueError):
+            shard.add('b', data_mono, 44100, subtype='NOT_A_SUBTYPE')
+        assert 'b' not in shard
+    assert os.path.getsize(filename) == size
+    with pytest.raises(ValueError):
+        sf.ShardReader(filename, index=filename)
+
+
+def test_shard_index_is_written_incrementally(tmp_path):
+    filename = str(tmp_path / 'clips.shard')
+    shard = sf.ShardWriter(filename)
+    shard.add('a', data_mono, 44100, subtype='PCM_16')
+    with pytest.raises(ValueError):
+        shard.add('x' * 70000, data_mono, 44100)
+    # readable without closing the writer, e.g. after a crash:
+    with sf.ShardReader(filename) as reader:
+        assert list(reader) == ['a']
+        assert np.all(reader.read('a', dtype='int16')[0] == data_mono)
+    shard.close()
+    # an incomplete last entry is ignored and overwritten when appending
+    with open(filename + '.index', 'ab') as f:
+        f.write(b'\0' * 10)
+    with sf.ShardWriter(filename, 'a') as shard:
+        shard.add('b', data_mono, 44100, subtype='PCM_16')
+    with sf.ShardReader(filename) as reader:
+        assert list(reader) == ['a', 'b']
+        assert np.all(reader.read('b', dtype='int16')[0] == data_mono)
+
+
 # -----------------------------------------------------------------------------
 # Other tests
 # -----------------------------------------------------------------------------
@@ -1073,6 +2763,55 @@ def test_read_int_data_from_float_file(file_inmemory):
     assert fs == 44100
 
 
+def test_read_without_normalize(file_mono_r):
+    data, fs = sf.read(file_mono_r, normalize=False)
+    assert data.dtype == np.float64
+    assert np.all(data == data_mono)
+
+
+def test_write_without_normalize(file_inmemory):
+    sf.write(file_inmemory, data_mono.astype('float32'), 44100,
+             format='WAV', subtype='PCM_16', normalize=False)
+    file_inmemory.seek(0)
+    data, fs = sf.read(file_inmemory, dtype='int16')
+    assert np.all(data == data_mono)
+
+
+def test_read_with_scale_float_int_read(file_stereo_r):
+    with sf.SoundFile(file_stereo_r, scale_float_int_read=True) as f:
+        assert f.scale_float_int_read
+        data = f.read(dtype='int16')
+    # the peak of the file (1.75) is scaled to the largest int16 value:
+    expected = data_stereo / 1.75 * 2**15 * 32767 / 32768
+    assert np.all(np.abs(data - expected) <= 1)
+
+
+def test_write_with_scale_int_float_write(file_inmemory):
+    sf.write(file_inmemory, data_mono, 44100, format='WAV',
+             subtype='FLOAT', scale_int_float_write=True)
+    file_inmemory.seek(0)
+    data, fs = sf.read(file_inmemory)
+    assert np.all(data == data_mono / 2**15)
+
+
+def test_write_without_clipping(file_inmemory):
+    data = np.array([1.5, -0.5])
+    sf.write(file_inmemory, data, 44100, format='WAV', subtype='PCM_16',
+             clipping=False)
+    file_inmemory.seek(0)
+    written, fs = sf.read(file_inmemory)
+    # without clipping, the first value wraps around:
+    assert written[0] < 0
+    assert written[1] == -0.5
+
+
+def test_default_conversion_options(sf_stereo_r):
+    assert sf_stereo_r.normalize
+    assert sf_stereo_r.clipping
+    assert not sf_stereo_r.scale_float_int_read
+    assert not sf_stereo_r.scale_int_float_write
+
+
 def test_libsndfile_version():
     assert '.' in sf.__libsndfile_version__
 
@@ -1151,18 +2890,15 @@ def test_write_non_seekable_file(file_w):
         assert f.frames == len(data_mono)
         data = f.read(3, dtype='int16')
         assert np.all(data == data_mono[:3])
-        data = f.read(666, dtype='int16')
+        data = f.read(dtype='int16')
         assert np.all(data == data_mono[3:])
+        assert len(f.read()) == 0
 
         with pytest.raises(sf.SoundFileError) as excinfo:
             f.seek(2)
         assert isinstance(excinfo.value, RuntimeError)
         assert "unseekable" in str(excinfo.value)
 
-        with pytest.raises(ValueError) as excinfo:
-            f.read()
-        assert "frames" in str(excinfo.value)
-
     data, fs = sf.read(filename_new, dtype='int16')
     assert np.all(data == data_mono)
     assert fs == 44100
@@ -1172,6 +2908,49 @@ def test_write_non_seekable_file(file_w):
     assert "start is only allowed for seekable files" in str(excinfo.value)
 
 
+def _pipe_with_unknown_length(data, samplerate):
+    """Return a pipe with a WAV stream like the ones ffmpeg writes."""
+    fobj = io.BytesIO()
+    sf.write(fobj, data, samplerate, format='WAV', subtype='PCM_16')
+    content = bytearray(fobj.getvalue())
+    content[4:8] = content[40:44] = b'\xff\xff\xff\xff'
+    read_fd, write_fd = os.pipe()
+
+    def writer():
+        with os.fdopen(write_fd, 'wb') as f:
+            f.write(content)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    return read_fd, thread
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason="uses os.pipe()")
+def test_read_pipe_until_end():
+    data = np.arange(100000, dtype='int16')
+    fd, thread = _pipe_with_unknown_length(data, 8000)
+    try:
+        read, samplerate = sf.read(fd, dtype='int16')
+    finally:
+        thread.join()
+    assert samplerate == 8000
+    assert np.all(read == data)
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason="uses os.pipe()")
+def test_blocks_pipe_until_end():
+    data = np.arange(10000, dtype='int16')
+    fd, thread = _pipe_with_unknown_length(data, 8000)
+    try:
+        blocks = list(sf.blocks(fd, blocksize=4096, overlap=96,
+                                dtype='int16'))
+    finally:
+        thread.join()
+    expected = [data[0:4096], data[4000:8096], data[8000:10000]]
+    assert len(blocks) == len(expected)
+    assert_equal_list_of_arrays(blocks, expected)
+
+
 # -----------------------------------------------------------------------------
 # Test LibsndfileError
 # -----------------------------------------------------------------------------